@@ -0,0 +1,190 @@
+# Arquivo: src/api/admission.py
+# Controle de admissão: limite de concorrência e fila limitada por grupo de rotas
+
+import asyncio
+import json
+from collections import deque
+from typing import Deque, Dict, Optional, Sequence, Tuple
+
+from src.config import settings, logger
+
+# (método, caminho, baia). Caminhos terminados em "/" casam por prefixo;
+# os demais, exatamente. Rotas fora da tabela usam a baia "consulta".
+# Baia None: a rota não passa pelo controle (conexões longas com limite próprio).
+REGRAS_PADRAO: Tuple[Tuple[str, str, Optional[str]], ...] = (
+    ("GET", "/", "reservada"),
+    ("GET", "/health", "reservada"),
+    ("GET", "/ready", "reservada"),
+    ("GET", "/natureza/", "reservada"),
+    ("GET", "/ocorrencias_media", "media"),
+    ("GET", "/ocorrencias_nomes", "consulta"),
+    ("GET", "/ocorrencias_distribuicao", "consulta"),
+    # Agregações (mesma divisão dos pools de src/api/executores.py) e o
+    # catálogo, que lê partições do disco: uma rajada delas não ocupa as
+    # vagas das consultas baratas
+    ("GET", "/ocorrencias_rollup", "agregacao"),
+    ("GET", "/ocorrencias_previsao", "agregacao"),
+    ("GET", "/ocorrencias_matriz", "agregacao"),
+    ("GET", "/ocorrencias_comovimento", "agregacao"),
+    ("GET", "/datasets/", "agregacao"),
+    ("POST", "/ocorrencias", "escrita"),
+    ("POST", "/ocorrencias_diarias", "escrita"),
+    ("GET", "/ocorrencias_export", "exportacao"),
+    ("GET", "/ocorrencias_eventos", None),
+)
+BAIA_PADRAO = "consulta"
+
+
+# ----------------------------------------------
+# CLASSE Baia --- Vagas de execução de um grupo de rotas
+# ----------------------------------------------
+
+class Baia:
+    """
+    Até `limite` requisições executam ao mesmo tempo; até `fila` aguardam
+    por uma vaga. Com a fila cheia a requisição é recusada na hora, sem
+    ocupar thread nem memória. Usada apenas no event loop (sem locks).
+    """
+
+    def __init__(self, nome: str, limite: int, fila: int):
+        self.nome = nome
+        self.limite = limite
+        self.fila = fila
+        self.ativos = 0
+        self.rejeitadas = 0
+        self._espera: Deque[asyncio.Future] = deque()
+
+    @property
+    def aguardando(self) -> int:
+        return len(self._espera)
+
+    async def entrar(self, timeout: Optional[float] = None) -> bool:
+        """Ocupa uma vaga. Retorna False se a fila estiver cheia ou o tempo de espera acabar."""
+        if self.ativos < self.limite and not self._espera:
+            self.ativos += 1
+            return True
+        if len(self._espera) >= self.fila:
+            self.rejeitadas += 1
+            return False
+
+        futuro = asyncio.get_running_loop().create_future()
+        self._espera.append(futuro)
+        try:
+            await asyncio.wait_for(futuro, timeout)
+        except BaseException as e:
+            if futuro.done() and not futuro.cancelled():
+                # A vaga chegou junto com o timeout/cancelamento: devolve
+                self.sair()
+            else:
+                futuro.cancel()
+                try:
+                    self._espera.remove(futuro)
+                except ValueError:
+                    pass
+            if isinstance(e, asyncio.TimeoutError):
+                self.rejeitadas += 1
+                return False
+            raise
+        return True
+
+    def sair(self):
+        """Libera a vaga, repassando-a diretamente ao primeiro da fila (FIFO)."""
+        while self._espera:
+            futuro = self._espera.popleft()
+            if not futuro.done():
+                futuro.set_result(None)
+                return
+        self.ativos -= 1
+
+
+def baias_padrao() -> Dict[str, Baia]:
+    """Baias com os limites lidos das configurações."""
+    return {
+        "reservada": Baia("reservada", settings.ADMISSION_RESERVED_CONCURRENCY, settings.ADMISSION_RESERVED_QUEUE),
+        "consulta": Baia("consulta", settings.ADMISSION_QUERY_CONCURRENCY, settings.ADMISSION_QUERY_QUEUE),
+        "media": Baia("media", settings.ADMISSION_MEDIA_CONCURRENCY, settings.ADMISSION_MEDIA_QUEUE),
+        "agregacao": Baia("agregacao", settings.ADMISSION_AGGREGATION_CONCURRENCY, settings.ADMISSION_AGGREGATION_QUEUE),
+        "escrita": Baia("escrita", settings.ADMISSION_WRITE_CONCURRENCY, settings.ADMISSION_WRITE_QUEUE),
+        "exportacao": Baia("exportacao", settings.ADMISSION_EXPORT_CONCURRENCY, settings.ADMISSION_EXPORT_QUEUE),
+    }
+
+
+# ----------------------------------------------
+# MIDDLEWARE ASGI
+# ----------------------------------------------
+
+class ControleAdmissao:
+    """
+    Middleware ASGI puro (sem BaseHTTPMiddleware), para que a recusa custe
+    o mínimo possível. Cada requisição ocupa uma vaga da sua baia durante
+    toda a resposta; sem vaga, responde 503 com Retry-After.
+    """
+
+    def __init__(self, app, baias: Optional[Dict[str, Baia]] = None,
+                 regras: Sequence[Tuple[str, str, Optional[str]]] = REGRAS_PADRAO,
+                 timeout: Optional[float] = None, retry_after: Optional[int] = None):
+        self.app = app
+        self.baias = baias if baias is not None else baias_padrao()
+        self.regras = regras
+        self.timeout = settings.ADMISSION_QUEUE_TIMEOUT_SECONDS if timeout is None else timeout
+        self.retry_after = settings.ADMISSION_RETRY_AFTER_SECONDS if retry_after is None else retry_after
+
+    def classificar(self, metodo: str, caminho: str) -> Optional[Baia]:
+        for metodo_regra, caminho_regra, nome in self.regras:
+            if metodo_regra != metodo:
+                continue
+            if caminho == caminho_regra or (caminho_regra.endswith("/") and caminho_regra != "/"
+                                            and caminho.startswith(caminho_regra)):
+                return None if nome is None else self.baias[nome]
+        return self.baias[BAIA_PADRAO]
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        baia = self.classificar(scope["method"], scope["path"])
+        if baia is None:
+            await self.app(scope, receive, send)
+            return
+        if not await baia.entrar(self.timeout):
+            await self._recusar(baia, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            baia.sair()
+
+    async def _recusar(self, baia: Baia, send):
+        corpo = json.dumps({"detail": f"Servidor sobrecarregado ({baia.nome}); tente novamente."}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(corpo)).encode()),
+                (b"retry-after", str(self.retry_after).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": corpo})
+
+
+def ajustar_threadpool(baias: Dict[str, Baia]):
+    """
+    O threadpool do anyio (40 threads por padrão) roda endpoints síncronos;
+    o trabalho dos endpoints assíncronos (inclusive as fatias da exportação)
+    vai para os pools de src/api/executores.py. Garante threads
+    para todas as vagas somadas: assim uma baia cheia nunca tira thread das
+    outras, e a baia reservada sempre tem onde rodar.
+    """
+    from anyio.to_thread import current_default_thread_limiter
+
+    limitador = current_default_thread_limiter()
+    necessario = sum(baia.limite for baia in baias.values())
+    if limitador.total_tokens < necessario:
+        limitador.total_tokens = necessario
+    logger.info(
+        "Controle de admissão: "
+        + ", ".join(f"{b.nome}={b.limite}+{b.fila}" for b in baias.values())
+        + f" (threadpool={limitador.total_tokens})"
+    )
@@ -0,0 +1,266 @@
+# Arquivo: src/api/compressao.py
+# Respostas comprimidas (gzip, brotli, zstd) guardadas por versão do dataset:
+# a compressão é paga uma vez por versão, não uma vez por requisição
+
+import asyncio
+import gzip
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qsl
+
+from src.config import settings, logger
+from src.api.profiling import VALORES_ATIVOS
+from src.models.model_loader import dataset_carregado, obter_dataset
+
+# Rotas de lista do dataset principal (GET, caminho exato). As rotas do
+# catálogo ficam de fora: a versão do dataset principal não cobre os arquivos delas.
+ROTAS_PADRAO: Tuple[str, ...] = (
+    "/ocorrencias_nomes",
+    "/ocorrencias_media",
+    "/ocorrencias_distribuicao",
+    "/ocorrencias_rollup",
+    "/ocorrencias_previsao",
+    "/ocorrencias_matriz",
+    "/ocorrencias_comovimento",
+)
+# Cabeçalhos da resposta guardados no cache: só os que descrevem o conteúdo.
+# Os demais (X-Profile-*, Set-Cookie, Date...) são da requisição que gerou a
+# entrada e não podem ir para outros clientes.
+CABECALHOS_GUARDADOS = frozenset({b"content-type", b"cache-control", b"etag", b"last-modified", b"content-language"})
+# Em empate de qualidade (q) no Accept-Encoding, vale esta ordem
+PREFERENCIA = ("zstd", "br", "gzip")
+
+# (caminho, parâmetros ordenados, versão do dataset, codificação)
+ChaveCache = Tuple[str, Tuple[Tuple[str, str], ...], int, str]
+
+
+def codificadores_disponiveis() -> Dict[str, Callable[[bytes], bytes]]:
+    """gzip sempre; brotli e zstd só com os pacotes opcionais 'brotli' e 'zstandard'."""
+    codificadores: Dict[str, Callable[[bytes], bytes]] = {
+        "gzip": lambda dados: gzip.compress(dados, compresslevel=6, mtime=0),
+    }
+    try:
+        import brotli
+        codificadores["br"] = lambda dados: brotli.compress(dados, quality=5)
+    except ImportError:
+        pass
+    try:
+        import zstandard
+        # Um compressor por chamada: ZstdCompressor não pode ser usado por duas threads ao mesmo tempo
+        codificadores["zstd"] = lambda dados: zstandard.ZstdCompressor(level=3).compress(dados)
+    except ImportError:
+        pass
+    return codificadores
+
+
+def negociar(accept_encoding: str, disponiveis: Sequence[str]) -> Optional[str]:
+    """Codificação de maior q aceita pelo cliente entre as disponíveis; None = sem compressão."""
+    aceitas: Dict[str, float] = {}
+    for parte in accept_encoding.split(","):
+        nome, _, parametros = parte.partition(";")
+        nome = nome.strip().lower()
+        if not nome:
+            continue
+        qualidade = 1.0
+        parametro, _, valor = parametros.strip().partition("=")
+        if parametro.strip().lower() == "q":
+            try:
+                qualidade = float(valor)
+            except ValueError:
+                qualidade = 0.0
+        aceitas[nome] = qualidade
+
+    curinga = aceitas.get("*", 0.0)
+    escolhida, melhor = None, 0.0
+    for codificacao in PREFERENCIA:
+        if codificacao not in disponiveis:
+            continue
+        qualidade = aceitas.get(codificacao, curinga)
+        if qualidade > melhor:
+            escolhida, melhor = codificacao, qualidade
+    return escolhida
+
+
+# ----------------------------------------------
+# CLASSE CacheComprimido --- LRU de respostas comprimidas
+# ----------------------------------------------
+
+@dataclass(frozen=True)
+class RespostaComprimida:
+    status: int
+    # Cabeçalhos da resposta original que descrevem o conteúdo (CABECALHOS_GUARDADOS)
+    cabecalhos: Tuple[Tuple[bytes, bytes], ...]
+    corpo: bytes
+    codificacao: str
+
+
+class CacheComprimido:
+    """
+    Respostas comprimidas por (rota, parâmetros, versão do dataset,
+    codificação), até `limite_bytes`; acima disso, as usadas há mais tempo
+    são descartadas. Entradas de versões antigas deixam de ser pedidas e
+    saem naturalmente pelo LRU.
+    """
+
+    def __init__(self, limite_bytes: int):
+        self.limite_bytes = limite_bytes
+        self._entradas: "OrderedDict[ChaveCache, RespostaComprimida]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes_em_uso = 0
+        self.acertos = 0
+        self.faltas = 0
+        self.descartes = 0
+
+    def obter(self, chave: ChaveCache) -> Optional[RespostaComprimida]:
+        with self._lock:
+            entrada = self._entradas.get(chave)
+            if entrada is None:
+                self.faltas += 1
+                return None
+            self._entradas.move_to_end(chave)
+            self.acertos += 1
+            return entrada
+
+    def guardar(self, chave: ChaveCache, entrada: RespostaComprimida):
+        if len(entrada.corpo) > self.limite_bytes:
+            return
+        with self._lock:
+            antiga = self._entradas.pop(chave, None)
+            if antiga is not None:
+                self.bytes_em_uso -= len(antiga.corpo)
+            self._entradas[chave] = entrada
+            self.bytes_em_uso += len(entrada.corpo)
+            while self.bytes_em_uso > self.limite_bytes:
+                _, removida = self._entradas.popitem(last=False)
+                self.bytes_em_uso -= len(removida.corpo)
+                self.descartes += 1
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+    def limpar(self):
+        with self._lock:
+            self._entradas.clear()
+            self.bytes_em_uso = 0
+
+
+def criar_cache() -> CacheComprimido:
+    return CacheComprimido(settings.COMPRESSION_CACHE_MB * 1024 * 1024)
+
+
+# ----------------------------------------------
+# MIDDLEWARE ASGI
+# ----------------------------------------------
+
+def _cabecalho(cabecalhos, nome: bytes) -> str:
+    for chave, valor in cabecalhos:
+        if chave.lower() == nome:
+            return valor.decode("latin-1")
+    return ""
+
+
+def _pede_profiling(cabecalhos) -> bool:
+    if not settings.PROFILING_ENABLED:
+        return False
+    valor = _cabecalho(cabecalhos, settings.PROFILING_HEADER.lower().encode("latin-1"))
+    return valor.lower() in VALORES_ATIVOS
+
+
+class CompressaoVersionada:
+    """
+    Middleware ASGI puro. Numa rota de lista, com o dataset carregado e uma
+    codificação aceita pelo cliente, responde do cache; numa falta, executa
+    o endpoint, comprime a resposta (200, JSON, a partir de
+    COMPRESSION_MIN_BYTES) e a guarda. A versão da chave é a mesma que o
+    endpoint lê: ela é fixada aqui, antes dele.
+    """
+
+    def __init__(self, app, cache: Optional[CacheComprimido] = None,
+                 rotas: Sequence[str] = ROTAS_PADRAO, tamanho_minimo: Optional[int] = None):
+        self.app = app
+        self.cache = cache if cache is not None else criar_cache()
+        self.rotas = frozenset(rotas)
+        self.tamanho_minimo = settings.COMPRESSION_MIN_BYTES if tamanho_minimo is None else tamanho_minimo
+        self._codificadores: Optional[Dict[str, Callable[[bytes], bytes]]] = None
+
+    @property
+    def codificadores(self) -> Dict[str, Callable[[bytes], bytes]]:
+        # brotli/zstandard só são importados na primeira requisição, não na subida
+        if self._codificadores is None:
+            self._codificadores = codificadores_disponiveis()
+            logger.info(f"Compressão de respostas: {sorted(self._codificadores)}")
+        return self._codificadores
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET" or scope["path"] not in self.rotas:
+            await self.app(scope, receive, send)
+            return
+
+        # Uma requisição perfilada executa o endpoint de verdade e não deixa os
+        # cabeçalhos do seu perfil no cache
+        if _pede_profiling(scope["headers"]):
+            await self.app(scope, receive, send)
+            return
+
+        codificacao = negociar(_cabecalho(scope["headers"], b"accept-encoding"), list(self.codificadores))
+        # Sem dataset em memória a chave não tem versão (e a carga não roda no event loop)
+        if codificacao is None or dataset_carregado() is None:
+            await self.app(scope, receive, send)
+            return
+
+        parametros = tuple(sorted(parse_qsl(scope["query_string"].decode("latin-1"), keep_blank_values=True)))
+        chave: ChaveCache = (scope["path"], parametros, obter_dataset().versao, codificacao)
+        entrada = self.cache.obter(chave)
+        if entrada is not None:
+            await self._enviar(send, entrada)
+            return
+
+        inicio: Dict = {}
+        partes: List[bytes] = []
+
+        async def capturar(mensagem):
+            if mensagem["type"] == "http.response.start":
+                inicio.update(mensagem)
+            elif mensagem["type"] == "http.response.body":
+                partes.append(mensagem.get("body", b""))
+
+        await self.app(scope, receive, capturar)
+        corpo = b"".join(partes)
+
+        cabecalhos = inicio.get("headers", [])
+        if (inicio.get("status") != 200 or len(corpo) < self.tamanho_minimo
+                or _cabecalho(cabecalhos, b"content-encoding")
+                or not _cabecalho(cabecalhos, b"content-type").startswith("application/json")):
+            await send(inicio)
+            await send({"type": "http.response.body", "body": corpo})
+            return
+
+        # Fora do event loop: é o único trabalho de CPU desta camada (uma vez por chave)
+        comprimido = await asyncio.to_thread(self.codificadores[codificacao], corpo)
+        entrada = RespostaComprimida(
+            status=200,
+            cabecalhos=tuple((k, v) for k, v in cabecalhos if k.lower() in CABECALHOS_GUARDADOS),
+            corpo=comprimido,
+            codificacao=codificacao,
+        )
+        self.cache.guardar(chave, entrada)
+        # Quem gerou a entrada recebe também os próprios cabeçalhos (fora do cache)
+        proprios = tuple((k, v) for k, v in cabecalhos
+                         if k.lower() not in CABECALHOS_GUARDADOS and k.lower() != b"content-length")
+        await self._enviar(send, entrada, proprios)
+
+    async def _enviar(self, send, entrada: RespostaComprimida, extras: Tuple[Tuple[bytes, bytes], ...] = ()):
+        await send({
+            "type": "http.response.start",
+            "status": entrada.status,
+            "headers": [
+                *entrada.cabecalhos,
+                *extras,
+                (b"content-encoding", entrada.codificacao.encode()),
+                (b"content-length", str(len(entrada.corpo)).encode()),
+                (b"vary", b"Accept-Encoding"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": entrada.corpo})
@@ -0,0 +1,197 @@
+# Arquivo: src/api/eventos.py
+# Assinaturas (Server-Sent Events): novas ocorrências e médias atualizadas
+# enviadas aos clientes a partir de um único evento produzido pela escrita
+
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, FrozenSet, Iterable, List, Mapping, Optional, Set, Tuple
+
+from src.config import settings, logger
+
+# Chave de filtro: (RAs, naturezas); conjunto vazio = sem filtro nessa dimensão
+ChaveFiltro = Tuple[FrozenSet[int], FrozenSet[int]]
+
+
+def formatar_sse(evento: str, versao: int, dados) -> bytes:
+    """Mensagem no formato text/event-stream (o id permite retomar pela versão)."""
+    return f"id: {versao}\nevent: {evento}\ndata: {json.dumps(dados, ensure_ascii=False)}\n\n".encode('utf-8')
+
+
+# ----------------------------------------------
+# CLASSE EventoPublicacao --- Uma versão publicada, pronta para o fan-out
+# ----------------------------------------------
+
+@dataclass(frozen=True)
+class EventoPublicacao:
+    """
+    Registros novos/atualizados de uma versão, agrupados por (RA, natureza),
+    já com a média histórica do mês recalculada. Uma recarga completa (sem
+    linhas conhecidas) vira um evento 'recarga' para todos os assinantes.
+    """
+    versao: int
+    grupos: Mapping[Tuple[int, int], List[dict]] = field(default_factory=dict)
+    recarga: bool = False
+
+    def codificar(self, chave: ChaveFiltro) -> Optional[bytes]:
+        """Mensagem para um filtro, ou None se nada do evento interessa a ele."""
+        if self.recarga:
+            return formatar_sse('recarga', self.versao, {"versao": self.versao})
+        ras, naturezas = chave
+        registros = [
+            registro
+            for (id_ra, cod_natureza), grupo in self.grupos.items()
+            if (not ras or id_ra in ras) and (not naturezas or cod_natureza in naturezas)
+            for registro in grupo
+        ]
+        if not registros:
+            return None
+        return formatar_sse('ocorrencias', self.versao, {"versao": self.versao, "ocorrencias": registros})
+
+
+def montar_evento(dataset, novas) -> EventoPublicacao:
+    """
+    Converte as linhas publicadas em registros (uma vez por evento, seja qual
+    for o número de assinantes). A média histórica é a mesma do
+    /ocorrencias_media, lida pelos índices da nova versão.
+    """
+    if novas is None:
+        return EventoPublicacao(versao=dataset.versao, recarga=True)
+
+    grupos: Dict[Tuple[int, int], List[dict]] = {}
+    medias: Dict[Tuple[int, int, int], float] = {}
+    for linha in novas.drop_duplicates(['id_ra', 'ano', 'mes', 'cod_natureza'], keep='last').itertuples(index=False):
+        id_ra, mes, cod_natureza = int(linha.id_ra), int(linha.mes), int(linha.cod_natureza)
+        chave_media = (id_ra, mes, cod_natureza)
+        if chave_media not in medias:
+            historico = dataset.historico_ra_mes_natureza(id_ra=id_ra, mes=mes, cod_natureza=cod_natureza)
+            medias[chave_media] = round(float(historico['quantidade'].mean()), 0)
+        grupos.setdefault((id_ra, cod_natureza), []).append({
+            "ID_RA": id_ra,
+            "COD_NATUREZA": cod_natureza,
+            "ANO": int(linha.ano),
+            "MES": mes,
+            "QUANTIDADE": int(linha.quantidade),
+            "Natureza": str(linha.natureza),
+            "RegiaoAdministrativa": str(linha.regiao_administrativa),
+            "Media_Historica_Mes": medias[chave_media],
+        })
+    return EventoPublicacao(versao=dataset.versao, grupos=grupos)
+
+
+# ----------------------------------------------
+# CLASSE Assinante --- Uma conexão SSE
+# ----------------------------------------------
+
+class Assinante:
+    __slots__ = ('chave', 'fila')
+
+    def __init__(self, ras: Iterable[int], naturezas: Iterable[int], tamanho_fila: int):
+        self.chave: ChaveFiltro = (frozenset(ras or ()), frozenset(naturezas or ()))
+        # +1: sempre cabe o aviso de encerramento (None) de um assinante lento
+        self.fila: asyncio.Queue = asyncio.Queue(maxsize=tamanho_fila + 1)
+
+
+# ----------------------------------------------
+# CLASSE CentralEventos --- Fan-out para os assinantes
+# ----------------------------------------------
+
+class CentralEventos:
+    """
+    A escrita só entrega (versão, linhas) a uma thread própria, que monta o
+    evento uma vez e o passa ao event loop com um único call_soon_threadsafe.
+    No loop, cada filtro distinto é codificado uma vez e os mesmos bytes vão
+    para a fila de todos os assinantes com esse filtro. Um assinante que não
+    consome (fila cheia) é desconectado em vez de acumular memória; o
+    EventSource do navegador reconecta sozinho.
+    """
+
+    def __init__(self, max_assinantes: int, tamanho_fila: int):
+        self.max_assinantes = max_assinantes
+        self.tamanho_fila = tamanho_fila
+        self._assinantes: Set[Assinante] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Uma única thread mantém a ordem dos eventos (versões crescentes)
+        self._preparador = ThreadPoolExecutor(max_workers=1, thread_name_prefix="eventos")
+        self.desconectados_lentos = 0
+
+    @property
+    def total(self) -> int:
+        return len(self._assinantes)
+
+    @property
+    def lotado(self) -> bool:
+        return len(self._assinantes) >= self.max_assinantes
+
+    # --- Assinaturas (sempre no event loop) ---
+
+    def assinar(self, ras: Iterable[int] = (), naturezas: Iterable[int] = ()) -> Assinante:
+        self._loop = asyncio.get_running_loop()
+        assinante = Assinante(ras, naturezas, self.tamanho_fila)
+        self._assinantes.add(assinante)
+        return assinante
+
+    def cancelar(self, assinante: Assinante):
+        self._assinantes.discard(assinante)
+
+    async def fluxo(self, ras: Iterable[int], naturezas: Iterable[int], heartbeat: float) -> AsyncIterator[bytes]:
+        """Corpo da resposta SSE: eventos do filtro e, sem eventos, um comentário de keep-alive."""
+        assinante = self.assinar(ras, naturezas)
+        try:
+            yield b"retry: 3000\n\n"
+            while True:
+                try:
+                    dados = await asyncio.wait_for(assinante.fila.get(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield b": ping\n\n"
+                    continue
+                if dados is None:
+                    break
+                yield dados
+        finally:
+            self.cancelar(assinante)
+
+    # --- Publicação ---
+
+    def publicar(self, dataset, novas):
+        """Ouvinte do model_loader (thread da escrita): sem assinantes, não faz nada."""
+        if not self._assinantes:
+            return
+        self._preparador.submit(self._preparar, dataset, novas)
+
+    def _preparar(self, dataset, novas):
+        try:
+            evento = montar_evento(dataset, novas)
+        except Exception as e:
+            logger.error(f"ERRO ao montar evento da versão {dataset.versao}: {e}")
+            return
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self.distribuir, evento)
+
+    def distribuir(self, evento: EventoPublicacao):
+        """Entrega o evento a todos os assinantes (no event loop)."""
+        codificados: Dict[ChaveFiltro, Optional[bytes]] = {}
+        for assinante in list(self._assinantes):
+            if assinante.chave not in codificados:
+                codificados[assinante.chave] = evento.codificar(assinante.chave)
+            dados = codificados[assinante.chave]
+            if dados is None:
+                continue
+            if assinante.fila.qsize() >= self.tamanho_fila:
+                self._desconectar(assinante)
+                continue
+            assinante.fila.put_nowait(dados)
+
+    def _desconectar(self, assinante: Assinante):
+        self.cancelar(assinante)
+        self.desconectados_lentos += 1
+        while not assinante.fila.empty():
+            assinante.fila.get_nowait()
+        assinante.fila.put_nowait(None)
+        logger.warning("Assinante de eventos desconectado: fila cheia (cliente lento).")
+
+
+def criar_central() -> CentralEventos:
+    return CentralEventos(settings.SSE_MAX_SUBSCRIBERS, settings.SSE_QUEUE_SIZE)
@@ -0,0 +1,97 @@
+# Arquivo: src/api/executores.py
+# Pools de threads dedicados para o trabalho pesado dos endpoints assíncronos
+
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import AsyncIterator, Callable, Dict, Iterator, Optional, TypeVar
+
+from src.config import settings, logger
+from src.api.profiling import perfilar_chamada
+
+T = TypeVar("T")
+
+
+# ----------------------------------------------
+# CLASSE Executores --- Um pool por tipo de trabalho
+# ----------------------------------------------
+
+class Executores:
+    """
+    Os endpoints são assíncronos; o que usa pandas (ou grava arquivos) roda
+    num pool próprio ao tipo de trabalho:
+
+    * consulta: filtros por índice, médias, distribuição (busca binária) e as
+      fatias das exportações (rápidos, muitos ao mesmo tempo);
+    * agregacao: agregados, previsão, matriz e comovimento (lentos, poucos);
+    * escrita: gravação em CSV/SQLite (I/O, serializada pela trava de carga).
+
+    Uma agregação demorada ocupa só as threads de `agregacao`; as consultas
+    baratas e as rotas triviais (que rodam no próprio event loop) seguem
+    atendidas. Os pools são criados no primeiro uso.
+    """
+
+    def __init__(self, tamanhos: Dict[str, int]):
+        self.tamanhos = dict(tamanhos)
+        self._pools: Dict[str, ThreadPoolExecutor] = {}
+        self._lock = threading.Lock()
+
+    def pool(self, nome: str) -> ThreadPoolExecutor:
+        pool = self._pools.get(nome)
+        if pool is None:
+            with self._lock:
+                pool = self._pools.get(nome)
+                if pool is None:
+                    pool = ThreadPoolExecutor(max_workers=self.tamanhos[nome], thread_name_prefix=f"exec-{nome}")
+                    self._pools[nome] = pool
+        return pool
+
+    async def executar(self, nome: str, funcao: Callable[..., T], *args, **kwargs) -> T:
+        """
+        Roda `funcao` no pool `nome` e aguarda o resultado sem bloquear o loop.
+        O contexto da requisição vai junto: a versão do dataset fixada pelo
+        middleware e a sessão de profiling valem também na outra thread.
+        """
+        contexto = contextvars.copy_context()
+        chamada = partial(contexto.run, perfilar_chamada, funcao, *args, **kwargs)
+        return await asyncio.get_running_loop().run_in_executor(self.pool(nome), chamada)
+
+    async def iterar(self, nome: str, iterador: Iterator[T]) -> AsyncIterator[T]:
+        """
+        Consome um iterador síncrono (ex.: as fatias de uma exportação) no
+        pool `nome`, um item por vez: o trabalho de cada item roda fora do
+        event loop e fora do threadpool padrão do Starlette.
+        """
+        fim = object()
+        try:
+            while True:
+                item = await self.executar(nome, next, iterador, fim)
+                if item is fim:
+                    return
+                yield item
+        finally:
+            # Cliente desconectado no meio: o gerador é fechado no pool também
+            fechar = getattr(iterador, "close", None)
+            if fechar is not None:
+                await self.executar(nome, fechar)
+
+    def encerrar(self, esperar: bool = False):
+        with self._lock:
+            pools, self._pools = list(self._pools.values()), {}
+        for pool in pools:
+            pool.shutdown(wait=esperar)
+
+    def descrever(self) -> str:
+        return ", ".join(f"{nome}={tamanho}" for nome, tamanho in self.tamanhos.items())
+
+
+def criar_executores(tamanhos: Optional[Dict[str, int]] = None) -> Executores:
+    executores = Executores(tamanhos or {
+        "consulta": settings.EXECUTOR_QUERY_WORKERS,
+        "agregacao": settings.EXECUTOR_AGGREGATION_WORKERS,
+        "escrita": settings.EXECUTOR_WRITE_WORKERS,
+    })
+    logger.debug(f"Executores: {executores.descrever()}")
+    return executores
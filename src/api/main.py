@@ -4,25 +4,128 @@
 # Data: 2025-11-15
 
 import random
-from typing import List
+import threading
+from contextlib import asynccontextmanager
+from typing import List, Optional
 
-from fastapi import FastAPI, HTTPException, status, Path, Query
+from fastapi import FastAPI, HTTPException, Request, status, Path, Query
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 
-from src.config import settings, API_DESCRIPTION, API_TITLE, API_VERSION, logger 
+from src.config import settings, API_DESCRIPTION, API_TITLE, API_VERSION, logger, setup_logging
 from fastapi.middleware.cors import CORSMiddleware # <--- NOVO IMPORT
-from src.models.model_loader import buscar_natureza
-from src.schemas.schemas import OcorrenciasRequest, OcorrenciasResponse, SuccessMessage, NaturezaResponse, Ocorrencias_Nomes_Response, OcorrenciasMediaResponse
+from src.models.model_loader import buscar_natureza, fixar_dataset, dataset_carregado, obter_dataset, registrar_ouvinte
+from src.models.data_watcher import DataWatcher
+from src.api.admission import ControleAdmissao, ajustar_threadpool, baias_padrao
+from src.api.compressao import CompressaoVersionada, criar_cache
+from src.api.eventos import criar_central
+from src.api.executores import criar_executores
+from src.schemas.schemas import OcorrenciasRequest, OcorrenciaDiariaRequest, OcorrenciasRollupResponse, DatasetInfoResponse, OcorrenciasResponse, SuccessMessage, NaturezaResponse, Ocorrencias_Nomes_Response, OcorrenciasMediaResponse, OcorrenciasPrevisaoResponse, OcorrenciasMatrizResponse, OcorrenciasDistribuicaoResponse, OcorrenciasComovimentoResponse, DatasetOcorrenciasNomesResponse, DatasetOcorrenciasMediaResponse
 #from src.models.model_loader import filter_ocorrencias
-from src.services import ocorrencias_service
-from src.services.ocorrencias_service import get_ocorrencias_nomes_filtradas, get_media_historica
+from src.services import ocorrencias_service, materializacao_service
+from src.services.ocorrencias_service import get_ocorrencias_nomes_filtradas, get_ocorrencias_nomes_compactas, validar_campos, get_media_historica, get_previsoes, get_matriz, get_distribuicao_historica, get_rollup, listar_datasets, get_comovimento
+from src.services.exportacao_service import FORMATOS, FiltrosExportacao, exportar, validar_colunas
+
+
+# ------------------------------------------------
+# --- CICLO DE VIDA (logging, carga e monitor de dados) ---
+# ------------------------------------------------
+# Importar este módulo não carrega pandas nem cria arquivos: logging, carga do
+# dataset e monitor só começam quando o servidor sobe a aplicação.
+
+def _pre_carregar_dataset():
+    try:
+        dataset = obter_dataset()
+        # Ajuste em lote do modelo de previsão de todas as séries
+        dataset.modelo_sazonal
+        logger.info(f"Dataset versão {dataset.versao} pré-carregado.")
+        # Respostas pré-renderizadas de /ocorrencias_nomes e /natureza
+        materializacao_service.agendar(dataset)
+    except Exception as e:
+        logger.error(f"ERRO na pré-carga do dataset: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    setup_logging()
+    if settings.PROFILING_ENABLED:
+        logger.info(f"Profiling por requisição habilitado (cabeçalho {settings.PROFILING_HEADER}).")
+    if settings.DATA_PRELOAD_ON_STARTUP:
+        # Em segundo plano: o worker já responde /health enquanto os dados carregam
+        threading.Thread(target=_pre_carregar_dataset, name="dataset-preload", daemon=True).start()
+
+    if settings.ADMISSION_ENABLED:
+        ajustar_threadpool(baias_admissao)
+    logger.info(f"Pools dedicados: {executores.descrever()}")
+
+    watcher = None
+    if settings.DATA_WATCH_ENABLED:
+        watcher = DataWatcher(intervalo=settings.DATA_WATCH_INTERVAL_SECONDS)
+        watcher.iniciar()
+    yield
+    if watcher is not None:
+        watcher.parar()
+    executores.encerrar()
 
 
 app = FastAPI(
     title=API_TITLE,
     description=API_DESCRIPTION,
-    version=API_VERSION
+    version=API_VERSION,
+    lifespan=lifespan
 )
 
+# ---------------------------------------------------
+# --- PROFILING OPCIONAL (desligado por padrão) ---
+# ---------------------------------------------------
+# Só é instalado com PROFILING_ENABLED=true; desligado, não há custo algum.
+# A classe de rota precisa ser definida antes da declaração dos endpoints.
+
+if settings.PROFILING_ENABLED:
+    from src.api.profiling import RotaProfilavel, perfilar_requisicao
+    app.router.route_class = RotaProfilavel
+    app.middleware("http")(perfilar_requisicao)
+
+# ---------------------------------------------------
+# --- CONTROLE DE ADMISSÃO (concorrência por rota) ---
+# ---------------------------------------------------
+# Cada grupo de rotas tem vagas e fila próprias: uma rajada de consultas caras
+# recebe 503 rápido em vez de travar /health, /ready e /natureza.
+# Fica dentro do CORS para que as respostas 503 também levem os cabeçalhos.
+
+baias_admissao = baias_padrao()
+if settings.ADMISSION_ENABLED:
+    app.add_middleware(ControleAdmissao, baias=baias_admissao)
+
+# ---------------------------------------------------
+# --- COMPRESSÃO COM CACHE POR VERSÃO DO DATASET ---
+# ---------------------------------------------------
+# Fica fora do controle de admissão (uma resposta do cache não ocupa vaga) e
+# dentro da fixação de versão (a chave usa a mesma versão que o endpoint lê).
+
+cache_compressao = criar_cache()
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressaoVersionada, cache=cache_compressao)
+
+# ---------------------------------------------------
+# --- EVENTOS (SSE) ---
+# ---------------------------------------------------
+# Cada versão publicada por uma escrita vira um único evento, distribuído a
+# todos os assinantes de /ocorrencias_eventos conforme os filtros de cada um.
+
+central_eventos = criar_central()
+registrar_ouvinte(central_eventos.publicar)
+# A cada versão publicada, as respostas materializadas são refeitas em segundo plano
+registrar_ouvinte(materializacao_service.agendar)
+
+# ---------------------------------------------------
+# --- POOLS DEDICADOS (trabalho pesado fora do event loop) ---
+# ---------------------------------------------------
+# Os endpoints são assíncronos: rotas triviais e respostas materializadas são
+# atendidas no próprio event loop; pandas e gravações rodam nos pools
+# "consulta", "agregacao" e "escrita", cada um com o seu tamanho.
+
+executores = criar_executores()
+
 # ----------------------------
 # --- CONFIGURAÇÃO DO CORS ---
 # ----------------------------
@@ -39,12 +142,24 @@ app.add_middleware(
 )
 
 
+# ---------------------------------------------------
+# --- VERSÃO DO DATASET FIXADA POR REQUISIÇÃO ---
+# ---------------------------------------------------
+# Todas as leituras de uma requisição enxergam a mesma versão dos dados,
+# mesmo que uma escrita ou recarga publique outra versão no meio do caminho.
+
+@app.middleware("http")
+async def fixar_versao_dataset(request, call_next):
+    with fixar_dataset():
+        return await call_next(request)
+
+
 # ---------------------
 # --- Endpoint raiz ---
 # ---------------------
 
 @app.get("/")
-def root():
+async def root():
     logger.info("Endpoint raiz acessado")
     return {
         "message": "API Dados de Segurança Pública funcionando!",
@@ -55,28 +170,81 @@ def root():
 # -----------------------------
 
 @app.get("/health")
-def health_check():
+async def health_check():
     logger.info("Health check realizado!")
     return {
         "status": "Funcionando!",
         "service": API_TITLE,
         "version": API_VERSION
     }
+# ---------------------------------
+# --- Readiness Check Endpoint ---
+# ---------------------------------
+
+@app.get("/ready")
+async def readiness_check():
+    """Pronto para consultas somente depois que o dataset estiver carregado."""
+    dataset = dataset_carregado()
+    if dataset is None:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Dados ainda não carregados.")
+    # Linhas rejeitadas pela validação da carga (relatório em QUARANTINE_DIR)
+    quarentena = dataset.validacao.rejeitadas if dataset.validacao is not None else 0
+    return {"status": "Pronto!", "versao_dados": dataset.versao, "linhas_em_quarentena": quarentena}
+
 # --------------------------------------------
 # --- ENDPOINT DE CONSULTA COM NOMES (GET) ---
 # --------------------------------------------
 
+# ---------------------------------------------------
+# --- RESPOSTAS MATERIALIZADAS (bytes prontos por versão) ---
+# ---------------------------------------------------
+
+def _materializacao_atual():
+    """Respostas prontas da versão fixada; se ainda não existirem, agenda a montagem."""
+    if dataset_carregado() is None:
+        # A primeira carga roda no pool de consultas, nunca no event loop
+        return None
+    dataset = obter_dataset()
+    materializacao = materializacao_service.obter_materializacao(dataset)
+    if materializacao is None:
+        materializacao_service.agendar(dataset)
+    return materializacao
+
+
+def _corpo_materializado(corpo, request: Request, detalhe_404: str) -> Response:
+    """Envia os bytes prontos (gzip, se materializado e aceito pelo cliente); chave ausente = 404."""
+    if corpo is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=detalhe_404)
+    dados, comprimido = corpo
+    if comprimido is not None and "gzip" in request.headers.get("accept-encoding", ""):
+        return Response(comprimido, media_type="application/json",
+                        headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"})
+    return Response(dados, media_type="application/json")
+
+
 @app.get("/ocorrencias_nomes", response_model=List[Ocorrencias_Nomes_Response])
-def ocorrencias_nomes(
+async def ocorrencias_nomes(
+    request: Request,
     # Query: Usado para definir parâmetros obrigatórios na URL
     id_ra: int = Query(..., description="ID da Região Administrativa para filtro.", ge=1, le=33),
     ano: int = Query(..., ge=2000, le=2100, description="Ano da ocorrência."),
     mes: int = Query(..., ge=1, le=12, description="Mês da ocorrência."),
+    campos: Optional[str] = Query(None, alias="fields", description="Campos da resposta, separados por vírgula (padrão: todos)."),
+    formato: str = Query("linhas", alias="format", pattern="^(linhas|columnar)$",
+                         description="linhas (lista de objetos) ou columnar (um array por campo, nomes em dicionário)."),
 ):
     logger.info(f"Consulta Nomes solicitada: ID_RA={id_ra}, Ano={ano}, Mês={mes}")
 
+    if campos is not None or formato != "linhas":
+        return await executores.executar("consulta", _nomes_compactos, id_ra, ano, mes, campos, formato)
+
+    materializacao = _materializacao_atual()
+    if materializacao is not None:
+        return _corpo_materializado(materializacao.nomes.get((id_ra, ano, mes)), request,
+                                    "Nenhuma ocorrência encontrada para os filtros fornecidos.")
+
     # Delega a filtragem para a camada de Serviço
-    dados_filtrados = get_ocorrencias_nomes_filtradas(id_ra=id_ra, ano=ano, mes=mes)
+    dados_filtrados = await executores.executar("consulta", get_ocorrencias_nomes_filtradas, id_ra=id_ra, ano=ano, mes=mes)
 
     if not dados_filtrados:
          # Retorna 404 Not Found se não houver resultados
@@ -84,6 +252,18 @@ def ocorrencias_nomes(
 
     return dados_filtrados
 
+def _nomes_compactos(id_ra: int, ano: int, mes: int, campos: Optional[str], formato: str,
+                     nome_dataset: Optional[str] = None) -> JSONResponse:
+    """Projeção (fields=) e formato colunar: serializados direto das colunas, sem o response_model."""
+    try:
+        dados = get_ocorrencias_nomes_compactas(id_ra=id_ra, ano=ano, mes=mes, campos=validar_campos(campos),
+                                                formato=formato, nome_dataset=nome_dataset)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if dados is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Nenhuma ocorrência encontrada para os filtros fornecidos.")
+    return JSONResponse(dados)
+
 # --------------------------------------------
 # --- ENDPOINT DE CADASTRO DE OCORRENCIAS (POST) ---
 # --------------------------------------------
@@ -92,14 +272,14 @@ def ocorrencias_nomes(
           response_model=SuccessMessage,
           status_code=status.HTTP_201_CREATED,
           summary="Cadastra novas ocorrências.")
-def adicionar_ocorrencias(input_data: OcorrenciasRequest):
+async def adicionar_ocorrencias(input_data: OcorrenciasRequest):
     """
     Recebe os dados de ocorrências, valida o formato e registra no CSV.
     Retorna objeto salvo.
     """
     try:
         # Delega a lógica de persistência para a camada de Serviço
-        ocorrencias_service.cadatrar_ocorrencias(input_data)
+        await executores.executar("escrita", ocorrencias_service.cadatrar_ocorrencias, input_data)
 
         # Retorna o modelo de resposta de sucesso
         return SuccessMessage(message="Ocorrências registradas com sucesso!")
@@ -111,15 +291,44 @@ def adicionar_ocorrencias(input_data: OcorrenciasRequest):
             detail=f"Falha ao registrar a ocorrências: {e}"
         )
 
+# --------------------------------------------------------
+# --- ENDPOINT DE CADASTRO DE OCORRENCIAS DIÁRIAS (POST) ---
+# --------------------------------------------------------
+
+@app.post("/ocorrencias_diarias",
+          response_model=SuccessMessage,
+          status_code=status.HTTP_201_CREATED,
+          summary="Cadastra um lote de ocorrências diárias.")
+async def adicionar_ocorrencias_diarias(input_data: List[OcorrenciaDiariaRequest]):
+    """
+    Registra as linhas diárias e atualiza os agregados semanal e mensal
+    (os endpoints mensais passam a enxergar o novo total do mês).
+    """
+    if not input_data:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Nenhuma ocorrência informada.")
+    try:
+        meses = await executores.executar("escrita", ocorrencias_service.cadastrar_ocorrencias_diarias, input_data)
+        return SuccessMessage(message=f"{len(input_data)} ocorrências diárias registradas; {meses} meses atualizados.")
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Falha ao registrar as ocorrências diárias: {e}"
+        )
+
 #Endpoint para busca das naturezas disponíveis
 @app.get("/natureza/{codigo}", response_model=NaturezaResponse)
-def get_natureza(codigo: int = Path(..., gt=0, description="Código da natureza da ocorrência")):
+async def get_natureza(request: Request, codigo: int = Path(..., gt=0, description="Código da natureza da ocorrência")):
 
     """
     Retorna a natureza correspondente ao código informado.
     Converte para string porque a função buscar_natureza espera receber uma string.
     """
-    natureza = buscar_natureza(str(codigo))
+    materializacao = _materializacao_atual()
+    if materializacao is not None:
+        return _corpo_materializado(materializacao.naturezas.get(codigo), request, "Código de natureza não encontrado")
+
+    natureza = await executores.executar("consulta", buscar_natureza, str(codigo))
 
     if natureza is None:
         raise HTTPException(status_code=404, detail="Código de natureza não encontrado")
@@ -132,7 +341,7 @@ def get_natureza(codigo: int = Path(..., gt=0, description="Código da natureza
 # ----------------------------------------------------
 
 @app.get("/ocorrencias_media", response_model=OcorrenciasMediaResponse)
-def ocorrencias_media(
+async def ocorrencias_media(
     # Parâmetros obrigatórios e validados na URL
     id_ra: int = Query(..., description="ID da Região Administrativa para filtro.", ge=1, le=33),
     ano: int = Query(..., ge=2000, le=2100, description="Ano da ocorrência."),
@@ -143,7 +352,9 @@ def ocorrencias_media(
 
     try:
         # Delega o cálculo para a camada de Serviço
-        dados_media = get_media_historica(
+        dados_media = await executores.executar(
+            "consulta",
+            get_media_historica,
             id_ra=id_ra,
             ano=ano,
             mes=mes,
@@ -159,3 +370,249 @@ def ocorrencias_media(
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Erro interno ao calcular a média histórica.")
 
 
+# ----------------------------------------------------------
+# --- ENDPOINT DE DISTRIBUIÇÃO HISTÓRICA (GET) ---
+# ----------------------------------------------------------
+
+@app.get("/ocorrencias_distribuicao", response_model=OcorrenciasDistribuicaoResponse)
+async def ocorrencias_distribuicao(
+    # Mesmos parâmetros do /ocorrencias_media
+    id_ra: int = Query(..., description="ID da Região Administrativa para filtro.", ge=1, le=33),
+    ano: int = Query(..., ge=2000, le=2100, description="Ano da ocorrência."),
+    mes: int = Query(..., ge=1, le=12, description="Mês da ocorrência."),
+    cod_natureza: int = Query(..., description="Código da Natureza para cálculo da distribuição.", ge=1)
+):
+    logger.info(f"Consulta Distribuição Histórica solicitada: RA={id_ra}, Ano={ano}, Mês={mes}, Natureza={cod_natureza}")
+
+    try:
+        return await executores.executar("consulta", get_distribuicao_historica,
+                                         id_ra=id_ra, ano=ano, mes=mes, cod_natureza=cod_natureza)
+
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
+# ----------------------------------------------------
+# --- ENDPOINT DE AGREGADOS (SEMANA/MÊS/ANO) (GET) ---
+# ----------------------------------------------------
+
+@app.get("/ocorrencias_rollup", response_model=List[OcorrenciasRollupResponse])
+async def ocorrencias_rollup(
+    granularidade: str = Query("mes", pattern="^(semana|mes|ano)$", description="semana (ISO), mes ou ano."),
+    id_ra: Optional[int] = Query(None, ge=1, le=33, description="ID da Região Administrativa."),
+    cod_natureza: Optional[int] = Query(None, ge=1, description="Código da Natureza."),
+    ano: Optional[int] = Query(None, ge=2000, le=2100, description="Ano (ISO, na granularidade semanal)."),
+):
+    logger.info(f"Consulta Agregados solicitada: {granularidade}, RA={id_ra}, Natureza={cod_natureza}, Ano={ano}")
+
+    try:
+        return await executores.executar("agregacao", get_rollup,
+                                         granularidade=granularidade, id_ra=id_ra, cod_natureza=cod_natureza, ano=ano)
+
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
+# ----------------------------------------------------
+# --- ENDPOINTS POR DATASET (catálogo) ---
+# ----------------------------------------------------
+# Os datasets do catálogo (arquivos históricos, outras jurisdições) têm seus
+# próprios anos e RAs: os limites de ano e RA do dataset principal não valem aqui.
+
+@app.get("/datasets", response_model=List[DatasetInfoResponse])
+async def datasets_disponiveis():
+    return await executores.executar("consulta", listar_datasets)
+
+
+@app.get("/datasets/{nome}/ocorrencias_nomes", response_model=List[DatasetOcorrenciasNomesResponse])
+async def ocorrencias_nomes_dataset(
+    nome: str = Path(..., description="Nome do dataset (ver /datasets)."),
+    id_ra: int = Query(..., ge=1, description="ID da Região Administrativa para filtro."),
+    ano: int = Query(..., ge=1900, le=2100, description="Ano da ocorrência."),
+    mes: int = Query(..., ge=1, le=12, description="Mês da ocorrência."),
+    campos: Optional[str] = Query(None, alias="fields", description="Campos da resposta, separados por vírgula (padrão: todos)."),
+    formato: str = Query("linhas", alias="format", pattern="^(linhas|columnar)$",
+                         description="linhas (lista de objetos) ou columnar (um array por campo, nomes em dicionário)."),
+):
+    logger.info(f"Consulta Nomes solicitada: dataset={nome}, ID_RA={id_ra}, Ano={ano}, Mês={mes}")
+
+    try:
+        if campos is not None or formato != "linhas":
+            return await executores.executar("consulta", _nomes_compactos, id_ra, ano, mes, campos, formato,
+                                             nome_dataset=nome)
+        dados_filtrados = await executores.executar("consulta", get_ocorrencias_nomes_filtradas,
+                                                    id_ra=id_ra, ano=ano, mes=mes, nome_dataset=nome)
+    except KeyError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=e.args[0])
+
+    if not dados_filtrados:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Nenhuma ocorrência encontrada para os filtros fornecidos.")
+    return dados_filtrados
+
+
+@app.get("/datasets/{nome}/ocorrencias_media", response_model=DatasetOcorrenciasMediaResponse)
+async def ocorrencias_media_dataset(
+    nome: str = Path(..., description="Nome do dataset (ver /datasets)."),
+    id_ra: int = Query(..., ge=1, description="ID da Região Administrativa para filtro."),
+    ano: int = Query(..., ge=1900, le=2100, description="Ano da ocorrência."),
+    mes: int = Query(..., ge=1, le=12, description="Mês da ocorrência."),
+    cod_natureza: int = Query(..., ge=1, description="Código da Natureza para cálculo da média."),
+):
+    logger.info(f"Consulta Média Histórica solicitada: dataset={nome}, RA={id_ra}, Ano={ano}, Mês={mes}, Natureza={cod_natureza}")
+
+    try:
+        return await executores.executar("consulta", get_media_historica,
+                                         id_ra=id_ra, ano=ano, mes=mes, cod_natureza=cod_natureza, nome_dataset=nome)
+    except KeyError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=e.args[0])
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
+# ----------------------------------------------------
+# --- ENDPOINT DE ASSINATURA DE EVENTOS (SSE) ---
+# ----------------------------------------------------
+
+@app.get("/ocorrencias_eventos", summary="Recebe novas ocorrências e médias atualizadas (Server-Sent Events).")
+async def ocorrencias_eventos(
+    id_ra: Optional[List[int]] = Query(None, description="RAs de interesse (repita o parâmetro; padrão: todas)."),
+    cod_natureza: Optional[List[int]] = Query(None, description="Naturezas de interesse (padrão: todas)."),
+):
+    """
+    Mantém a conexão aberta e envia um evento `ocorrencias` a cada escrita que
+    toque os filtros, com os registros novos/atualizados e a média histórica do
+    mês recalculada. Uma recarga completa dos arquivos envia `recarga`.
+    """
+    if central_eventos.lotado:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                            detail="Limite de assinantes atingido; tente novamente.",
+                            headers={"Retry-After": str(settings.ADMISSION_RETRY_AFTER_SECONDS)})
+
+    return StreamingResponse(
+        central_eventos.fluxo(id_ra, cod_natureza, settings.SSE_HEARTBEAT_SECONDS),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# ----------------------------------------------------
+# --- ENDPOINT DE PREVISÃO SAZONAL (GET) ---
+# ----------------------------------------------------
+
+@app.get("/ocorrencias_previsao", response_model=List[OcorrenciasPrevisaoResponse])
+async def ocorrencias_previsao(
+    # Filtros opcionais: sem eles, retorna todas as séries (RA, Natureza)
+    id_ra: Optional[int] = Query(None, description="ID da Região Administrativa para filtro.", ge=1, le=33),
+    cod_natureza: Optional[int] = Query(None, description="Código da Natureza para filtro.", ge=1)
+):
+    logger.info(f"Consulta Previsão solicitada: RA={id_ra}, Natureza={cod_natureza}")
+
+    try:
+        return await executores.executar("agregacao", get_previsoes, id_ra=id_ra, cod_natureza=cod_natureza)
+
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
+# ----------------------------------------------------
+# --- ENDPOINT DE MATRIZ (RECORTE 2-D) (GET) ---
+# ----------------------------------------------------
+
+DIMENSOES_MATRIZ = "^(ano|mes|id_ra|cod_natureza)$"
+
+@app.get("/ocorrencias_matriz", response_model=OcorrenciasMatrizResponse)
+async def ocorrencias_matriz(
+    linhas: str = Query("id_ra", pattern=DIMENSOES_MATRIZ, description="Dimensão das linhas."),
+    colunas: str = Query("cod_natureza", pattern=DIMENSOES_MATRIZ, description="Dimensão das colunas."),
+    # Filtros opcionais: dimensões não fixadas (e fora de linhas/colunas) são somadas
+    ano: Optional[int] = Query(None, ge=2000, le=2100, description="Ano da ocorrência."),
+    mes: Optional[int] = Query(None, ge=1, le=12, description="Mês da ocorrência."),
+    id_ra: Optional[int] = Query(None, ge=1, le=33, description="ID da Região Administrativa."),
+    cod_natureza: Optional[int] = Query(None, ge=1, description="Código da Natureza."),
+):
+    logger.info(f"Consulta Matriz solicitada: {linhas} x {colunas}, Ano={ano}, Mês={mes}, RA={id_ra}, Natureza={cod_natureza}")
+
+    if linhas == colunas:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Linhas e colunas devem ser dimensões diferentes.")
+
+    filtros = {dimensao: valor for dimensao, valor in
+               (("ano", ano), ("mes", mes), ("id_ra", id_ra), ("cod_natureza", cod_natureza)) if valor is not None}
+    try:
+        return await executores.executar("agregacao", get_matriz, linhas=linhas, colunas=colunas, filtros=filtros)
+
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
+# ----------------------------------------------------
+# --- ENDPOINT DE COMOVIMENTO (CORRELAÇÃO/COVARIÂNCIA) (GET) ---
+# ----------------------------------------------------
+
+@app.get("/ocorrencias_comovimento", response_model=OcorrenciasComovimentoResponse)
+async def ocorrencias_comovimento(
+    # Exatamente um dos dois: a RA (compara as naturezas) ou a natureza (compara as RAs)
+    id_ra: Optional[int] = Query(None, ge=1, le=33, description="RA cujas naturezas serão comparadas."),
+    cod_natureza: Optional[int] = Query(None, ge=1, description="Natureza cujas RAs serão comparadas."),
+    ano_inicio: Optional[int] = Query(None, ge=2000, le=2100, description="Primeiro ano (padrão: o mais antigo)."),
+    ano_fim: Optional[int] = Query(None, ge=2000, le=2100, description="Último ano (padrão: o mais recente)."),
+    metodo: str = Query("correlacao", pattern="^(correlacao|covariancia)$", description="correlacao ou covariancia."),
+):
+    logger.info(f"Consulta Comovimento solicitada: RA={id_ra}, Natureza={cod_natureza}, Anos={ano_inicio}..{ano_fim}, Método={metodo}")
+
+    if (id_ra is None) == (cod_natureza is None):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Informe id_ra ou cod_natureza (apenas um).")
+    if ano_inicio is not None and ano_fim is not None and ano_inicio > ano_fim:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="ano_inicio deve ser menor ou igual a ano_fim.")
+
+    series, fixo = ("cod_natureza", id_ra) if id_ra is not None else ("id_ra", cod_natureza)
+    try:
+        return await executores.executar("agregacao", get_comovimento, series=series, fixo=fixo,
+                                         ano_inicio=ano_inicio, ano_fim=ano_fim, metodo=metodo)
+
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
+# ----------------------------------------------------
+# --- ENDPOINT DE EXPORTAÇÃO EM LOTE (GET) ---
+# ----------------------------------------------------
+
+@app.get("/ocorrencias_export", summary="Exporta o dataset (ou um recorte) em CSV, Parquet ou Arrow.")
+async def exportar_ocorrencias(
+    formato: str = Query("csv", pattern="^(csv|parquet|arrow)$", description="csv, parquet ou arrow (IPC stream)."),
+    ano: Optional[int] = Query(None, ge=2000, le=2100, description="Ano da ocorrência."),
+    mes: Optional[int] = Query(None, ge=1, le=12, description="Mês da ocorrência."),
+    id_ra: Optional[int] = Query(None, ge=1, le=33, description="ID da Região Administrativa."),
+    cod_natureza: Optional[int] = Query(None, ge=1, description="Código da Natureza."),
+    colunas: Optional[str] = Query(None, description="Colunas separadas por vírgula (padrão: todas)."),
+):
+    """
+    Envia o arquivo em fatias, lidas direto das colunas em memória,
+    sem montar dicionários nem modelos Pydantic.
+    """
+    logger.info(f"Exportação solicitada: formato={formato}, ano={ano}, mes={mes}, RA={id_ra}, natureza={cod_natureza}")
+
+    try:
+        # obter_dataset() também vai para o pool: pode ser a primeira carga
+        gerador = await executores.executar(
+            "consulta",
+            lambda: exportar(
+                obter_dataset(),
+                formato,
+                FiltrosExportacao(ano=ano, mes=mes, id_ra=id_ra, cod_natureza=cod_natureza),
+                validar_colunas(colunas),
+            ),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail=str(e))
+
+    media_type, extensao = FORMATOS[formato]
+    # Cada fatia (recorte com pandas + codificação CSV/Parquet/Arrow) é gerada
+    # no pool "consulta", não no threadpool padrão do Starlette
+    return StreamingResponse(
+        executores.iterar("consulta", gerador),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="ocorrencias.{extensao}"'},
+    )
@@ -0,0 +1,245 @@
+# Arquivo: src/api/profiling.py
+# Profiling opcional por requisição (cProfile), ativado por configuração + cabeçalho
+
+import asyncio
+import cProfile
+import functools
+import inspect
+import pstats
+import re
+import threading
+import time
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from fastapi import Request, Response
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.routing import APIRoute, serialize_response
+from starlette.concurrency import run_in_threadpool
+
+from src.config import settings, logger
+
+VALORES_ATIVOS = {"1", "true", "yes", "on"}
+
+# Agrupamento do tempo próprio (tottime) das funções por origem, para o resumo
+CATEGORIAS = (
+    ("pandas", "/pandas/"),
+    ("numpy", "/numpy/"),
+    ("pydantic", "/pydantic"),
+    ("json", "/json/"),
+    ("fastapi", "/fastapi/"),
+    ("starlette", "/starlette/"),
+    ("app", "/src/"),
+)
+
+
+# ----------------------------------------------
+# CLASSE SessaoProfiling --- Perfis coletados durante uma requisição
+# ----------------------------------------------
+
+class SessaoProfiling:
+    """
+    Um único cProfile.Profile por requisição, ligado só na thread que executa
+    o trabalho (pool dos endpoints), nunca no event loop: o cProfile não
+    admite dois perfis ativos ao mesmo tempo (no Python 3.12, o segundo
+    levanta ValueError). Trechos da mesma requisição rodando em paralelo em
+    outra thread seguem sem medição.
+    """
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.perfil = cProfile.Profile()
+        self.medido = False
+        self.encerrada = False
+        self._lock = threading.Lock()
+
+    def executar(self, funcao: Callable, *args, **kwargs):
+        if not self._lock.acquire(blocking=False):
+            return funcao(*args, **kwargs)
+        if self.encerrada:
+            self._lock.release()
+            return funcao(*args, **kwargs)
+        try:
+            self.medido = True
+            return self.perfil.runcall(funcao, *args, **kwargs)
+        finally:
+            self._lock.release()
+
+    async def encerrar(self):
+        """
+        Impede novas medições (ex.: fatias de uma resposta em streaming, que
+        seguem depois do call_next) e espera a que estiver em andamento.
+        """
+        self.encerrada = True
+        await asyncio.to_thread(self._lock.acquire)
+        self._lock.release()
+
+    def estatisticas(self) -> Optional[pstats.Stats]:
+        return pstats.Stats(self.perfil) if self.medido else None
+
+
+_sessao_atual: ContextVar[Optional[SessaoProfiling]] = ContextVar('sessao_profiling', default=None)
+# Uma requisição perfilada por vez no processo; as demais com o cabeçalho
+# são atendidas normalmente, sem medição
+_lock_requisicao = threading.Lock()
+
+
+def perfilar_chamada(funcao: Callable, *args, **kwargs):
+    """
+    Executa `funcao` medindo-a com cProfile se a requisição atual estiver
+    sendo perfilada. Usado em código que roda fora do event loop (threadpool).
+    """
+    sessao = _sessao_atual.get()
+    if sessao is None:
+        return funcao(*args, **kwargs)
+    return sessao.executar(funcao, *args, **kwargs)
+
+
+# ----------------------------------------------
+# ROTA PROFILÁVEL --- mede endpoint e serialização na thread do trabalho
+# ----------------------------------------------
+
+def _concluir_sem_espera(corrotina):
+    """Executa até o fim uma corrotina que nunca suspende (ex.: serialize_response com is_coroutine=True)."""
+    try:
+        corrotina.send(None)
+    except StopIteration as fim:
+        return fim.value
+    corrotina.close()
+    raise RuntimeError("A serialização da resposta suspendeu fora do event loop.")
+
+
+class RotaProfilavel(APIRoute):
+    """
+    Numa requisição perfilada, o endpoint E a montagem da resposta (validação
+    do response_model pelo Pydantic e codificação JSON) rodam na thread
+    medida: fora dela, a serialização ficaria no event loop, sem perfil.
+    O endpoint devolve a Response pronta e o FastAPI só a repassa. Sem
+    profiling, o endpoint roda como numa APIRoute comum.
+    """
+
+    def get_route_handler(self) -> Callable:
+        original = self.dependant.call
+        assincrono = inspect.iscoroutinefunction(original)
+
+        @functools.wraps(original)
+        async def endpoint(**valores):
+            sessao = _sessao_atual.get()
+            if sessao is None:
+                if assincrono:
+                    return await original(**valores)
+                return await run_in_threadpool(original, **valores)
+            if assincrono:
+                # As chamadas aos executores dentro do endpoint já são medidas
+                resultado = await original(**valores)
+                if isinstance(resultado, Response):
+                    return resultado
+                return await asyncio.to_thread(sessao.executar, self._montar_resposta, resultado)
+            return await asyncio.to_thread(sessao.executar, self._executar_e_montar, original, valores)
+
+        self.dependant.call = endpoint
+        return super().get_route_handler()
+
+    def _executar_e_montar(self, original: Callable, valores: dict):
+        resultado = original(**valores)
+        if isinstance(resultado, Response):
+            return resultado
+        return self._montar_resposta(resultado)
+
+    def _montar_resposta(self, resultado) -> Response:
+        # Mesmos passos do FastAPI (get_request_handler), na thread atual
+        conteudo = _concluir_sem_espera(serialize_response(
+            field=self.response_field,
+            response_content=resultado,
+            include=self.response_model_include,
+            exclude=self.response_model_exclude,
+            by_alias=self.response_model_by_alias,
+            exclude_unset=self.response_model_exclude_unset,
+            exclude_defaults=self.response_model_exclude_defaults,
+            exclude_none=self.response_model_exclude_none,
+            is_coroutine=True,
+        ))
+        classe = self.response_class
+        if isinstance(classe, DefaultPlaceholder):
+            classe = classe.value
+        argumentos = {"status_code": self.status_code} if self.status_code else {}
+        return classe(conteudo, **argumentos)
+
+
+# ----------------------------------------------
+# MIDDLEWARE
+# ----------------------------------------------
+
+def resumir(stats: pstats.Stats, total_ms: float, top: int = 3) -> str:
+    """Monta o resumo do cabeçalho: tempo total, tempo por origem, merge e funções mais caras."""
+    por_categoria: Dict[str, float] = {nome: 0.0 for nome, _ in CATEGORIAS}
+    merge_ms = 0.0
+    funcoes = []
+    for (arquivo, _linha, nome), (_cc, _nc, tottime, cumtime, _callers) in stats.stats.items():
+        arquivo_normalizado = arquivo.replace("\\", "/")
+        for categoria, trecho in CATEGORIAS:
+            if trecho in arquivo_normalizado:
+                por_categoria[categoria] += tottime * 1000
+                break
+        if nome == "merge" and "/pandas/" in arquivo_normalizado:
+            merge_ms = max(merge_ms, cumtime * 1000)
+        funcoes.append((tottime, f"{Path(arquivo).name}:{nome}"))
+
+    partes = [f"total_ms={total_ms:.1f}"]
+    partes += [f"{categoria}_ms={ms:.1f}" for categoria, ms in por_categoria.items() if ms >= 0.05]
+    partes.append(f"pandas_merge_ms={merge_ms:.1f}")
+    funcoes.sort(reverse=True)
+    partes.append("top=" + ",".join(nome for _tempo, nome in funcoes[:top]))
+    return "; ".join(partes)
+
+
+def _nome_arquivo(request: Request) -> str:
+    rota = re.sub(r"[^A-Za-z0-9]+", "_", request.url.path).strip("_") or "raiz"
+    return f"{datetime.now():%Y%m%d_%H%M%S_%f}_{request.method}_{rota}.prof"
+
+
+async def perfilar_requisicao(request: Request, call_next):
+    """
+    Middleware: perfila a requisição quando o cabeçalho configurado em
+    PROFILING_HEADER vier ativo. O resumo volta em X-Profile-Summary e o
+    perfil completo é gravado em PROFILING_DIR (caminho em X-Profile-File).
+    Só o trabalho feito nos pools (endpoints, executores e a serialização
+    da resposta) é medido; uma requisição perfilada por vez, as concorrentes seguem sem perfil.
+    """
+    if request.headers.get(settings.PROFILING_HEADER, "").lower() not in VALORES_ATIVOS:
+        return await call_next(request)
+    if not _lock_requisicao.acquire(blocking=False):
+        logger.info(f"Profiling ignorado em {request.method} {request.url.path}: outra requisição já está sendo perfilada")
+        return await call_next(request)
+
+    try:
+        sessao = SessaoProfiling()
+        token = _sessao_atual.set(sessao)
+        try:
+            response = await call_next(request)
+        finally:
+            _sessao_atual.reset(token)
+            await sessao.encerrar()
+    finally:
+        _lock_requisicao.release()
+
+    total_ms = (time.perf_counter() - sessao.inicio) * 1000
+    stats = sessao.estatisticas()
+    if stats is None:
+        return response
+
+    try:
+        diretorio = Path(settings.PROFILING_DIR)
+        diretorio.mkdir(parents=True, exist_ok=True)
+        arquivo = diretorio / _nome_arquivo(request)
+        stats.dump_stats(arquivo)
+        response.headers["X-Profile-File"] = str(arquivo)
+    except OSError as e:
+        logger.error(f"ERRO ao gravar perfil da requisição: {e}")
+
+    resumo = resumir(stats, total_ms)
+    response.headers["X-Profile-Summary"] = resumo
+    logger.info(f"Profiling {request.method} {request.url.path}: {resumo}")
+    return response
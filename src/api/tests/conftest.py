@@ -0,0 +1,25 @@
+"""
+Fixtures compartilhadas pelos testes da API
+"""
+
+import shutil
+
+import pytest
+
+from src.config import DATA_DIR_COMPLETO_NORMALIZADO, DATA_DIR_NATUREZA, DATA_DIR_RA
+from src.models import model_loader
+from src.models.storage import CsvBackend
+
+
+@pytest.fixture
+def backend_temporario(tmp_path, monkeypatch):
+    """
+    Copia a tabela de fatos para tmp_path e a usa como backend CSV, com o
+    dataset ainda não carregado: escritas do teste não tocam em src/data.
+    """
+    fatos = tmp_path / "fatos.csv"
+    shutil.copy(DATA_DIR_COMPLETO_NORMALIZADO, fatos)
+    backend = CsvBackend(fatos=fatos, naturezas=DATA_DIR_NATUREZA, regioes=DATA_DIR_RA)
+    monkeypatch.setattr(model_loader, "_backend", backend)
+    monkeypatch.setattr(model_loader, "_dataset_atual", None)
+    return backend
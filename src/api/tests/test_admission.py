@@ -0,0 +1,113 @@
+"""
+Testes Automatizados - Controle de admissão (vagas e filas por rota)
+Estrutura AAA: Arrange, Act, Assert
+"""
+
+import asyncio
+
+import httpx
+from fastapi import FastAPI
+
+from src.api.admission import Baia, ControleAdmissao, baias_padrao
+
+
+def test_baia_fila_limitada():
+    """
+    Testa que, com a vaga ocupada, um pedido aguarda na fila, o seguinte é
+    recusado na hora, e a vaga liberada passa para quem estava na fila.
+    """
+    async def cenario():
+        baia = Baia("teste", limite=1, fila=1)
+        assert await baia.entrar()
+        espera = asyncio.create_task(baia.entrar(timeout=1))
+        await asyncio.sleep(0)
+        recusado = await baia.entrar(timeout=1)
+        baia.sair()
+        admitido = await espera
+        return baia, recusado, admitido
+
+    baia, recusado, admitido = asyncio.run(cenario())
+
+    assert recusado is False
+    assert admitido is True
+    assert baia.ativos == 1
+    assert baia.aguardando == 0
+    assert baia.rejeitadas == 1
+
+
+def test_baia_timeout_na_fila():
+    """
+    Testa que quem espera além do timeout é recusado e sai da fila.
+    """
+    async def cenario():
+        baia = Baia("teste", limite=1, fila=4)
+        await baia.entrar()
+        resultado = await baia.entrar(timeout=0.01)
+        return baia, resultado
+
+    baia, resultado = asyncio.run(cenario())
+
+    assert resultado is False
+    assert baia.aguardando == 0
+    assert baia.ativos == 1
+
+
+def test_sobrecarga_nao_afeta_rota_reservada():
+    """
+    Testa que, com a baia de consulta lotada, novas consultas recebem 503 com
+    Retry-After enquanto a rota reservada continua respondendo.
+    """
+    liberar = asyncio.Event()
+    app = FastAPI()
+
+    @app.get("/lenta")
+    async def lenta():
+        await liberar.wait()
+        return {"ok": True}
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    baias = {"reservada": Baia("reservada", 1, 1), "consulta": Baia("consulta", 1, 0)}
+    app.add_middleware(ControleAdmissao, baias=baias, regras=(("GET", "/health", "reservada"),),
+                       timeout=1, retry_after=3)
+
+    async def cenario():
+        transporte = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transporte, base_url="http://teste") as client:
+            ocupando = asyncio.create_task(client.get("/lenta"))
+            while baias["consulta"].ativos == 0:
+                await asyncio.sleep(0)
+            recusada = await client.get("/lenta")
+            saude = await client.get("/health")
+            liberar.set()
+            return await ocupando, recusada, saude
+
+    ocupando, recusada, saude = asyncio.run(cenario())
+
+    assert recusada.status_code == 503
+    assert recusada.headers["retry-after"] == "3"
+    assert saude.status_code == 200
+    assert ocupando.status_code == 200
+    assert baias["consulta"].ativos == 0
+
+
+def test_agregacoes_tem_baia_propria():
+    """
+    Testa que agregações e o catálogo caem na baia "agregacao", separadas das
+    consultas baratas (que seguem na baia "consulta").
+    """
+    # ARRANGE
+    controle = ControleAdmissao(app=None, baias=baias_padrao())
+    pesadas = ["/ocorrencias_rollup", "/ocorrencias_previsao", "/ocorrencias_matriz",
+               "/ocorrencias_comovimento", "/datasets/historico/ocorrencias_media"]
+    baratas = ["/ocorrencias_nomes", "/ocorrencias_distribuicao", "/datasets"]
+
+    # ACT
+    baias_pesadas = {controle.classificar("GET", caminho).nome for caminho in pesadas}
+    baias_baratas = {controle.classificar("GET", caminho).nome for caminho in baratas}
+
+    # ASSERT
+    assert baias_pesadas == {"agregacao"}
+    assert baias_baratas == {"consulta"}
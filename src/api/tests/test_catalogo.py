@@ -0,0 +1,144 @@
+"""
+Testes Automatizados - Catálogo de datasets com partições sob demanda (LRU)
+Estrutura AAA: Arrange, Act, Assert
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from src.config import DATA_DIR_COMPLETO_NORMALIZADO, DATA_DIR_NATUREZA, DATA_DIR_RA
+from src.models import model_loader
+from src.models.catalogo import CatalogoDatasets, particionar_dataset, tamanho_particao
+from src.schemas.schemas import (DatasetOcorrenciasMediaResponse, DatasetOcorrenciasNomesResponse,
+                                 Ocorrencias_Nomes_Response, OcorrenciasMediaResponse)
+from ..main import app
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def catalogo_temporario(tmp_path, monkeypatch):
+    # Um dataset "arquivo" com os mesmos dados do principal, um arquivo por ano
+    particionar_dataset(DATA_DIR_COMPLETO_NORMALIZADO, DATA_DIR_NATUREZA, DATA_DIR_RA, tmp_path / "arquivo")
+    catalogo = CatalogoDatasets(tmp_path, limite_bytes=1024 ** 3)
+    monkeypatch.setattr(model_loader, "_catalogo", catalogo)
+    return catalogo
+
+
+def test_consulta_carrega_so_a_particao_do_ano(catalogo_temporario):
+    """
+    Testa que /datasets/{nome}/ocorrencias_nomes lê apenas o ano pedido e
+    responde o mesmo que o dataset principal.
+    """
+    # ARRANGE
+    params = {"id_ra": 1, "ano": 2023, "mes": 5}
+
+    # ACT
+    response = client.get("/datasets/arquivo/ocorrencias_nomes", params=params)
+
+    # ASSERT
+    assert response.status_code == 200
+    assert response.json() == client.get("/ocorrencias_nomes", params=params).json()
+    assert catalogo_temporario.carregadas("arquivo") == [2023]
+
+
+def test_lru_descarta_a_particao_menos_usada(catalogo_temporario):
+    """
+    Testa que, acima do limite de memória, a partição usada há mais tempo é
+    descartada e recarregada quando volta a ser pedida.
+    """
+    # ARRANGE: limite para pouco mais de uma partição
+    catalogo_temporario.limite_bytes = int(tamanho_particao(catalogo_temporario.particao("arquivo", 2021)) * 1.5)
+
+    # ACT
+    catalogo_temporario.particao("arquivo", 2022)
+    carregadas = catalogo_temporario.carregadas("arquivo")
+    catalogo_temporario.particao("arquivo", 2021)
+
+    # ASSERT
+    assert carregadas == [2022]
+    assert catalogo_temporario.carregadas("arquivo") == [2021]
+    assert catalogo_temporario.descartes == 2
+    assert catalogo_temporario.bytes_em_uso <= catalogo_temporario.limite_bytes
+
+
+def test_media_no_catalogo_confere_com_o_principal(catalogo_temporario):
+    """
+    Testa que a média histórica (todos os anos) de um dataset do catálogo bate
+    com a do dataset principal e que /datasets lista os dois.
+    """
+    # ARRANGE
+    params = {"id_ra": 1, "ano": 2024, "mes": 3, "cod_natureza": 3}
+
+    # ACT
+    response = client.get("/datasets/arquivo/ocorrencias_media", params=params)
+    datasets = {d["Nome"]: d for d in client.get("/datasets").json()}
+
+    # ASSERT
+    assert response.status_code == 200
+    assert response.json() == client.get("/ocorrencias_media", params=params).json()
+    assert datasets["df"]["Padrao"] is True
+    assert datasets["arquivo"]["Anos"] == [2020, 2021, 2022, 2023, 2024]
+    assert datasets["arquivo"]["Anos_Em_Memoria"] == [2020, 2021, 2022, 2023, 2024]
+
+
+def test_dataset_inexistente_e_arquivo_alterado(catalogo_temporario, tmp_path):
+    """
+    Testa 404 para dataset desconhecido e a recarga de uma partição cujo
+    arquivo mudou.
+    """
+    # ARRANGE
+    antes = catalogo_temporario.particao("arquivo", 2020)
+    with open(tmp_path / "arquivo" / "fatos_2020.csv", "a", encoding="utf-8") as arquivo:
+        arquivo.write("1;2020;1;1;999\n")
+
+    # ACT
+    depois = catalogo_temporario.particao("arquivo", 2020)
+    response = client.get("/datasets/nao_existe/ocorrencias_nomes", params={"id_ra": 1, "ano": 2020, "mes": 1})
+
+    # ASSERT
+    # A linha acrescentada repete uma chave existente: vale a última
+    linha = depois.denormalizado.query("id_ra == 1 and mes == 1 and cod_natureza == 1")
+    assert depois is not antes
+    assert len(depois.denormalizado) == len(antes.denormalizado)
+    assert linha["quantidade"].tolist() == [999]
+    assert response.status_code == 404
+
+
+def test_dataset_historico_anterior_a_2000(tmp_path, monkeypatch):
+    """
+    Testa que um arquivo histórico (anos antes de 2000) é consultado normalmente.
+    """
+    # ARRANGE
+    fatos = tmp_path / "historico.csv"
+    fatos.write_text("ID_RA;ANO;COD_NATUREZA;MES;QUANTIDADE\n1;1995;3;5;4\n1;1996;3;5;8\n", encoding="utf-8")
+    particionar_dataset(fatos, DATA_DIR_NATUREZA, DATA_DIR_RA, tmp_path / "datasets" / "df_1990")
+    monkeypatch.setattr(model_loader, "_catalogo", CatalogoDatasets(tmp_path / "datasets", limite_bytes=1024 ** 2))
+
+    # ACT
+    nomes = client.get("/datasets/df_1990/ocorrencias_nomes", params={"id_ra": 1, "ano": 1995, "mes": 5})
+    media = client.get("/datasets/df_1990/ocorrencias_media", params={"id_ra": 1, "ano": 1996, "mes": 5, "cod_natureza": 3})
+
+    # ASSERT
+    assert nomes.status_code == 200
+    assert nomes.json()[0]["QUANTIDADE"] == 4
+    assert media.json()["Media_Historica_Mes"] == 6
+
+
+@pytest.mark.parametrize("principal, catalogo", [
+    (Ocorrencias_Nomes_Response, DatasetOcorrenciasNomesResponse),
+    (OcorrenciasMediaResponse, DatasetOcorrenciasMediaResponse),
+])
+def test_limite_de_ano_do_catalogo_nao_vale_para_o_dataset_principal(principal, catalogo):
+    """
+    Testa que só as respostas do catálogo aceitam anos antes de 2000; as do
+    dataset principal mantêm ANO >= 2000.
+    """
+    # ARRANGE
+    exemplo = dict(principal.model_config["json_schema_extra"]["example"], ANO=1995)
+
+    # ACT / ASSERT
+    assert catalogo(**exemplo).ANO == 1995
+    with pytest.raises(ValidationError):
+        principal(**exemplo)
@@ -0,0 +1,100 @@
+"""
+Testes Automatizados - Correlação/covariância entre séries mensais (comovimento)
+Estrutura AAA: Arrange, Act, Assert
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from src.models import model_loader
+from ..main import app
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def backend_temporario(backend_temporario, monkeypatch):
+    monkeypatch.setattr(model_loader, "_ouvintes_publicacao", [])
+    return backend_temporario
+
+
+def _matriz(dados):
+    n = len(dados["Rotulos"])
+    return np.array([np.nan if v is None else v for v in dados["Valores"]]).reshape(n, n)
+
+
+def test_correlacao_igual_a_calculada_das_series():
+    """
+    Testa que a matriz entre as naturezas de uma RA é a mesma calculada
+    diretamente das séries mensais do DataFrame desnormalizado.
+    """
+    # ARRANGE
+    df = model_loader.load_denormalized_data()
+    df = df[(df["id_ra"] == 14) & df["ano"].between(2021, 2024)]
+    series = df.pivot_table(index=["ano", "mes"], columns="cod_natureza", values="quantidade", aggfunc="last")
+    esperada = series.corr(min_periods=3)
+
+    # ACT
+    response = client.get("/ocorrencias_comovimento", params={"id_ra": 14, "ano_inicio": 2021, "ano_fim": 2024})
+
+    # ASSERT
+    assert response.status_code == 200
+    dados = response.json()
+    matriz = _matriz(dados)
+    assert dados["Series"] == "cod_natureza" and dados["Filtro"] == {"id_ra": 14}
+    assert dados["Rotulos"] == esperada.columns.tolist()
+    assert dados["Meses"] == len(series)
+    np.testing.assert_allclose(matriz, esperada.to_numpy(), atol=1e-6)
+    np.testing.assert_allclose(matriz, matriz.T, atol=1e-6)
+
+
+def test_covariancia_entre_ras_de_uma_natureza():
+    """
+    Testa a covariância entre as RAs de uma natureza: diagonal = variância
+    amostral da série de cada RA.
+    """
+    # ARRANGE
+    df = model_loader.load_denormalized_data()
+    serie_ra_1 = df[(df["cod_natureza"] == 8) & (df["id_ra"] == 1)].sort_values(["ano", "mes"])["quantidade"]
+
+    # ACT
+    dados = client.get("/ocorrencias_comovimento", params={"cod_natureza": 8, "metodo": "covariancia"}).json()
+
+    # ASSERT
+    matriz = _matriz(dados)
+    assert dados["Series"] == "id_ra" and dados["Rotulos"][0] == 1
+    assert matriz[0, 0] == pytest.approx(serie_ra_1.var(), abs=1e-6)
+
+
+def test_parametros_invalidos_e_periodo_sem_dados():
+    """
+    Testa o 400 sem filtro, com os dois filtros e com intervalo invertido, e o
+    404 para um período sem dados.
+    """
+    assert client.get("/ocorrencias_comovimento").status_code == 400
+    assert client.get("/ocorrencias_comovimento", params={"id_ra": 1, "cod_natureza": 8}).status_code == 400
+    assert client.get("/ocorrencias_comovimento", params={"id_ra": 1, "ano_inicio": 2024, "ano_fim": 2021}).status_code == 400
+    assert client.get("/ocorrencias_comovimento", params={"id_ra": 1, "ano_inicio": 2010, "ano_fim": 2012}).status_code == 404
+
+
+def test_matriz_guardada_por_versao_do_dataset(backend_temporario):
+    """
+    Testa que a mesma consulta na mesma versão reaproveita a matriz e que uma
+    escrita (nova versão) a recalcula com o dado novo.
+    """
+    # ARRANGE
+    antes = model_loader.obter_dataset()
+    primeira = antes.comovimento.matriz("cod_natureza", 14)
+    novo = pd.DataFrame([{"ID_RA": 14, "ANO": 2024, "COD_NATUREZA": 8, "MES": 1, "QUANTIDADE": 5000}])
+
+    # ACT
+    repetida = antes.comovimento.matriz("cod_natureza", 14)
+    model_loader.save_new_record(novo)
+    depois = model_loader.obter_dataset().comovimento.matriz("cod_natureza", 14)
+
+    # ASSERT
+    assert repetida is primeira
+    assert depois is not primeira
+    assert not np.allclose(np.nan_to_num(depois.valores), np.nan_to_num(primeira.valores))
@@ -0,0 +1,197 @@
+"""
+Testes Automatizados - Compressão negociada com cache por versão do dataset
+Estrutura AAA: Arrange, Act, Assert
+"""
+
+import sys
+
+import pandas as pd
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from src.api.compressao import (CacheComprimido, CompressaoVersionada, RespostaComprimida,
+                                codificadores_disponiveis, negociar)
+from src.config import settings
+from src.models import model_loader
+from ..main import app, cache_compressao
+
+client = TestClient(app)
+
+FILTRO = {"id_ra": 14, "ano": 2024, "mes": 1}
+
+
+@pytest.fixture
+def backend_temporario(backend_temporario, monkeypatch):
+    monkeypatch.setattr(model_loader, "_ouvintes_publicacao", [])
+    cache_compressao.limpar()
+    return backend_temporario
+
+
+def test_negociacao_respeita_q_e_preferencia():
+    """
+    Testa a escolha da codificação: maior q do cliente, preferência do
+    servidor no empate, curinga e codificações indisponíveis ignoradas.
+    """
+    # ARRANGE
+    todas = ["gzip", "br", "zstd"]
+
+    # ACT / ASSERT
+    assert negociar("gzip, deflate, br", todas) == "br"
+    assert negociar("gzip;q=1.0, br;q=0.5", todas) == "gzip"
+    assert negociar("br, zstd", ["gzip"]) is None
+    assert negociar("*", ["gzip"]) == "gzip"
+    assert negociar("gzip;q=0, identity", todas) is None
+    assert negociar("", todas) is None
+
+
+def test_resposta_comprimida_vem_do_cache_na_mesma_versao(backend_temporario):
+    """
+    Testa que a segunda requisição igual (parâmetros em outra ordem) sai do
+    cache, com os mesmos bytes da resposta sem compressão.
+    """
+    # ARRANGE
+    model_loader.obter_dataset()
+    sem_compressao = client.get("/ocorrencias_nomes", params=FILTRO, headers={"Accept-Encoding": "identity"})
+
+    # ACT
+    primeira = client.get("/ocorrencias_nomes", params=FILTRO, headers={"Accept-Encoding": "gzip"})
+    acertos = cache_compressao.acertos
+    segunda = client.get("/ocorrencias_nomes", params=dict(reversed(list(FILTRO.items()))),
+                         headers={"Accept-Encoding": "gzip"})
+
+    # ASSERT
+    assert "content-encoding" not in sem_compressao.headers
+    assert primeira.headers["content-encoding"] == "gzip"
+    assert primeira.headers["vary"] == "Accept-Encoding"
+    assert primeira.content == segunda.content == sem_compressao.content
+    assert cache_compressao.acertos == acertos + 1
+
+
+@pytest.mark.parametrize("codificacao, pacote", [("br", "brotli"), ("zstd", "zstandard")])
+def test_codificacoes_opcionais_devolvem_o_mesmo_conteudo(backend_temporario, codificacao, pacote):
+    """
+    Testa br e zstd (pacotes opcionais de requirements-opcional.txt): a resposta
+    descomprimida é igual à sem compressão. Sem o pacote, o teste é pulado.
+    """
+    # ARRANGE
+    modulo = pytest.importorskip(pacote, reason=f"pacote opcional '{pacote}' não instalado")
+    descomprimir = modulo.decompress if pacote == "brotli" else modulo.ZstdDecompressor().decompressobj().decompress
+    model_loader.obter_dataset()
+    sem_compressao = client.get("/ocorrencias_nomes", params=FILTRO, headers={"Accept-Encoding": "identity"})
+
+    # ACT
+    # Corpo lido cru: o httpx descomprime sozinho quando o pacote está instalado
+    with client.stream("GET", "/ocorrencias_nomes", params=FILTRO, headers={"Accept-Encoding": codificacao}) as response:
+        corpo = b"".join(response.iter_raw())
+
+    # ASSERT
+    assert response.headers["content-encoding"] == codificacao
+    assert descomprimir(corpo) == sem_compressao.content
+
+
+def test_sem_pacotes_opcionais_so_gzip_e_oferecido(monkeypatch):
+    """
+    Testa que, sem brotli e zstandard, só gzip é oferecido (a API não falha).
+    """
+    # ARRANGE
+    monkeypatch.setitem(sys.modules, "brotli", None)
+    monkeypatch.setitem(sys.modules, "zstandard", None)
+
+    # ACT
+    codificadores = codificadores_disponiveis()
+
+    # ASSERT
+    assert sorted(codificadores) == ["gzip"]
+    assert negociar("br, zstd", sorted(codificadores)) is None
+
+
+def test_nova_versao_do_dataset_gera_nova_entrada(backend_temporario):
+    """
+    Testa que, depois de uma escrita, a mesma URL é comprimida de novo a
+    partir da nova versão (e enxerga a linha nova).
+    """
+    # ARRANGE
+    model_loader.obter_dataset()
+    client.get("/ocorrencias_nomes", params=FILTRO, headers={"Accept-Encoding": "gzip"})
+    entradas = len(cache_compressao)
+    novo = pd.DataFrame([{"ID_RA": 14, "ANO": 2024, "COD_NATUREZA": 7, "MES": 1, "QUANTIDADE": 987}])
+
+    # ACT
+    model_loader.save_new_record(novo)
+    response = client.get("/ocorrencias_nomes", params=FILTRO, headers={"Accept-Encoding": "gzip"})
+
+    # ASSERT
+    assert response.headers["content-encoding"] == "gzip"
+    assert len(cache_compressao) == entradas + 1
+    assert any(r["QUANTIDADE"] == 987 for r in response.json())
+
+
+def test_lru_descarta_as_menos_usadas():
+    """
+    Testa que, acima do limite de bytes, sai a entrada usada há mais tempo.
+    """
+    # ARRANGE
+    cache = CacheComprimido(limite_bytes=25)
+    entrada = RespostaComprimida(status=200, cabecalhos=(), corpo=b"x" * 10, codificacao="gzip")
+    chave = lambda n: ("/ocorrencias_nomes", (("id_ra", str(n)),), 1, "gzip")
+    cache.guardar(chave(1), entrada)
+    cache.guardar(chave(2), entrada)
+    cache.obter(chave(1))
+
+    # ACT
+    cache.guardar(chave(3), entrada)
+
+    # ASSERT
+    assert cache.obter(chave(2)) is None
+    assert cache.obter(chave(1)) is entrada and cache.obter(chave(3)) is entrada
+    assert cache.descartes == 1 and cache.bytes_em_uso == 20
+
+
+def test_cabecalhos_da_requisicao_nao_vao_para_o_cache(backend_temporario):
+    """
+    Testa que cabeçalhos próprios de uma requisição (ex.: X-Profile-Summary)
+    voltam só para ela: a entrada do cache guarda apenas os do conteúdo.
+    """
+    # ARRANGE
+    interna = FastAPI()
+
+    @interna.get("/ocorrencias_nomes")
+    def nomes():
+        return JSONResponse([{"valor": i} for i in range(200)], headers={"X-Profile-Summary": "total_ms=1.0"})
+
+    cache = CacheComprimido(limite_bytes=1024 * 1024)
+    cliente = TestClient(CompressaoVersionada(interna, cache=cache))
+    model_loader.obter_dataset()
+
+    # ACT
+    primeira = cliente.get("/ocorrencias_nomes", headers={"Accept-Encoding": "gzip"})
+    segunda = cliente.get("/ocorrencias_nomes", headers={"Accept-Encoding": "gzip"})
+
+    # ASSERT
+    assert primeira.headers["x-profile-summary"] == "total_ms=1.0"
+    assert segunda.headers["content-encoding"] == "gzip"
+    assert "x-profile-summary" not in segunda.headers
+    assert cache.acertos == 1
+
+
+def test_requisicao_perfilada_nao_usa_o_cache(backend_temporario, monkeypatch):
+    """
+    Testa que uma requisição com o cabeçalho de profiling executa o endpoint
+    (nada é lido nem gravado no cache).
+    """
+    # ARRANGE
+    monkeypatch.setattr(settings, "PROFILING_ENABLED", True)
+    model_loader.obter_dataset()
+    client.get("/ocorrencias_nomes", params=FILTRO, headers={"Accept-Encoding": "gzip"})
+    entradas, acertos = len(cache_compressao), cache_compressao.acertos
+
+    # ACT
+    response = client.get("/ocorrencias_nomes", params=FILTRO,
+                          headers={"Accept-Encoding": "gzip", settings.PROFILING_HEADER: "1"})
+
+    # ASSERT
+    assert response.status_code == 200
+    assert "content-encoding" not in response.headers
+    assert len(cache_compressao) == entradas and cache_compressao.acertos == acertos
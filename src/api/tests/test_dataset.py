@@ -0,0 +1,192 @@
+"""
+Testes Automatizados - Versões do dataset e recarga dos CSVs
+Estrutura AAA: Arrange, Act, Assert
+"""
+
+import os
+import shutil
+import threading
+
+import pandas as pd
+import pytest
+
+from src.config import DATA_DIR_COMPLETO_NORMALIZADO, DATA_DIR_NATUREZA, DATA_DIR_RA
+from src.models import model_loader
+from src.models.data_watcher import DataWatcher
+from src.models.storage import CsvBackend
+
+
+@pytest.fixture
+def dados_temporarios(tmp_path, monkeypatch):
+    """
+    Copia os CSVs para um diretório temporário e aponta o model_loader para eles,
+    com um dataset ainda não carregado.
+    """
+    fatos = tmp_path / "fatos.csv"
+    natureza = tmp_path / "natureza.csv"
+    ra = tmp_path / "ra.csv"
+    shutil.copy(DATA_DIR_COMPLETO_NORMALIZADO, fatos)
+    shutil.copy(DATA_DIR_NATUREZA, natureza)
+    shutil.copy(DATA_DIR_RA, ra)
+
+    monkeypatch.setattr(model_loader, "_backend", CsvBackend(fatos=fatos, naturezas=natureza, regioes=ra))
+    monkeypatch.setattr(model_loader, "_dataset_atual", None)
+    return fatos
+
+
+def _acrescentar_linha(path, linha):
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(linha + "\n")
+    # Garante mtime diferente mesmo em sistemas de arquivos com baixa resolução
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_watcher_recarrega_apos_mudanca_estavel(dados_temporarios):
+    """
+    Testa que o monitor publica uma nova versão quando o arquivo muda
+    e que a versão antiga continua intacta para quem já a estava usando.
+    """
+    # ARRANGE
+    antigo = model_loader.obter_dataset()
+    linhas_antigas = antigo.consolidado.shape[0]
+    watcher = DataWatcher(intervalo=0.01)
+    _acrescentar_linha(dados_temporarios, "1;2030;7;1;99")
+
+    # ACT: a primeira verificação só registra a mudança; a segunda confirma e recarrega
+    primeira = watcher.verificar()
+    segunda = watcher.verificar()
+
+    # ASSERT
+    novo = model_loader.obter_dataset()
+    assert primeira is False
+    assert segunda is True
+    assert novo.versao == antigo.versao + 1
+    assert novo.consolidado.shape[0] == linhas_antigas + 1
+    assert not novo.ocorrencias_ra_ano_mes(id_ra=1, ano=2030, mes=1).empty
+    assert antigo.consolidado.shape[0] == linhas_antigas
+
+
+def test_watcher_ignora_arquivos_sem_mudanca(dados_temporarios):
+    """
+    Testa que nenhuma recarga acontece se os arquivos não mudaram.
+    """
+    antigo = model_loader.obter_dataset()
+    watcher = DataWatcher(intervalo=0.01)
+
+    assert watcher.verificar() is False
+    assert watcher.verificar() is False
+    assert model_loader.obter_dataset() is antigo
+
+
+def test_recarga_vazia_mantem_versao_atual(dados_temporarios):
+    """
+    Testa que um arquivo corrompido/truncado não substitui a versão em uso.
+    """
+    antigo = model_loader.obter_dataset()
+    dados_temporarios.write_text("", encoding="utf-8")
+
+    resultado = model_loader.recarregar_dataset()
+
+    assert resultado is antigo
+    assert model_loader.obter_dataset() is antigo
+
+
+def _novo_registro(id_ra=1, ano=2024, cod_natureza=7, mes=6, quantidade=50):
+    # Mesmas colunas (e ordem) geradas por cadatrar_ocorrencias
+    return pd.DataFrame([{
+        "MES": mes, "ANO": ano, "COD_NATUREZA": cod_natureza,
+        "ID_RA": id_ra, "QUANTIDADE": quantidade,
+    }])
+
+
+def test_escrita_copia_apenas_particao_do_ano(dados_temporarios):
+    """
+    Testa o copy-on-write: a escrita cria uma nova versão em que só a
+    partição do ano afetado é nova; as demais são as mesmas da versão anterior.
+    """
+    antigo = model_loader.obter_dataset()
+
+    model_loader.save_new_record(_novo_registro(ano=2024))
+
+    novo = model_loader.obter_dataset()
+    assert novo.versao == antigo.versao + 1
+    assert novo.particoes[2024] is not antigo.particoes[2024]
+    assert all(novo.particoes[ano] is antigo.particoes[ano] for ano in antigo.anos if ano != 2024)
+    # A versão antiga não enxerga a linha nova; a nova enxerga, no lugar da
+    # linha anterior da mesma chave (vale a última)
+    historico_antigo = antigo.historico_ra_mes_natureza(id_ra=1, mes=6, cod_natureza=7)
+    historico_novo = novo.historico_ra_mes_natureza(id_ra=1, mes=6, cod_natureza=7)
+    assert len(historico_novo) == len(historico_antigo)
+    assert historico_antigo.loc[historico_antigo["ano"] == 2024, "quantidade"].tolist() == [0]
+    assert historico_novo.loc[historico_novo["ano"] == 2024, "quantidade"].tolist() == [50]
+    assert historico_novo.iloc[-1]["natureza"] == "HOMICÍDIO"
+
+
+def test_escrita_respeita_ordem_das_colunas_do_arquivo(dados_temporarios):
+    """
+    Testa que a linha gravada segue o cabeçalho do CSV (ID_RA;ANO;COD_NATUREZA;MES;QUANTIDADE)
+    e que uma recarga completa produz o mesmo resultado da versão publicada pela escrita.
+    """
+    model_loader.obter_dataset()
+
+    model_loader.save_new_record(_novo_registro(id_ra=2, ano=2024, cod_natureza=7, mes=6, quantidade=50))
+
+    ultima_linha = dados_temporarios.read_text(encoding="utf-8").splitlines()[-1]
+    assert ultima_linha == "2;2024;7;6;50"
+    publicado = model_loader.obter_dataset()
+    recarregado = model_loader.recarregar_dataset()
+    # Mesmas linhas; a recarga guarda a linha corrigida na posição da última ocorrência
+    ordenar = lambda df: df.sort_values(["id_ra", "ano", "mes", "cod_natureza"]).reset_index(drop=True)
+    pd.testing.assert_frame_equal(ordenar(publicado.consolidado), ordenar(recarregado.consolidado))
+
+
+def test_requisicao_fixa_uma_unica_versao(dados_temporarios):
+    """
+    Testa que, dentro de fixar_dataset(), uma escrita concorrente não muda
+    a versão lida pela requisição.
+    """
+    with model_loader.fixar_dataset():
+        fixado = model_loader.obter_dataset()
+        model_loader.save_new_record(_novo_registro())
+        assert model_loader.obter_dataset() is fixado
+        assert model_loader.load_denormalized_data() is fixado.denormalizado
+
+    assert model_loader.obter_dataset().versao == fixado.versao + 1
+
+
+def test_escrita_nao_espera_recarga_e_entra_na_versao_recarregada(dados_temporarios, monkeypatch):
+    """
+    Testa que um POST feito enquanto uma recarga monta a nova versão é
+    publicado na hora, sem esperar a montagem, e que a versão recarregada
+    contém a linha gravada exatamente uma vez.
+    """
+    # ARRANGE: a recarga fica parada depois de ler os arquivos, antes do JOIN
+    antigo = model_loader.obter_dataset()
+    montando, liberar = threading.Event(), threading.Event()
+    montar_original = model_loader._montar_denormalizado
+
+    def montar_devagar(*args):
+        montando.set()
+        liberar.wait(5)
+        return montar_original(*args)
+
+    monkeypatch.setattr(model_loader, "_montar_denormalizado", montar_devagar)
+    monkeypatch.setattr(model_loader, "_ouvintes_publicacao", [])
+    recarga = threading.Thread(target=model_loader.recarregar_dataset)
+    recarga.start()
+    assert montando.wait(5)
+
+    # ACT
+    model_loader.save_new_record(_novo_registro(id_ra=1, ano=2030, cod_natureza=7, mes=1, quantidade=99))
+    durante = model_loader.obter_dataset()
+    liberar.set()
+    recarga.join(5)
+
+    # ASSERT
+    recarregado = model_loader.obter_dataset()
+    assert durante.versao == antigo.versao + 1
+    assert len(durante.ocorrencias_ra_ano_mes(id_ra=1, ano=2030, mes=1)) == 1
+    assert recarregado.versao == durante.versao + 1
+    assert len(recarregado.ocorrencias_ra_ano_mes(id_ra=1, ano=2030, mes=1)) == 1
+    assert recarregado.consolidado.shape[0] == durante.consolidado.shape[0]
@@ -0,0 +1,99 @@
+"""
+Testes Automatizados - Distribuição histórica (mediana, extremos, percentil)
+Estrutura AAA: Arrange, Act, Assert
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from src.models import model_loader
+from src.models.cubo import mediana, montar_cubo, montar_distribuicao, percentil
+from ..main import app
+
+client = TestClient(app)
+
+
+def test_distribuicao_confere_com_pandas():
+    """
+    Testa que as estatísticas do endpoint batem com o cálculo direto sobre
+    o histórico da combinação (RA, Mês, Natureza).
+    """
+    # ARRANGE
+    historico = model_loader.obter_dataset().historico_ra_mes_natureza(id_ra=1, mes=3, cod_natureza=3)
+    valores = historico['quantidade']
+
+    # ACT
+    response = client.get("/ocorrencias_distribuicao", params={"id_ra": 1, "ano": 2024, "mes": 3, "cod_natureza": 3})
+
+    # ASSERT
+    assert response.status_code == 200
+    dados = response.json()
+    assert dados["Anos_Historico"] == len(valores)
+    assert dados["Mediana_Historica_Mes"] == pytest.approx(valores.median())
+    assert dados["Minimo_Historico_Mes"] == valores.min()
+    assert dados["Maximo_Historico_Mes"] == valores.max()
+    assert dados["Desvio_Padrao_Mes"] == pytest.approx(valores.std(), abs=0.01)
+    assert 0 <= dados["Percentil_Atual"] <= 100
+
+
+def test_percentil_e_mediana_no_historico_ordenado():
+    """
+    Testa mediana (par e ímpar) e percentil com empates por busca binária.
+    """
+    ordenados = np.array([1.0, 2.0, 2.0, 5.0])
+
+    assert mediana(ordenados) == 2.0
+    assert mediana(ordenados[:3]) == 2.0
+    assert percentil(ordenados, 2.0) == pytest.approx(50.0)   # 1 abaixo + metade de 2 empates
+    assert percentil(ordenados, 9.0) == 100.0
+    assert percentil(ordenados, 0.0) == 0.0
+
+
+def test_anos_sem_dado_ficam_fora_do_historico():
+    """
+    Testa que anos sem linha na tabela de fatos não entram na distribuição.
+    """
+    # ARRANGE: a combinação (RA 1, mês 1, natureza 5) não tem 2022
+    fatos = pd.DataFrame({
+        'id_ra': [1, 1, 2], 'ano': [2021, 2023, 2022], 'mes': [1, 1, 1],
+        'cod_natureza': [5, 5, 5], 'quantidade': [8, 2, 1],
+    })
+
+    # ACT
+    ordenados, media, desvio = montar_distribuicao(montar_cubo(fatos)).historico(1, 1, 5)
+
+    # ASSERT
+    assert ordenados.tolist() == [2.0, 8.0]
+    assert media == 5.0
+    assert desvio == pytest.approx(np.std([2, 8], ddof=1))
+
+
+def test_distribuicao_sem_dado_no_periodo():
+    """
+    Testa o 404 quando não há registro para o ano/mês pedido.
+    """
+    response = client.get("/ocorrencias_distribuicao", params={"id_ra": 1, "ano": 2019, "mes": 3, "cod_natureza": 3})
+
+    assert response.status_code == 404
+
+
+def test_chave_repetida_mesmo_valor_na_media_e_na_distribuicao():
+    """
+    Testa que uma chave natural repetida no CSV (RA 6, 2024, mês 1, natureza 1:
+    linhas com 0 e depois 10) vale a última linha nos dois endpoints, com a
+    mesma quantidade atual e a mesma média histórica.
+    """
+    # ARRANGE
+    params = {"id_ra": 6, "ano": 2024, "mes": 1, "cod_natureza": 1}
+
+    # ACT
+    media = client.get("/ocorrencias_media", params=params).json()
+    distribuicao = client.get("/ocorrencias_distribuicao", params=params).json()
+    nomes = client.get("/ocorrencias_nomes", params={"id_ra": 6, "ano": 2024, "mes": 1}).json()
+
+    # ASSERT
+    assert media["Quantidade_Atual"] == distribuicao["Quantidade_Atual"] == 10
+    assert media["Media_Historica_Mes"] == round(distribuicao["Media_Historica_Mes"], 0)
+    assert [n["QUANTIDADE"] for n in nomes if n["COD_NATUREZA"] == 1] == [10]
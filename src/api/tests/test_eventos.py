@@ -0,0 +1,99 @@
+"""
+Testes Automatizados - Assinatura de eventos (SSE) com fan-out por filtro
+Estrutura AAA: Arrange, Act, Assert
+"""
+
+import asyncio
+import json
+
+import pandas as pd
+
+from src.api.eventos import CentralEventos, EventoPublicacao
+from src.models import model_loader
+
+
+def _evento():
+    registro = lambda id_ra, cod: {"ID_RA": id_ra, "COD_NATUREZA": cod, "QUANTIDADE": 1}
+    return EventoPublicacao(versao=7, grupos={(1, 3): [registro(1, 3)], (2, 5): [registro(2, 5)]})
+
+
+def _dados(mensagem: bytes) -> dict:
+    linha = next(l for l in mensagem.decode().splitlines() if l.startswith("data: "))
+    return json.loads(linha[len("data: "):])
+
+
+def test_fan_out_codifica_cada_filtro_uma_vez():
+    """
+    Testa que assinantes com o mesmo filtro recebem os mesmos bytes e que
+    cada um só recebe os registros do seu filtro.
+    """
+    # ARRANGE
+    async def cenario():
+        central = CentralEventos(max_assinantes=10, tamanho_fila=10)
+        mesmo_a, mesmo_b = central.assinar([1]), central.assinar([1])
+        outro, sem_interesse = central.assinar([], [5]), central.assinar([9])
+
+        # ACT
+        central.distribuir(_evento())
+        return mesmo_a.fila.get_nowait(), mesmo_b.fila.get_nowait(), outro.fila.get_nowait(), sem_interesse.fila.empty()
+
+    a, b, outro, vazio = asyncio.run(cenario())
+
+    # ASSERT
+    assert a is b
+    assert [r["ID_RA"] for r in _dados(a)["ocorrencias"]] == [1]
+    assert [r["COD_NATUREZA"] for r in _dados(outro)["ocorrencias"]] == [5]
+    assert vazio
+
+
+def test_assinante_lento_e_desconectado():
+    """
+    Testa que um assinante com a fila cheia é removido e recebe o aviso de
+    encerramento, sem afetar os demais.
+    """
+    # ARRANGE
+    async def cenario():
+        central = CentralEventos(max_assinantes=10, tamanho_fila=1)
+        lento, ativo = central.assinar(), central.assinar()
+
+        # ACT
+        central.distribuir(_evento())
+        ativo.fila.get_nowait()
+        central.distribuir(_evento())
+        return central, lento.fila.get_nowait(), ativo.fila.qsize()
+
+    central, aviso, pendentes_ativo = asyncio.run(cenario())
+
+    # ASSERT
+    assert aviso is None
+    assert central.total == 1
+    assert central.desconectados_lentos == 1
+    assert pendentes_ativo == 1
+
+
+def test_escrita_publica_registro_e_media_atualizada(backend_temporario, monkeypatch):
+    """
+    Testa o caminho completo: um POST salvo pelo model_loader chega ao
+    assinante do filtro com a média histórica já recalculada.
+    """
+    # ARRANGE
+    central = CentralEventos(max_assinantes=10, tamanho_fila=10)
+    monkeypatch.setattr(model_loader, "_ouvintes_publicacao", [central.publicar])
+    model_loader.obter_dataset()
+    novo = pd.DataFrame([{'ID_RA': 14, 'ANO': 2025, 'COD_NATUREZA': 7, 'MES': 1, 'QUANTIDADE': 40}])
+
+    async def cenario():
+        assinante = central.assinar([14], [7])
+        # ACT
+        await asyncio.to_thread(model_loader.save_new_record, novo)
+        return await asyncio.wait_for(assinante.fila.get(), timeout=5)
+
+    mensagem = asyncio.run(cenario())
+
+    # ASSERT
+    historico = model_loader.obter_dataset().historico_ra_mes_natureza(id_ra=14, mes=1, cod_natureza=7)
+    dados = _dados(mensagem)
+    assert b"event: ocorrencias" in mensagem
+    assert dados["versao"] == model_loader.obter_dataset().versao
+    assert dados["ocorrencias"][0]["QUANTIDADE"] == 40
+    assert dados["ocorrencias"][0]["Media_Historica_Mes"] == round(historico["quantidade"].mean(), 0)
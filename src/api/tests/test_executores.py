@@ -0,0 +1,133 @@
+"""
+Testes Automatizados - Pools dedicados dos endpoints assíncronos
+Estrutura AAA: Arrange, Act, Assert
+"""
+
+import asyncio
+import threading
+from contextvars import ContextVar
+
+from fastapi.testclient import TestClient
+
+from src.api import main
+from src.api.executores import Executores
+
+client = TestClient(main.app)
+
+_marcador: ContextVar[str] = ContextVar("marcador", default="")
+
+
+def test_agregacao_lenta_nao_bloqueia_consultas():
+    """
+    Testa que, com o pool de agregação todo ocupado, uma consulta roda no
+    seu próprio pool e o event loop continua livre.
+    """
+    # ARRANGE
+    pools = Executores({"consulta": 2, "agregacao": 1})
+    liberar = threading.Event()
+
+    async def cenario():
+        lenta = asyncio.ensure_future(pools.executar("agregacao", liberar.wait, 5))
+        await asyncio.sleep(0.05)
+        # ACT
+        consulta = await asyncio.wait_for(pools.executar("consulta", sum, [1, 2, 3]), timeout=1)
+        ainda_rodando = not lenta.done()
+        liberar.set()
+        await lenta
+        return consulta, ainda_rodando
+
+    consulta, ainda_rodando = asyncio.run(cenario())
+    pools.encerrar()
+
+    # ASSERT
+    assert consulta == 6
+    assert ainda_rodando
+
+
+def test_contexto_da_requisicao_vai_para_o_pool():
+    """
+    Testa que a função no pool enxerga as ContextVars da requisição (é assim
+    que a versão fixada do dataset chega à outra thread).
+    """
+    # ARRANGE
+    pools = Executores({"consulta": 1})
+
+    def ler_marcador():
+        return _marcador.get(), threading.current_thread().name
+
+    async def cenario():
+        _marcador.set("requisicao-1")
+        # ACT
+        return await pools.executar("consulta", ler_marcador)
+
+    valor, thread = asyncio.run(cenario())
+    pools.encerrar()
+
+    # ASSERT
+    assert valor == "requisicao-1"
+    assert thread.startswith("exec-consulta")
+
+
+def test_endpoints_rodam_nos_pools_dedicados(monkeypatch):
+    """
+    Testa que uma consulta e uma agregação saem do event loop e rodam cada
+    uma nas threads do seu pool.
+    """
+    # ARRANGE
+    threads = {}
+    media, rollup = main.get_media_historica, main.get_rollup
+
+    def media_registrada(**kwargs):
+        threads["media"] = threading.current_thread().name
+        return media(**kwargs)
+
+    def rollup_registrado(**kwargs):
+        threads["rollup"] = threading.current_thread().name
+        return rollup(**kwargs)
+
+    monkeypatch.setattr(main, "get_media_historica", media_registrada)
+    monkeypatch.setattr(main, "get_rollup", rollup_registrado)
+
+    # ACT
+    resposta_media = client.get("/ocorrencias_media", params={"id_ra": 1, "ano": 2024, "mes": 3, "cod_natureza": 7})
+    client.get("/ocorrencias_rollup", params={"granularidade": "mes"})
+
+    # ASSERT
+    assert resposta_media.status_code == 200
+    assert threads["media"].startswith("exec-consulta")
+    assert threads["rollup"].startswith("exec-agregacao")
+
+
+def test_exportacao_e_distribuicao_no_pool_de_consulta(monkeypatch):
+    """
+    Testa que cada fatia da exportação é gerada nas threads do pool
+    "consulta" (não no threadpool padrão do Starlette) e que a distribuição,
+    uma busca binária, também roda nesse pool.
+    """
+    # ARRANGE
+    threads = {"fatias": []}
+    distribuicao = main.get_distribuicao_historica
+
+    def exportar_registrado(*args, **kwargs):
+        def gerador():
+            for parte in (b"a;b\n", b"1;2\n"):
+                threads["fatias"].append(threading.current_thread().name)
+                yield parte
+        return gerador()
+
+    def distribuicao_registrada(**kwargs):
+        threads["distribuicao"] = threading.current_thread().name
+        return distribuicao(**kwargs)
+
+    monkeypatch.setattr(main, "exportar", exportar_registrado)
+    monkeypatch.setattr(main, "get_distribuicao_historica", distribuicao_registrada)
+
+    # ACT
+    exportacao = client.get("/ocorrencias_export", params={"formato": "csv"})
+    client.get("/ocorrencias_distribuicao", params={"id_ra": 1, "ano": 2024, "mes": 3, "cod_natureza": 7})
+
+    # ASSERT
+    assert exportacao.status_code == 200 and exportacao.content == b"a;b\n1;2\n"
+    assert len(threads["fatias"]) == 2
+    assert all(nome.startswith("exec-consulta") for nome in threads["fatias"])
+    assert threads["distribuicao"].startswith("exec-consulta")
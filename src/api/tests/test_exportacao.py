@@ -0,0 +1,103 @@
+"""
+Testes Automatizados - Exportação em lote (CSV, Parquet, Arrow)
+Estrutura AAA: Arrange, Act, Assert
+"""
+
+import io
+import sys
+
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from src.models import model_loader
+from src.services.exportacao_service import FiltrosExportacao, exportar
+from ..main import app
+
+client = TestClient(app)
+
+
+def test_exportacao_csv_com_filtros_e_colunas():
+    """
+    Testa que o CSV exportado traz só as colunas pedidas e as mesmas linhas
+    do recorte (ano, RA) no dataset em memória.
+    """
+    # ARRANGE
+    dataset = model_loader.obter_dataset()
+    esperado = dataset.particoes[2023].denormalizado
+    esperado = esperado[esperado['id_ra'] == 5]
+
+    # ACT
+    response = client.get("/ocorrencias_export", params={"ano": 2023, "id_ra": 5, "colunas": "mes,natureza,quantidade"})
+
+    # ASSERT
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    df = pd.read_csv(io.StringIO(response.text), sep=';')
+    assert list(df.columns) == ['mes', 'natureza', 'quantidade']
+    assert len(df) == len(esperado)
+    assert df['quantidade'].sum() == esperado['quantidade'].sum()
+
+
+def test_exportacao_em_fatias():
+    """
+    Testa que o arquivo é gerado em várias partes (uma por fatia), sem
+    montar o resultado inteiro de uma vez.
+    """
+    # ARRANGE
+    dataset = model_loader.obter_dataset()
+
+    # ACT
+    partes = list(exportar(dataset, 'csv', FiltrosExportacao(ano=2022), ['id_ra', 'quantidade'], tamanho=1000))
+
+    # ASSERT: cabeçalho + uma parte por fatia de 1000 linhas
+    linhas = len(dataset.particoes[2022].denormalizado)
+    assert len(partes) == 1 + -(-linhas // 1000)
+    assert sum(parte.count(b'\n') for parte in partes) == linhas + 1
+
+
+def test_exportacao_parquet_e_arrow():
+    """
+    Testa que Parquet e Arrow IPC podem ser lidos de volta com as mesmas linhas.
+    """
+    pa = pytest.importorskip("pyarrow", reason="pacote opcional 'pyarrow' não instalado")
+    import pyarrow.parquet as pq
+
+    # ACT
+    parquet = client.get("/ocorrencias_export", params={"formato": "parquet", "mes": 3})
+    arrow = client.get("/ocorrencias_export", params={"formato": "arrow", "mes": 3})
+
+    # ASSERT
+    tabela_parquet = pq.read_table(io.BytesIO(parquet.content))
+    tabela_arrow = pa.ipc.open_stream(arrow.content).read_all()
+    total = sum(int((p.denormalizado['mes'] == 3).sum()) for p in model_loader.obter_dataset().particoes.values())
+    assert tabela_parquet.num_rows == tabela_arrow.num_rows == total
+    assert tabela_parquet.column_names == tabela_arrow.column_names
+
+
+@pytest.mark.parametrize("formato", ["parquet", "arrow"])
+def test_exportacao_sem_pyarrow_responde_501(formato, monkeypatch):
+    """
+    Testa que, sem o pacote opcional pyarrow, Parquet e Arrow respondem 501
+    antes de iniciar o envio (CSV continua disponível).
+    """
+    # ARRANGE
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+
+    # ACT
+    response = client.get("/ocorrencias_export", params={"formato": formato, "mes": 3})
+    csv = client.get("/ocorrencias_export", params={"formato": "csv", "mes": 3})
+
+    # ASSERT
+    assert response.status_code == 501
+    assert "pyarrow" in response.json()["detail"]
+    assert csv.status_code == 200
+
+
+def test_exportacao_coluna_invalida():
+    """
+    Testa que uma coluna inexistente retorna 400 antes de iniciar o envio.
+    """
+    response = client.get("/ocorrencias_export", params={"colunas": "id_ra,senha"})
+
+    assert response.status_code == 400
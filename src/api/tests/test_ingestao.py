@@ -0,0 +1,108 @@
+"""
+Testes Automatizados - Pipeline de ingestão de arquivos brutos
+Estrutura AAA: Arrange, Act, Assert
+"""
+
+from src.config import settings
+from src.models import model_loader
+from src.services.ingestao_service import ingerir_arquivos, normalizar_nome
+
+
+def _escrever(path, conteudo):
+    path.write_text(conteudo, encoding="utf-8")
+    return path
+
+
+def test_normalizar_nome():
+    assert normalizar_nome("  Homicídio ") == "HOMICIDIO"
+    assert normalizar_nome("ROUBO EM COMERCIO ") == normalizar_nome("ROUBO EM COMÉRCIO")
+
+
+def test_ingestao_mapeia_nomes_e_mescla_por_chave(backend_temporario, tmp_path):
+    """
+    Testa a ingestão de dois arquivos brutos em paralelo: nomes viram códigos,
+    a chave repetida fica com a última linha e nomes desconhecidos são relatados.
+    """
+    # ARRANGE
+    janeiro = _escrever(tmp_path / "jan.csv", (
+        "natureza;ra;mes;ano;quantidade\n"
+        "HOMICIDIO;PLANO PILOTO;1;2031;5\n"
+        "FEMINICIDIO;PLANO PILOTO;1;2031;1\n"
+    ))
+    fevereiro = _escrever(tmp_path / "fev.csv", (
+        "id;natureza;mes;ano;quantidade\n"
+        "1;HOMICIDIO;2;2031;7\n"
+        "2;ROUBO EM TRANSPORTE COLETIVO;2;2031;3\n"
+        "3;HOMICIDIO;2;2031;8\n"
+    ))
+    dataset_antigo = model_loader.obter_dataset()
+
+    # ACT
+    relatorio = ingerir_arquivos([janeiro, fevereiro], id_ra_padrao=14, workers=2,
+                                 manifesto=tmp_path / "manifesto.json")
+
+    # ASSERT
+    assert relatorio.linhas_mescladas == 3
+    resultados = {r.arquivo: r for r in relatorio.processados}
+    assert resultados[str(janeiro.resolve())].nao_mapeados == {"natureza: FEMINICIDIO": 1}
+    fatos = backend_temporario.consultar_fatos(id_ra=14, ano=2031)
+    assert sorted(fatos[["mes", "cod_natureza", "quantidade"]].values.tolist()) == [[1, 7, 5], [2, 4, 3], [2, 7, 8]]
+    # A nova versão já foi publicada em memória
+    assert model_loader.obter_dataset().versao == dataset_antigo.versao + 1
+    assert 2031 in model_loader.obter_dataset().particoes
+
+
+def test_ingestao_ignora_arquivos_sem_mudanca(backend_temporario, tmp_path):
+    """
+    Testa o controle por hash: arquivo sem mudança é ignorado; alterado é reprocessado
+    e a quantidade da chave é substituída (sem duplicar linhas).
+    """
+    bruto = _escrever(tmp_path / "bruto.csv", "natureza;mes;ano;quantidade\nHOMICIDIO;3;2031;4\n")
+    manifesto = tmp_path / "manifesto.json"
+    ingerir_arquivos([bruto], id_ra_padrao=1, workers=1, manifesto=manifesto)
+
+    segunda = ingerir_arquivos([bruto], id_ra_padrao=1, workers=1, manifesto=manifesto)
+    _escrever(bruto, "natureza;mes;ano;quantidade\nHOMICIDIO;3;2031;9\n")
+    terceira = ingerir_arquivos([bruto], id_ra_padrao=1, workers=1, manifesto=manifesto)
+
+    assert segunda.ignorados == [str(bruto.resolve())]
+    assert len(terceira.processados) == 1
+    assert backend_temporario.consultar_fatos(id_ra=1, ano=2031, mes=3, cod_natureza=7)["quantidade"].tolist() == [9]
+
+
+def test_ingestao_recusa_linhas_invalidas_como_a_carga(backend_temporario, tmp_path, monkeypatch):
+    """
+    Testa que as linhas ingeridas passam pela mesma validação da carga: mês 13,
+    quantidade negativa e --id-ra inexistente são recusados, relatados no
+    ResultadoArquivo e não chegam ao armazenamento nem à versão publicada.
+    """
+    # ARRANGE
+    monkeypatch.setattr(settings, "QUARANTINE_MAX_FRACTION", 0.5)
+    misto = _escrever(tmp_path / "misto.csv", (
+        "natureza;mes;ano;quantidade\n"
+        "HOMICIDIO;1;2031;5\n"
+        "HOMICIDIO;13;2031;2\n"
+        "ROUBO EM TRANSPORTE COLETIVO;2;2031;-3\n"
+        "ROUBO EM TRANSPORTE COLETIVO;3;2031;4\n"
+    ))
+    ra_inexistente = _escrever(tmp_path / "ra_inexistente.csv", "natureza;mes;ano;quantidade\nHOMICIDIO;4;2031;1\n")
+    manifesto = tmp_path / "manifesto.json"
+
+    # ACT
+    relatorio = ingerir_arquivos([misto], id_ra_padrao=14, workers=1, manifesto=manifesto)
+    invalido = ingerir_arquivos([ra_inexistente], id_ra_padrao=999, workers=1, manifesto=manifesto)
+
+    # ASSERT
+    resultado = relatorio.processados[0]
+    assert resultado.rejeitadas == {"fora_da_faixa": 2}
+    assert (resultado.linhas_lidas, resultado.linhas_validas) == (4, 2)
+    assert relatorio.linhas_mescladas == 2
+    fatos = backend_temporario.consultar_fatos(id_ra=14, ano=2031)
+    assert sorted(fatos[["mes", "quantidade"]].values.tolist()) == [[1, 5], [3, 4]]
+    particao = model_loader.obter_dataset().particoes[2031].denormalizado
+    assert sorted(particao.loc[particao["id_ra"] == 14, "mes"].tolist()) == [1, 3]
+    # Arquivo só com a RA inexistente: falha inteiro, nada é gravado nem marcado no manifesto
+    assert invalido.processados[0].erro is not None
+    assert invalido.linhas_mescladas == 0
+    assert backend_temporario.consultar_fatos(id_ra=999, ano=2031).empty
+    assert str(ra_inexistente.resolve()) not in manifesto.read_text(encoding="utf-8")
@@ -0,0 +1,115 @@
+"""
+Testes Automatizados - Respostas materializadas de /ocorrencias_nomes e /natureza
+Estrutura AAA: Arrange, Act, Assert
+"""
+
+import gzip
+import json
+
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from ..main import app
+from src.config import settings
+from src.models import model_loader
+from src.services import materializacao_service
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def backend_temporario(backend_temporario, monkeypatch):
+    # Sem respostas materializadas de outro teste
+    monkeypatch.setattr(materializacao_service, "_atual", None)
+    monkeypatch.setattr(materializacao_service, "_agendada", None)
+    return backend_temporario
+
+
+def test_bytes_materializados_iguais_aos_calculados(backend_temporario, monkeypatch):
+    """
+    Testa que cada resposta pré-renderizada tem exatamente os bytes que o
+    endpoint calcula (amostra de chaves de /ocorrencias_nomes e todas as naturezas).
+    """
+    # ARRANGE
+    materializacao = materializacao_service.materializar(model_loader.obter_dataset())
+    monkeypatch.setattr(settings, "MATERIALIZE_ENABLED", False)
+    chaves = sorted(materializacao.nomes)[::97]
+
+    # ACT / ASSERT
+    for id_ra, ano, mes in chaves:
+        calculado = client.get("/ocorrencias_nomes", params={"id_ra": id_ra, "ano": ano, "mes": mes})
+        assert materializacao.nomes[(id_ra, ano, mes)][0] == calculado.content
+    for codigo, (dados, _) in materializacao.naturezas.items():
+        assert dados == client.get(f"/natureza/{codigo}").content
+
+
+def test_endpoint_serve_materializacao_com_gzip(backend_temporario, monkeypatch):
+    """
+    Testa que, com a versão materializada, o endpoint envia os bytes prontos
+    (em gzip para quem aceita) e que uma chave fora do espaço materializado é 404.
+    """
+    # ARRANGE
+    dataset = model_loader.obter_dataset()
+    materializacao = materializacao_service.materializar(dataset, comprimir=True)
+    monkeypatch.setattr(materializacao_service, "_atual", materializacao)
+    id_ra, ano, mes = next(iter(materializacao.nomes))
+
+    # ACT
+    response = client.get("/ocorrencias_nomes", params={"id_ra": id_ra, "ano": ano, "mes": mes},
+                          headers={"Accept-Encoding": "gzip"})
+    ausente = client.get("/ocorrencias_nomes", params={"id_ra": id_ra, "ano": 2099, "mes": mes})
+
+    # ASSERT
+    dados, comprimido = materializacao.nomes[(id_ra, ano, mes)]
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.content == dados
+    assert gzip.decompress(comprimido) == dados
+    assert ausente.status_code == 404
+
+
+def test_nova_versao_rerenderiza_so_o_ano_alterado(backend_temporario, monkeypatch):
+    """
+    Testa que, após uma escrita, o ouvinte monta a materialização da nova
+    versão reaproveitando as respostas dos anos que não mudaram.
+    """
+    # ARRANGE
+    monkeypatch.setattr(model_loader, "_ouvintes_publicacao", [materializacao_service.agendar])
+    materializacao_service._construir(model_loader.obter_dataset())
+    anterior = materializacao_service._atual
+    novo = pd.DataFrame([{'ID_RA': 14, 'ANO': 2025, 'COD_NATUREZA': 7, 'MES': 1, 'QUANTIDADE': 40}])
+
+    # ACT
+    model_loader.save_new_record(novo)
+    materializacao_service._construtor.submit(lambda: None).result(timeout=30)
+
+    # ASSERT
+    dataset = model_loader.obter_dataset()
+    atual = materializacao_service.obter_materializacao(dataset)
+    assert atual is not None and atual.versao == dataset.versao
+    assert 2025 not in anterior.por_ano
+    assert all(atual.por_ano[ano][1] is respostas for ano, (_, respostas) in anterior.por_ano.items())
+    registros = json.loads(atual.nomes[(14, 2025, 1)][0])
+    assert any(r["COD_NATUREZA"] == 7 and r["QUANTIDADE"] == 40 for r in registros)
+
+
+def test_gravar_espelha_as_urls(backend_temporario, tmp_path):
+    """
+    Testa que a CLI grava um arquivo por resposta, com caminho igual à URL,
+    e o manifesto com a versão.
+    """
+    # ARRANGE
+    destino = tmp_path / "dist"
+
+    # ACT
+    materializacao_service.main([str(destino), "--gzip"])
+
+    # ASSERT
+    materializacao = materializacao_service.materializar(model_loader.obter_dataset())
+    id_ra, ano, mes = next(iter(materializacao.nomes))
+    arquivo = destino / "ocorrencias_nomes" / str(id_ra) / str(ano) / f"{mes}.json"
+    manifesto = json.loads((destino / "manifesto.json").read_text(encoding="utf-8"))
+    assert arquivo.read_bytes() == materializacao.nomes[(id_ra, ano, mes)][0]
+    assert gzip.decompress(arquivo.with_name(arquivo.name + ".gz").read_bytes()) == arquivo.read_bytes()
+    assert manifesto == {"versao": materializacao.versao, "respostas": materializacao.total, "gzip": True}
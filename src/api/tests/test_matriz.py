@@ -0,0 +1,121 @@
+"""
+Testes Automatizados - Matriz RA x Natureza (recortes 2-D do cubo)
+Estrutura AAA: Arrange, Act, Assert
+"""
+
+import numpy as np
+import pandas as pd
+from fastapi.testclient import TestClient
+
+from src.models import model_loader
+from src.models.cubo import montar_cubo
+from ..main import app
+
+client = TestClient(app)
+
+
+def test_matriz_ra_natureza_igual_ao_filtro_por_ra():
+    """
+    Testa que cada linha da matriz RA x Natureza de um período traz as mesmas
+    quantidades que /ocorrencias_nomes retorna para aquela RA.
+    """
+    # ACT
+    response = client.get("/ocorrencias_matriz", params={"ano": 2024, "mes": 6})
+    por_ra = client.get("/ocorrencias_nomes", params={"id_ra": 14, "ano": 2024, "mes": 6}).json()
+
+    # ASSERT
+    assert response.status_code == 200
+    dados = response.json()
+    n_colunas = len(dados["Rotulos_Colunas"])
+    assert len(dados["Valores"]) == len(dados["Rotulos_Linhas"]) * n_colunas
+    linha = dados["Rotulos_Linhas"].index(14)
+    valores = dict(zip(dados["Rotulos_Colunas"], dados["Valores"][linha * n_colunas:(linha + 1) * n_colunas]))
+    for item in por_ra:
+        assert valores[item["COD_NATUREZA"]] == item["QUANTIDADE"]
+
+
+def test_recorte_soma_dimensoes_livres():
+    """
+    Testa que dimensões não fixadas são somadas e que células sem dado ficam NaN.
+    """
+    # ARRANGE
+    fatos = pd.DataFrame({
+        'id_ra': [1, 1, 2, 2], 'ano': [2023, 2024, 2023, 2024], 'mes': [1, 1, 2, 2],
+        'cod_natureza': [5, 5, 5, 7], 'quantidade': [3, 4, 10, 1],
+    })
+    cubo = montar_cubo(fatos)
+
+    # ACT
+    linhas, colunas, matriz = cubo.recorte('cod_natureza', 'id_ra', {})
+    _, _, por_ano = cubo.recorte('id_ra', 'cod_natureza', {'ano': 2023})
+
+    # ASSERT
+    assert linhas.tolist() == [5, 7] and colunas.tolist() == [1, 2]
+    assert matriz[0].tolist() == [7, 10]
+    assert np.isnan(matriz[1, 0]) and matriz[1, 1] == 1
+    assert np.isnan(por_ano[1, 1])
+
+
+def test_matriz_periodo_inexistente_e_dimensoes_repetidas():
+    """
+    Testa o 404 para período sem dados e o 400 para linhas == colunas.
+    """
+    assert client.get("/ocorrencias_matriz", params={"ano": 2019}).status_code == 404
+    assert client.get("/ocorrencias_matriz", params={"linhas": "mes", "colunas": "mes"}).status_code == 400
+
+
+def test_novo_registro_atualiza_cubo(backend_temporario):
+    """
+    Testa que um novo registro aparece na matriz sem remontar o cubo.
+    """
+    # ARRANGE
+    model_loader.obter_dataset().cubo
+    novo = pd.DataFrame([{'ID_RA': 1, 'ANO': 2024, 'COD_NATUREZA': 1, 'MES': 6, 'QUANTIDADE': 77}])
+
+    # ACT
+    model_loader.save_new_record(novo)
+    atual = model_loader.obter_dataset()
+    _, _, matriz = atual.cubo.recorte('id_ra', 'cod_natureza', {'ano': 2024, 'mes': 6})
+
+    # ASSERT
+    assert 'cubo' in atual.__dict__
+    assert matriz[0, 0] == 77
+
+
+def test_filtro_na_dimensao_das_linhas_restringe_a_matriz():
+    """
+    Testa que fixar a dimensão escolhida para as linhas (ex.: linhas=id_ra e
+    id_ra=14) devolve só aquela linha, igual à da matriz completa.
+    """
+    # ARRANGE
+    completa = client.get("/ocorrencias_matriz", params={"ano": 2024, "mes": 6}).json()
+
+    # ACT
+    response = client.get("/ocorrencias_matriz", params={"ano": 2024, "mes": 6, "linhas": "id_ra", "id_ra": 14})
+
+    # ASSERT
+    assert response.status_code == 200
+    dados = response.json()
+    n_colunas = len(completa["Rotulos_Colunas"])
+    linha = completa["Rotulos_Linhas"].index(14)
+    assert dados["Rotulos_Linhas"] == [14]
+    assert dados["Filtros"] == {"ano": 2024, "mes": 6, "id_ra": 14}
+    assert dados["Valores"] == completa["Valores"][linha * n_colunas:(linha + 1) * n_colunas]
+
+
+def test_chave_repetida_vale_a_ultima_linha_como_nas_listas():
+    """
+    Testa que a matriz e as rotas de linhas concordam numa chave repetida do
+    CSV (RA 6, 2024, mês 1, natureza 1: linhas com 0 e depois 10) e que a
+    soma de uma linha da matriz é a soma das linhas de /ocorrencias_nomes.
+    """
+    # ARRANGE
+    nomes = client.get("/ocorrencias_nomes", params={"id_ra": 6, "ano": 2024, "mes": 1}).json()
+
+    # ACT
+    dados = client.get("/ocorrencias_matriz", params={"ano": 2024, "mes": 1, "id_ra": 6, "linhas": "id_ra"}).json()
+
+    # ASSERT
+    celulas = dict(zip(dados["Rotulos_Colunas"], dados["Valores"]))
+    assert celulas[1] == 10
+    assert sum(v for v in dados["Valores"] if v is not None) == sum(n["QUANTIDADE"] for n in nomes)
@@ -0,0 +1,113 @@
+"""
+Testes Automatizados - Previsão sazonal em lote
+Estrutura AAA: Arrange, Act, Assert
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from src.models import model_loader
+from src.models.previsao import ajustar_modelo
+from ..main import app
+
+client = TestClient(app)
+
+
+def _serie(id_ra, cod_natureza, anos, valor):
+    """Série mensal com valor(ano, mes) para todos os meses dos anos informados."""
+    return pd.DataFrame([
+        {'id_ra': id_ra, 'ano': ano, 'mes': mes, 'cod_natureza': cod_natureza, 'quantidade': valor(ano, mes)}
+        for ano in anos for mes in range(1, 13)
+    ])
+
+
+def test_modelo_recupera_tendencia_e_sazonalidade():
+    """
+    Testa que o ajuste em lote recupera, para cada série, a tendência e o
+    padrão sazonal de dados sem ruído.
+    """
+    # ARRANGE: série 1 cresce 1 por mês; série 2 é constante com pico em dezembro
+    fatos = pd.concat([
+        _serie(1, 1, [2022, 2023], lambda ano, mes: (ano - 2022) * 12 + mes),
+        _serie(2, 5, [2022, 2023], lambda ano, mes: 20 if mes == 12 else 10),
+    ], ignore_index=True)
+
+    # ACT
+    previsoes = ajustar_modelo(fatos).previsoes.set_index(['id_ra', 'cod_natureza'])
+
+    # ASSERT: próximo mês é jan/2024
+    crescente, sazonal = previsoes.loc[(1, 1)], previsoes.loc[(2, 5)]
+    assert (crescente['ano'], crescente['mes']) == (2024, 1)
+    assert crescente['previsao_mes'] == pytest.approx(25)
+    assert crescente['previsao_trimestre'] == pytest.approx(25 + 26 + 27)
+    assert crescente['tendencia_mensal'] == pytest.approx(1)
+    assert sazonal['previsao_mes'] == pytest.approx(10)
+    assert sazonal['tendencia_mensal'] == pytest.approx(0, abs=1e-9)
+    assert sazonal['media_historica_mes'] == pytest.approx(10)
+
+
+def test_atualizacao_incremental_igual_ao_ajuste_completo():
+    """
+    Testa que aplicar linhas novas (mês novo, correção e série inédita) ao
+    modelo dá os mesmos coeficientes que ajustar tudo de novo.
+    """
+    # ARRANGE
+    base = _serie(1, 1, [2022, 2023], lambda ano, mes: mes % 5)
+    novas = pd.DataFrame({
+        'id_ra': [1, 1, 7], 'ano': [2024, 2023, 2024], 'mes': [1, 6, 1],
+        'cod_natureza': [1, 1, 3], 'quantidade': [9, 40, 2],
+    })
+    modelo = ajustar_modelo(base)
+
+    # ACT
+    incremental = modelo.com_novas_linhas(novas)
+    completo = ajustar_modelo(pd.concat([base, novas], ignore_index=True))
+
+    # ASSERT
+    assert np.array_equal(incremental.chaves, completo.chaves)
+    assert np.allclose(incremental.coeficientes, completo.coeficientes)
+    assert incremental.fim == completo.fim
+    # O modelo anterior não é alterado
+    assert modelo.fim < incremental.fim
+
+
+def test_endpoint_previsao_filtra_por_ra_e_natureza(backend_temporario):
+    """
+    Testa o GET /ocorrencias_previsao com filtros e o 404 para série inexistente.
+    """
+    # ACT
+    response = client.get("/ocorrencias_previsao", params={"id_ra": 1, "cod_natureza": 1})
+    inexistente = client.get("/ocorrencias_previsao", params={"id_ra": 1, "cod_natureza": 999})
+
+    # ASSERT
+    assert response.status_code == 200
+    dados = response.json()
+    assert len(dados) == 1
+    assert (dados[0]["ID_RA"], dados[0]["COD_NATUREZA"]) == (1, 1)
+    assert (dados[0]["ANO"], dados[0]["MES"]) == (2025, 1)
+    assert dados[0]["Previsao_Proximo_Trimestre"] >= dados[0]["Previsao_Proximo_Mes"] >= 0
+    assert inexistente.status_code == 404
+
+
+def test_novo_registro_atualiza_modelo_sem_reajuste(backend_temporario):
+    """
+    Testa que save_new_record publica uma versão cujo modelo já vem
+    atualizado a partir do modelo anterior (incremental).
+    """
+    # ARRANGE
+    anterior = model_loader.obter_dataset()
+    modelo_anterior = anterior.modelo_sazonal
+    novo = pd.DataFrame([{'ID_RA': 1, 'ANO': 2025, 'COD_NATUREZA': 1, 'MES': 1, 'QUANTIDADE': 50}])
+
+    # ACT
+    model_loader.save_new_record(novo)
+    atual = model_loader.obter_dataset()
+
+    # ASSERT: o modelo já está na nova versão, sem passar pelo ajuste completo
+    assert 'modelo_sazonal' in atual.__dict__
+    modelo = atual.modelo_sazonal
+    assert modelo.fim == modelo_anterior.fim + 1
+    completo = ajustar_modelo(atual.consolidado)
+    assert np.allclose(modelo.coeficientes, completo.coeficientes)
@@ -0,0 +1,128 @@
+"""
+Testes Automatizados - Profiling opcional por requisição
+Estrutura AAA: Arrange, Act, Assert
+"""
+
+import pstats
+from typing import List
+
+import pandas as pd
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from src.api.profiling import RotaProfilavel, perfilar_requisicao
+from src.config import settings
+from ..main import app as app_principal
+
+
+def _app_perfilada() -> FastAPI:
+    # Mesma montagem feita no main.py quando PROFILING_ENABLED=true
+    app = FastAPI()
+    app.router.route_class = RotaProfilavel
+    app.middleware("http")(perfilar_requisicao)
+
+    @app.get("/soma")
+    def soma(n: int = 1000):
+        df = pd.DataFrame({"a": range(n), "b": range(n)})
+        return {"total": int(df.merge(df, on="a")["b_x"].sum())}
+
+    @app.get("/itens", response_model=List[Item])
+    async def itens(n: int = 500):
+        return [{"id": i, "nome": f"item {i}"} for i in range(n)]
+
+    return app
+
+
+class Item(BaseModel):
+    id: int
+    nome: str
+
+
+def test_profiling_com_cabecalho(tmp_path, monkeypatch):
+    """
+    Testa que a requisição com o cabeçalho recebe o resumo e grava o perfil em disco,
+    incluindo o tempo do endpoint síncrono (que roda no threadpool).
+    """
+    monkeypatch.setattr(settings, "PROFILING_DIR", str(tmp_path))
+    client = TestClient(_app_perfilada())
+
+    response = client.get("/soma", headers={"X-Profile": "1"})
+
+    assert response.status_code == 200
+    assert response.json() == {"total": 499500}
+    resumo = response.headers["X-Profile-Summary"]
+    assert "total_ms=" in resumo and "pandas_ms=" in resumo
+    assert float(resumo.split("pandas_merge_ms=")[1].split(";")[0]) > 0
+    assert (tmp_path / response.headers["X-Profile-File"].split("/")[-1]).exists()
+
+
+def test_profiling_sem_cabecalho(tmp_path, monkeypatch):
+    """
+    Testa que, sem o cabeçalho, nada é medido nem gravado.
+    """
+    monkeypatch.setattr(settings, "PROFILING_DIR", str(tmp_path))
+    client = TestClient(_app_perfilada())
+
+    response = client.get("/soma")
+
+    assert response.status_code == 200
+    assert "X-Profile-Summary" not in response.headers
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_profiling_desligado_por_padrao():
+    """
+    Testa que a API principal ignora o cabeçalho quando PROFILING_ENABLED está desligado.
+    """
+    response = TestClient(app_principal).get("/health", headers={"X-Profile": "1"})
+
+    assert response.status_code == 200
+    assert "X-Profile-Summary" not in response.headers
+
+
+def test_profiling_uma_requisicao_por_vez(tmp_path, monkeypatch):
+    """
+    Testa que, com outra requisição já sendo perfilada, a requisição com o
+    cabeçalho é atendida normalmente e sem perfil (dois cProfile ativos ao
+    mesmo tempo falham no Python 3.12).
+    """
+    # ARRANGE
+    from src.api import profiling
+    monkeypatch.setattr(settings, "PROFILING_DIR", str(tmp_path))
+    client = TestClient(_app_perfilada())
+    profiling._lock_requisicao.acquire()
+
+    # ACT
+    try:
+        ocupado = client.get("/soma", headers={"X-Profile": "1"})
+    finally:
+        profiling._lock_requisicao.release()
+    livre = client.get("/soma", headers={"X-Profile": "1"})
+
+    # ASSERT
+    assert ocupado.status_code == 200 and ocupado.json() == {"total": 499500}
+    assert "X-Profile-Summary" not in ocupado.headers
+    assert "X-Profile-Summary" in livre.headers
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_profiling_mede_a_serializacao_da_resposta(tmp_path, monkeypatch):
+    """
+    Testa que o perfil de um endpoint assíncrono inclui a validação do
+    response_model (Pydantic) e a codificação JSON, não só o endpoint.
+    """
+    # ARRANGE
+    monkeypatch.setattr(settings, "PROFILING_DIR", str(tmp_path))
+    client = TestClient(_app_perfilada())
+
+    # ACT
+    response = client.get("/itens", headers={"X-Profile": "1"})
+
+    # ASSERT
+    assert response.status_code == 200 and len(response.json()) == 500
+    stats = pstats.Stats(str(tmp_path / response.headers["X-Profile-File"].split("/")[-1]))
+    arquivos = {arquivo.replace("\\", "/") for arquivo, _linha, _nome in stats.stats}
+    assert any("/pydantic/" in arquivo for arquivo in arquivos)
+    assert any("/json/" in arquivo for arquivo in arquivos)
+    assert "pydantic_ms=" in response.headers["X-Profile-Summary"]
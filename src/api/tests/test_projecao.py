@@ -0,0 +1,68 @@
+"""
+Testes Automatizados - Projeção de campos e formato colunar em /ocorrencias_nomes
+Estrutura AAA: Arrange, Act, Assert
+"""
+
+from fastapi.testclient import TestClient
+
+from ..main import app
+
+client = TestClient(app)
+
+FILTRO = {"id_ra": 1, "ano": 2024, "mes": 3}
+
+
+def test_fields_retorna_so_os_campos_pedidos():
+    """
+    Testa que fields= mantém as linhas e os valores da resposta completa,
+    só com os campos pedidos, na ordem pedida.
+    """
+    # ARRANGE
+    completo = client.get("/ocorrencias_nomes", params=FILTRO).json()
+
+    # ACT
+    response = client.get("/ocorrencias_nomes", params={**FILTRO, "fields": "COD_NATUREZA,QUANTIDADE"})
+
+    # ASSERT
+    assert response.status_code == 200
+    assert response.json() == [{"COD_NATUREZA": r["COD_NATUREZA"], "QUANTIDADE": r["QUANTIDADE"]} for r in completo]
+    assert list(response.json()[0]) == ["COD_NATUREZA", "QUANTIDADE"]
+
+
+def test_formato_colunar_reconstroi_as_linhas():
+    """
+    Testa que o formato colunar, decodificado pelos dicionários, reproduz a
+    resposta em linhas, com cada nome escrito uma vez.
+    """
+    # ARRANGE
+    completo = client.get("/ocorrencias_nomes", params=FILTRO)
+
+    # ACT
+    colunar = client.get("/ocorrencias_nomes", params={**FILTRO, "format": "columnar"})
+
+    # ASSERT
+    dados = colunar.json()
+    colunas, dicionarios = dados["colunas"], dados["dicionarios"]
+    linhas = [
+        {campo: dicionarios[campo][valores[i]] if campo in dicionarios else valores[i] for campo, valores in colunas.items()}
+        for i in range(dados["linhas"])
+    ]
+    assert linhas == completo.json()
+    assert dicionarios["RegiaoAdministrativa"] == [completo.json()[0]["RegiaoAdministrativa"]]
+    assert len(colunar.content) < len(completo.content) / 2
+
+
+def test_campos_e_formato_invalidos():
+    """
+    Testa 400 para campo inexistente, 422 para formato desconhecido e 404 sem dados.
+    """
+    # ACT
+    campo = client.get("/ocorrencias_nomes", params={**FILTRO, "fields": "QUANTIDADE,SENHA"})
+    formato = client.get("/ocorrencias_nomes", params={**FILTRO, "format": "xml"})
+    vazio = client.get("/ocorrencias_nomes", params={**FILTRO, "ano": 2099, "format": "columnar"})
+
+    # ASSERT
+    assert campo.status_code == 400
+    assert "SENHA" in campo.json()["detail"]
+    assert formato.status_code == 422
+    assert vazio.status_code == 404
@@ -0,0 +1,116 @@
+"""
+Testes Automatizados - Fatos diários e agregados semanal, mensal e anual
+Estrutura AAA: Arrange, Act, Assert
+"""
+
+from fastapi.testclient import TestClient
+
+from src.models import model_loader
+from ..main import app
+
+client = TestClient(app)
+
+
+def _rollup(granularidade, **filtros):
+    response = client.get("/ocorrencias_rollup", params={"granularidade": granularidade, **filtros})
+    assert response.status_code == 200
+    return [(linha["PERIODO"], linha["QUANTIDADE"]) for linha in response.json()]
+
+
+def test_dias_atualizam_semana_mes_e_ano(backend_temporario):
+    """
+    Testa que um lote diário aparece na semana ISO, no mês (também para os
+    endpoints mensais) e no total anual.
+    """
+    # ARRANGE: 2024-12-30 pertence à semana 1 de 2025 (ISO)
+    lote = [
+        {"id_ra": 14, "cod_natureza": 7, "quantidade": 2, "data": "2025-01-02"},
+        {"id_ra": 14, "cod_natureza": 7, "quantidade": 3, "data": "2025-01-03"},
+        {"id_ra": 14, "cod_natureza": 7, "quantidade": 5, "data": "2025-01-20"},
+        {"id_ra": 14, "cod_natureza": 7, "quantidade": 1, "data": "2024-12-30"},
+    ]
+
+    # ACT
+    response = client.post("/ocorrencias_diarias", json=lote)
+
+    # ASSERT
+    assert response.status_code == 201
+    assert _rollup("semana", id_ra=14, cod_natureza=7, ano=2025) == [(1, 6), (4, 5)]
+    assert _rollup("mes", id_ra=14, cod_natureza=7, ano=2025) == [(1, 10)]
+    assert _rollup("ano", id_ra=14, cod_natureza=7, ano=2025) == [(None, 10)]
+    nomes = client.get("/ocorrencias_nomes", params={"id_ra": 14, "ano": 2025, "mes": 1, "cod_natureza": 7})
+    assert nomes.json()[0]["QUANTIDADE"] == 10
+
+
+def test_dia_corrigido_nao_soma_em_dobro(backend_temporario):
+    """
+    Testa que reenviar um dia com nova quantidade substitui o valor anterior.
+    """
+    # ARRANGE
+    client.post("/ocorrencias_diarias", json=[{"id_ra": 3, "cod_natureza": 2, "quantidade": 4, "data": "2025-02-10"}])
+
+    # ACT
+    client.post("/ocorrencias_diarias", json=[{"id_ra": 3, "cod_natureza": 2, "quantidade": 1, "data": "2025-02-10"}])
+
+    # ASSERT
+    assert _rollup("semana", id_ra=3, cod_natureza=2, ano=2025) == [(7, 1)]
+    assert _rollup("mes", id_ra=3, cod_natureza=2, ano=2025) == [(2, 1)]
+
+
+def test_dia_no_csv_so_acrescenta_linhas_na_tabela_mensal(backend_temporario):
+    """
+    Testa que um lote diário no backend CSV não reescreve a tabela de fatos:
+    o arquivo anterior continua intacto (mesmos bytes no início) e só ganham
+    linhas os meses tocados; a recarga fica com a última linha de cada mês.
+    """
+    # ARRANGE
+    model_loader.obter_dataset()
+    antes = backend_temporario.fatos.read_bytes()
+    lote = [{"id_ra": 3, "cod_natureza": 2, "quantidade": q, "data": f"2025-02-{dia:02d}"} for dia, q in ((10, 4), (11, 1))]
+
+    # ACT
+    client.post("/ocorrencias_diarias", json=lote[:1])
+    client.post("/ocorrencias_diarias", json=lote[1:])
+
+    # ASSERT
+    depois = backend_temporario.fatos.read_bytes()
+    assert depois.startswith(antes)
+    assert depois[len(antes):].decode("utf-8").splitlines() == ["3;2025;2;2;4", "3;2025;2;2;5"]
+    model_loader.recarregar_dataset()
+    assert _rollup("mes", id_ra=3, cod_natureza=2, ano=2025) == [(2, 5)]
+
+
+def test_recarga_remonta_os_mesmos_agregados(backend_temporario):
+    """
+    Testa que, após recarregar do armazenamento, os agregados calculados do
+    zero coincidem com os mantidos de forma incremental.
+    """
+    # ARRANGE
+    client.post("/ocorrencias_diarias", json=[
+        {"id_ra": 5, "cod_natureza": 9, "quantidade": 2, "data": "2025-03-01"},
+        {"id_ra": 5, "cod_natureza": 9, "quantidade": 6, "data": "2025-03-31"},
+    ])
+    incrementais = [_rollup(g, id_ra=5, cod_natureza=9, ano=2025) for g in ("semana", "mes", "ano")]
+
+    # ACT
+    model_loader.recarregar_dataset()
+
+    # ASSERT
+    assert [_rollup(g, id_ra=5, cod_natureza=9, ano=2025) for g in ("semana", "mes", "ano")] == incrementais
+
+
+def test_rollup_mensal_historico_e_filtro_sem_dados(backend_temporario):
+    """
+    Testa que o agregado anual soma os meses já existentes e que filtros
+    sem dados retornam 404.
+    """
+    # ARRANGE
+    mensal = _rollup("mes", id_ra=1, cod_natureza=3, ano=2024)
+
+    # ACT
+    anual = _rollup("ano", id_ra=1, cod_natureza=3, ano=2024)
+    vazio = client.get("/ocorrencias_rollup", params={"granularidade": "semana", "ano": 2024})
+
+    # ASSERT
+    assert anual == [(None, sum(q for _, q in mensal))]
+    assert vazio.status_code == 404
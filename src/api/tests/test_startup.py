@@ -0,0 +1,70 @@
+"""
+Testes Automatizados - Tempo de inicialização (importação da API)
+Estrutura AAA: Arrange, Act, Assert
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from src.models import model_loader
+from ..main import app
+
+RAIZ_PROJETO = Path(__file__).resolve().parents[3]
+
+# Orçamento para `import src.api.main` (acumulado, em milissegundos).
+# Medido em ~550 ms nesta máquina, quase todo em fastapi/pydantic;
+# o pandas sozinho somava ~350 ms antes de ser adiado.
+ORCAMENTO_IMPORTACAO_MS = 1500
+MODULOS_PESADOS = ("pandas", "numpy")
+
+
+def _medir_importacao(cwd: Path):
+    """Roda `python -X importtime` em outro processo e devolve {módulo: tempo acumulado em us}."""
+    env = dict(os.environ, PYTHONPATH=str(RAIZ_PROJETO))
+    resultado = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import src.api.main"],
+        cwd=cwd, env=env, capture_output=True, text=True, check=True,
+    )
+    tempos = {}
+    for linha in resultado.stderr.splitlines():
+        if not linha.startswith("import time:") or "cumulative" in linha:
+            continue
+        _proprio, acumulado, modulo = linha[len("import time:"):].split("|")
+        tempos[modulo.strip()] = int(acumulado)
+    return tempos
+
+
+def test_importacao_dentro_do_orcamento(tmp_path):
+    """
+    Testa que importar a API não carrega pandas/numpy, não cria arquivos
+    no diretório atual e fica dentro do orçamento de tempo.
+    """
+    tempos = _medir_importacao(tmp_path)
+
+    pesados = [m for m in tempos if m.split(".")[0] in MODULOS_PESADOS]
+    assert pesados == []
+    assert list(tmp_path.iterdir()) == []
+    assert tempos["src.api.main"] / 1000 < ORCAMENTO_IMPORTACAO_MS
+
+
+def test_ready_depois_da_carga():
+    """
+    Testa que /ready responde 503 enquanto não há dataset e 200 depois da carga.
+    """
+    client = TestClient(app)
+    original = model_loader._dataset_atual
+    model_loader._dataset_atual = None
+    try:
+        antes = client.get("/ready")
+        model_loader.obter_dataset()
+        depois = client.get("/ready")
+    finally:
+        model_loader._dataset_atual = original
+
+    assert antes.status_code == 503
+    assert depois.status_code == 200
+    assert depois.json()["status"] == "Pronto!"
@@ -0,0 +1,102 @@
+"""
+Testes Automatizados - Backends de armazenamento (CSV e SQLite)
+Estrutura AAA: Arrange, Act, Assert
+"""
+
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from src.config import DATA_DIR_COMPLETO_NORMALIZADO, DATA_DIR_NATUREZA, DATA_DIR_RA
+from src.models import model_loader
+from src.models.storage import CsvBackend, SqliteBackend, migrar_para_sqlite
+from src.services.ocorrencias_service import get_media_historica, get_ocorrencias_nomes_filtradas
+
+
+@pytest.fixture
+def backend_sqlite(tmp_path, monkeypatch):
+    """Migra os CSVs do repositório para um SQLite temporário e o usa como backend."""
+    origem = CsvBackend(fatos=DATA_DIR_COMPLETO_NORMALIZADO, naturezas=DATA_DIR_NATUREZA, regioes=DATA_DIR_RA)
+    destino = tmp_path / "ocorrencias.db"
+    migrar_para_sqlite(origem, destino)
+
+    backend = SqliteBackend(destino)
+    monkeypatch.setattr(model_loader, "_backend", backend)
+    monkeypatch.setattr(model_loader, "_dataset_atual", None)
+    return backend
+
+
+def test_migracao_remove_duplicados_da_chave_natural(backend_sqlite):
+    """
+    Testa que a migração carrega todas as chaves distintas do CSV
+    e que o índice composto existe no banco.
+    """
+    csv = CsvBackend(fatos=DATA_DIR_COMPLETO_NORMALIZADO, naturezas=DATA_DIR_NATUREZA, regioes=DATA_DIR_RA).ler_fatos()
+    chaves_distintas = csv.drop_duplicates(["id_ra", "ano", "mes", "cod_natureza"]).shape[0]
+
+    fatos = backend_sqlite.ler_fatos()
+
+    assert fatos.shape[0] == chaves_distintas
+    with sqlite3.connect(backend_sqlite.path) as con:
+        colunas = [linha[2] for linha in con.execute("PRAGMA index_info('idx_fatos_chave')")]
+    assert colunas == ["id_ra", "ano", "mes", "cod_natureza"]
+
+
+def test_consulta_por_chave_usa_indice(backend_sqlite):
+    """
+    Testa a consulta filtrada e o plano de execução da consulta que o
+    backend monta (busca pelo índice, sem varredura da tabela de fatos).
+    """
+    resultado = backend_sqlite.consultar_fatos(id_ra=1, ano=2024, mes=6)
+    sql, parametros = backend_sqlite.montar_consulta(
+        "SELECT id_ra, ano, cod_natureza, mes, quantidade FROM fatos", id_ra=1, ano=2024, mes=6)
+
+    assert not resultado.empty
+    assert set(resultado["id_ra"]) == {1}
+    with sqlite3.connect(backend_sqlite.path) as con:
+        plano = " ".join(str(linha) for linha in con.execute("EXPLAIN QUERY PLAN " + sql, parametros))
+    assert "idx_fatos_chave" in plano
+    assert "SCAN fatos" not in plano
+
+
+def test_consultas_por_chave_no_sqlite_usam_a_versao_fixada(backend_sqlite):
+    """
+    Testa que, no SQLite, /ocorrencias_nomes e /ocorrencias_media leem da versão
+    fixada pela requisição: uma escrita no banco no meio da requisição não
+    aparece em uma consulta e some da outra.
+    """
+    # ARRANGE
+    novo = pd.DataFrame([{"ID_RA": 14, "ANO": 2024, "COD_NATUREZA": 7, "MES": 6, "QUANTIDADE": 999}])
+
+    # ACT
+    with model_loader.fixar_dataset():
+        antes = get_media_historica(id_ra=14, ano=2024, mes=6, cod_natureza=7)
+        model_loader.save_new_record(novo)
+        nomes = get_ocorrencias_nomes_filtradas(id_ra=14, ano=2024, mes=6)
+        media = get_media_historica(id_ra=14, ano=2024, mes=6, cod_natureza=7)
+    depois = get_media_historica(id_ra=14, ano=2024, mes=6, cod_natureza=7)
+
+    # ASSERT
+    assert media == antes
+    assert 999 not in [n.QUANTIDADE for n in nomes]
+    assert depois.Quantidade_Atual == 999
+
+
+def test_upsert_atualiza_dataset_sem_duplicar(backend_sqlite):
+    """
+    Testa que salvar uma chave existente no SQLite substitui a quantidade,
+    tanto no banco quanto na nova versão publicada em memória.
+    """
+    antigo = model_loader.obter_dataset()
+    linhas_antes = antigo.consolidado.shape[0]
+    novo_registro = pd.DataFrame([{"MES": 6, "ANO": 2024, "COD_NATUREZA": 7, "ID_RA": 14, "QUANTIDADE": 999}])
+
+    model_loader.save_new_record(novo_registro)
+
+    novo = model_loader.obter_dataset()
+    assert novo.consolidado.shape[0] == linhas_antes
+    historico = novo.historico_ra_mes_natureza(id_ra=14, mes=6, cod_natureza=7)
+    assert historico[historico["ano"] == 2024]["quantidade"].tolist() == [999]
+    assert backend_sqlite.consultar_fatos(id_ra=14, ano=2024, mes=6, cod_natureza=7)["quantidade"].tolist() == [999]
+    pd.testing.assert_frame_equal(novo.consolidado, model_loader.recarregar_dataset().consolidado)
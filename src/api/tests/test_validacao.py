@@ -0,0 +1,99 @@
+"""
+Testes Automatizados - Validação vetorizada e quarentena na carga dos dados
+Estrutura AAA: Arrange, Act, Assert
+"""
+
+import json
+
+import pandas as pd
+import pytest
+
+from src.config import settings
+from src.models import model_loader
+from src.models.validacao import ErroCargaDados, validar_fatos
+
+
+@pytest.fixture
+def fatos_temporarios(backend_temporario, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "QUARANTINE_DIR", str(tmp_path / "quarentena"))
+    return backend_temporario.fatos
+
+
+def _dimensoes():
+    naturezas = pd.DataFrame({"natureza": ["ROUBO", "FURTO"], "cod_natureza": [1, 2]})
+    regioes = pd.DataFrame({"id_ra": [1, 2], "regiao_administrativa": ["Plano Piloto", "Gama"]})
+    return naturezas, regioes
+
+
+def test_linhas_invalidas_vao_para_quarentena(fatos_temporarios, tmp_path):
+    """
+    Testa que linhas com tipo inválido, fora da faixa do schema ou com campo
+    vazio não chegam ao dataset e ficam no relatório de quarentena.
+    """
+    # ARRANGE
+    # De cada chave natural repetida no arquivo, só a última linha entra
+    total_original = len(pd.read_csv(fatos_temporarios, sep=";").drop_duplicates(["ID_RA", "ANO", "MES", "COD_NATUREZA"]))
+    with open(fatos_temporarios, "a", encoding="utf-8") as f:
+        f.write("1;2024;7;13;5\n")    # mês 13
+        f.write("1;2024;abc;6;5\n")   # natureza não numérica
+        f.write("1;1999;7;6;5\n")     # ano abaixo do aceito no POST
+        f.write("1;2024;7;6;\n")      # quantidade vazia
+
+    # ACT
+    dataset = model_loader.obter_dataset()
+
+    # ASSERT
+    relatorio = dataset.validacao
+    assert len(dataset.consolidado) == total_original
+    assert relatorio.rejeitadas - relatorio.substituidas == 4
+    assert relatorio.por_motivo == {"tipo_invalido": 2, "fora_da_faixa": 2, "chave_duplicada": relatorio.substituidas}
+    assert dataset.consolidado["cod_natureza"].dtype == "int64"
+    resumo = json.loads((tmp_path / "quarentena" / f"{settings.DATASET_PADRAO}.json").read_text(encoding="utf-8"))
+    assert resumo["rejeitadas"] == relatorio.rejeitadas
+
+
+def test_integridade_referencial_e_chaves_repetidas(monkeypatch):
+    """
+    Testa que códigos ausentes das dimensões são rejeitados e que, de cada
+    chave repetida, só a última linha fica (a anterior vai para o relatório
+    como substituída, sem contar como erro).
+    """
+    # ARRANGE
+    monkeypatch.setattr(settings, "QUARANTINE_MAX_FRACTION", 0.5)
+    naturezas, regioes = _dimensoes()
+    fatos = pd.DataFrame({
+        "id_ra":        [1, 1, 2, 9, 1],
+        "ano":          [2024, 2024, 2024, 2024, 2024],
+        "cod_natureza": [1, 1, 7, 2, 2],
+        "mes":          [1, 1, 1, 1, 1],
+        "quantidade":   [3, 4, 1, 1, 2],
+    })
+
+    # ACT
+    validas, relatorio = validar_fatos(fatos, naturezas, regioes)
+
+    # ASSERT
+    assert validas.to_dict("records") == [
+        {"id_ra": 1, "ano": 2024, "cod_natureza": 1, "mes": 1, "quantidade": 4},
+        {"id_ra": 1, "ano": 2024, "cod_natureza": 2, "mes": 1, "quantidade": 2},
+    ]
+    assert relatorio.quarentena["motivo"].tolist() == ["chave_duplicada", "natureza_desconhecida", "ra_desconhecida"]
+    assert relatorio.substituidas == 1
+
+
+def test_carga_falha_alto_em_vez_de_voltar_vazia(fatos_temporarios):
+    """
+    Testa que um arquivo ilegível ou majoritariamente inválido interrompe a
+    carga com ErroCargaDados, em vez de publicar um dataset vazio.
+    """
+    # ARRANGE
+    naturezas, regioes = _dimensoes()
+    invalidos = pd.DataFrame({"id_ra": [1, 9], "ano": [2024, 2024], "cod_natureza": [1, 9],
+                              "mes": [1, 1], "quantidade": [1, 1]})
+    fatos_temporarios.write_text("", encoding="utf-8")
+
+    # ACT / ASSERT
+    with pytest.raises(ErroCargaDados):
+        model_loader.obter_dataset()
+    with pytest.raises(ErroCargaDados):
+        validar_fatos(invalidos, naturezas, regioes)
@@ -25,6 +25,98 @@ class Settings(BaseSettings):
     CSV_NAME_CONSOLIDADO: str = "dados_consolidados_normalizado.csv"
     CSV_NAME_NATUREZA: str = "tabela_natureza_ocorrencia.csv"
     CSV_NAME_RA: str = "tabela_ra_ocorrencia.csv"
+    # Fatos diários (ID_RA;DATA;COD_NATUREZA;QUANTIDADE); o arquivo é criado no primeiro registro
+    CSV_NAME_DIARIO: str = "dados_diarios.csv"
+
+    # Backend de armazenamento dos dados: "csv" (padrão) ou "sqlite"
+    STORAGE_BACKEND: str = "csv"
+    SQLITE_NAME: str = "ocorrencias.db"
+
+    # Recarga automática dos CSVs quando os arquivos de dados mudam
+    DATA_WATCH_ENABLED: bool = True
+    DATA_WATCH_INTERVAL_SECONDS: float = 5.0
+
+    # Profiling opcional por requisição: com PROFILING_ENABLED=true, requisições
+    # com o cabeçalho PROFILING_HEADER ativo (ex.: "X-Profile: 1") são medidas com cProfile
+    PROFILING_ENABLED: bool = False
+    PROFILING_HEADER: str = "X-Profile"
+    PROFILING_DIR: str = "logs/profiles"
+
+    # Carrega o dataset em segundo plano ao subir o worker (a API já atende /health
+    # enquanto isso; /ready só responde 200 depois da carga)
+    DATA_PRELOAD_ON_STARTUP: bool = True
+
+    # Controle de admissão: vagas simultâneas (CONCURRENCY) e fila de espera (QUEUE)
+    # por grupo de rotas. Sem vaga em até ADMISSION_QUEUE_TIMEOUT_SECONDS ou com a
+    # fila cheia, a resposta é 503 com Retry-After. A baia "reservada" atende
+    # /, /health, /ready e /natureza/{codigo}; a "agregacao", as agregações e o catálogo.
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float = 2.0
+    ADMISSION_RETRY_AFTER_SECONDS: int = 1
+    ADMISSION_RESERVED_CONCURRENCY: int = 8
+    ADMISSION_RESERVED_QUEUE: int = 64
+    ADMISSION_QUERY_CONCURRENCY: int = 8
+    ADMISSION_QUERY_QUEUE: int = 32
+    ADMISSION_MEDIA_CONCURRENCY: int = 4
+    ADMISSION_MEDIA_QUEUE: int = 16
+    ADMISSION_AGGREGATION_CONCURRENCY: int = 4
+    ADMISSION_AGGREGATION_QUEUE: int = 16
+    ADMISSION_WRITE_CONCURRENCY: int = 2
+    ADMISSION_WRITE_QUEUE: int = 8
+    ADMISSION_EXPORT_CONCURRENCY: int = 2
+    ADMISSION_EXPORT_QUEUE: int = 4
+
+    # Threads dos pools dedicados dos endpoints (src/api/executores.py): consultas
+    # por índice/médias, agregações pesadas (distribuição, agregados, previsão,
+    # matriz) e escritas. Separados, uma agregação lenta não ocupa as threads
+    # das consultas baratas nem das escritas.
+    EXECUTOR_QUERY_WORKERS: int = 8
+    EXECUTOR_AGGREGATION_WORKERS: int = 2
+    EXECUTOR_WRITE_WORKERS: int = 2
+
+    # Exportação em lote: linhas por fatia (cada fatia é codificada e enviada
+    # antes da próxima ser lida, o que mantém a memória constante)
+    EXPORT_CHUNK_ROWS: int = 10000
+
+    # Assinaturas de eventos (Server-Sent Events em /ocorrencias_eventos): máximo
+    # de conexões, mensagens pendentes por cliente antes de desconectá-lo e
+    # intervalo do keep-alive. As conexões longas não passam pelo controle de
+    # admissão; o limite delas é SSE_MAX_SUBSCRIBERS.
+    SSE_MAX_SUBSCRIBERS: int = 1000
+    SSE_QUEUE_SIZE: int = 100
+    SSE_HEARTBEAT_SECONDS: float = 15.0
+
+    # Validação na carga: linhas de fatos inválidas (tipo, faixa, RA/natureza
+    # inexistente) vão para a quarentena, com relatório em QUARANTINE_DIR. Se a
+    # fração rejeitada passar de QUARANTINE_MAX_FRACTION, a carga falha.
+    QUARANTINE_DIR: str = "logs/quarentena"
+    QUARANTINE_MAX_FRACTION: float = 0.05
+
+    # Compressão negociada (Accept-Encoding: zstd, br, gzip) das rotas de lista,
+    # com as respostas já comprimidas guardadas por (rota, parâmetros, versão do
+    # dataset, codificação) num cache LRU de até COMPRESSION_CACHE_MB. Corpos
+    # menores que COMPRESSION_MIN_BYTES vão sem compressão. brotli e zstd exigem
+    # os pacotes opcionais 'brotli' e 'zstandard' (requirements-opcional.txt).
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_CACHE_MB: int = 64
+    COMPRESSION_MIN_BYTES: int = 512
+
+    # Respostas de /ocorrencias_nomes e /natureza/{codigo} pré-renderizadas a cada
+    # versão do dataset (em segundo plano) e servidas direto da memória.
+    # MATERIALIZE_GZIP guarda também a versão comprimida; com MATERIALIZE_DIR,
+    # os arquivos são gravados ali a cada versão (para um cache estático).
+    MATERIALIZE_ENABLED: bool = True
+    MATERIALIZE_GZIP: bool = False
+    MATERIALIZE_DIR: str = ""
+
+    # Catálogo de datasets adicionais (arquivos históricos, outras jurisdições):
+    # um subdiretório por dataset em src/data/<DATASETS_DIR_NAME>, com um arquivo
+    # de fatos por ano. As partições são carregadas sob demanda e mantidas num
+    # cache LRU de até DATASETS_CACHE_MB. DATASET_PADRAO é o nome do dataset
+    # principal (o da configuração acima, sempre em memória).
+    DATASETS_DIR_NAME: str = "datasets"
+    DATASETS_CACHE_MB: int = 256
+    DATASET_PADRAO: str = "df"
 
     # Variaveis de Segurança (Exemplo)
     CORS_ORIGINS: str = "http://localhost:8000" # Origens permitidas (pode ser lista)
@@ -43,6 +135,11 @@ DATA_DIR_CONSOLIDADO = BASE_DIR / "src" / "data" / settings.CSV_NAME_CONSOLIDADO
 DATA_DIR_NATUREZA = BASE_DIR / "src" / "data" / settings.CSV_NAME_NATUREZA
 DATA_DIR_RA = BASE_DIR / "src" / "data" / settings.CSV_NAME_RA
 DATA_DIR_COMPLETO_NORMALIZADO = BASE_DIR / "src" / "data" / "dados_consolidados_normalizado.csv"
+DATA_DIR_SQLITE = BASE_DIR / "src" / "data" / settings.SQLITE_NAME
+DATA_DIR_DIARIO = BASE_DIR / "src" / "data" / settings.CSV_NAME_DIARIO
+DATA_DIR_DATASETS = BASE_DIR / "src" / "data" / settings.DATASETS_DIR_NAME
+# Registro (hash SHA-256) dos arquivos brutos já ingeridos
+DATA_DIR_MANIFESTO_INGESTAO = BASE_DIR / "src" / "data" / "ingestao_manifesto.json"
 
 # Nomes das variaveis globais da API (usadas no main.py)
 API_TITLE = settings.API_TITLE
@@ -73,11 +170,19 @@ LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 # Diretório de logs
 LOG_DIR = Path("logs")
 
-# Criar diretório de logs se não existir
-LOG_DIR.mkdir(exist_ok=True)
+_logging_configurado = False
 
 # Configuração do sistema de logging da aplicação
+# Não é chamada na importação: quem sobe o processo (API, CLIs) chama uma vez.
+# Assim importar src.config não cria diretórios nem arquivos.
 def setup_logging():
+    global _logging_configurado
+    app_logger = logging.getLogger("ml_api")
+    if _logging_configurado:
+        return app_logger
+
+    # Criar diretório de logs se não existir
+    LOG_DIR.mkdir(exist_ok=True)
     logging.basicConfig(
         level=LOG_LEVEL,
         format=LOG_FORMAT,
@@ -86,8 +191,9 @@ def setup_logging():
             logging.StreamHandler()
         ]
     )
-    return logging.getLogger("ml_api")
+    _logging_configurado = True
+    app_logger.info("Logging configurado com sucesso")
+    return app_logger
 
-# Logger global
-logger = setup_logging()
-logger.info("Logging configurado com sucesso")
+# Logger global (os handlers são instalados por setup_logging)
+logger = logging.getLogger("ml_api")
@@ -0,0 +1,22 @@
+# Arquivo: src/models/arquivos.py
+# Assinatura (mtime/tamanho) dos arquivos de dados, sem dependências pesadas
+
+import os
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+# Assinatura de um arquivo: (mtime em ns, tamanho em bytes). None se o arquivo não existir.
+Assinatura = Optional[Tuple[int, int]]
+
+
+def assinatura_arquivo(path: Path) -> Assinatura:
+    """Retorna (mtime_ns, tamanho) do arquivo, ou None se ele não existir."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def assinatura_arquivos(paths: Iterable[Path]) -> Dict[Path, Assinatura]:
+    return {Path(path): assinatura_arquivo(path) for path in paths}
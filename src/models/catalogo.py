@@ -0,0 +1,269 @@
+# Arquivo: src/models/catalogo.py
+# Vários datasets (arquivos históricos, outras jurisdições) com partições anuais
+# carregadas sob demanda e um cache LRU limitado em memória
+
+import argparse
+import re
+import shutil
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from src.config import settings, DATA_DIR_DATASETS, DATA_DIR_NATUREZA, DATA_DIR_RA, logger, setup_logging
+from src.models.arquivos import Assinatura, assinatura_arquivo, assinatura_arquivos
+from src.models.dataset import DatasetVersion, Particao, montar_particao
+from src.models.storage import CsvBackend
+from src.models.validacao import FAIXAS_CATALOGO, registrar_relatorio, validar_dimensoes, validar_fatos
+
+# Um arquivo de fatos por ano, no mesmo formato do consolidado (ID_RA;ANO;COD_NATUREZA;MES;QUANTIDADE)
+ARQUIVO_ANO = "fatos_{ano}.csv"
+_PADRAO_ARQUIVO_ANO = re.compile(r"^fatos_(\d{4})\.csv$")
+
+
+def tamanho_particao(particao: Particao) -> int:
+    """Bytes ocupados pela partição (DataFrame com strings + arrays dos índices)."""
+    indices = sum(posicoes.nbytes for indice in (particao.indice_ra_mes, particao.indice_ra_mes_natureza)
+                  for posicoes in indice.values())
+    return int(particao.denormalizado.memory_usage(deep=True).sum()) + indices
+
+
+# ----------------------------------------------
+# CLASSE FonteDataset --- Diretório de um dataset
+# ----------------------------------------------
+
+@dataclass(frozen=True)
+class FonteDataset:
+    """
+    <DATASETS_DIR>/<nome>/ com as dimensões (mesmos nomes de arquivo do
+    dataset principal) e um arquivo de fatos por ano. Listar os anos não lê
+    nenhum dado: basta o nome dos arquivos.
+    """
+    nome: str
+    diretorio: Path
+
+    @property
+    def naturezas(self) -> Path:
+        return self.diretorio / settings.CSV_NAME_NATUREZA
+
+    @property
+    def regioes(self) -> Path:
+        return self.diretorio / settings.CSV_NAME_RA
+
+    def arquivo_ano(self, ano: int) -> Path:
+        return self.diretorio / ARQUIVO_ANO.format(ano=ano)
+
+    def anos(self) -> List[int]:
+        return sorted(int(m.group(1)) for arquivo in self.diretorio.iterdir()
+                      if (m := _PADRAO_ARQUIVO_ANO.match(arquivo.name)))
+
+    def backend(self, ano: int) -> CsvBackend:
+        return CsvBackend(fatos=self.arquivo_ano(ano), naturezas=self.naturezas, regioes=self.regioes)
+
+
+@dataclass(frozen=True)
+class _Entrada:
+    particao: Particao
+    assinatura: Assinatura
+    tamanho: int
+
+
+# ----------------------------------------------
+# CLASSE CatalogoDatasets --- Partições (dataset, ano) sob demanda
+# ----------------------------------------------
+
+class CatalogoDatasets:
+    """
+    Carrega a partição (dataset, ano) só quando uma consulta precisa dela e
+    mantém as partições usadas recentemente até `limite_bytes`; acima disso, as
+    menos usadas são descartadas. As dimensões de cada dataset (poucas linhas)
+    ficam fora do limite. Uma partição cujo arquivo mudou é recarregada no
+    próximo acesso.
+    """
+
+    def __init__(self, diretorio: Path, limite_bytes: int):
+        self.diretorio = Path(diretorio)
+        self.limite_bytes = limite_bytes
+        self._lock = threading.Lock()
+        self._particoes: "OrderedDict[Tuple[str, int], _Entrada]" = OrderedDict()
+        self._dimensoes: Dict[str, Tuple[Dict[Path, Assinatura], pd.DataFrame, pd.DataFrame]] = {}
+        # Uma trava por partição: duas requisições pelo mesmo ano leem o arquivo uma vez só
+        self._carregando: Dict[Tuple[str, int], threading.Lock] = {}
+        self.bytes_em_uso = 0
+        self.acertos = 0
+        self.faltas = 0
+        self.descartes = 0
+
+    # --- Datasets disponíveis ---
+
+    def nomes(self) -> List[str]:
+        if not self.diretorio.is_dir():
+            return []
+        return sorted(d.name for d in self.diretorio.iterdir() if d.is_dir() and not d.name.startswith('.'))
+
+    def fonte(self, nome: str) -> FonteDataset:
+        if nome not in self.nomes():
+            raise KeyError(f"Dataset '{nome}' não encontrado.")
+        return FonteDataset(nome=nome, diretorio=self.diretorio / nome)
+
+    def carregadas(self, nome: str) -> List[int]:
+        """Anos do dataset atualmente em memória."""
+        with self._lock:
+            return sorted(ano for (dataset, ano) in self._particoes if dataset == nome)
+
+    # --- Leitura ---
+
+    def dimensoes(self, nome: str) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """(naturezas, regiões) do dataset, relidas só se os arquivos mudarem."""
+        fonte = self.fonte(nome)
+        assinaturas = assinatura_arquivos([fonte.naturezas, fonte.regioes])
+        atual = self._dimensoes.get(nome)
+        if atual is None or atual[0] != assinaturas:
+            backend = fonte.backend(ano=0)  # só as dimensões são lidas
+            dim_natureza, dim_ra, descartadas = validar_dimensoes(backend.ler_naturezas(), backend.ler_regioes())
+            if descartadas:
+                logger.warning(f"Catálogo: {descartadas} linhas de dimensão descartadas em '{nome}'.")
+            atual = (assinaturas, dim_natureza, dim_ra)
+            self._dimensoes[nome] = atual
+        return atual[1], atual[2]
+
+    def particao(self, nome: str, ano: int) -> Optional[Particao]:
+        """Partição do ano (do cache ou do arquivo); None se o dataset não tiver o ano."""
+        fonte = self.fonte(nome)
+        assinatura = assinatura_arquivo(fonte.arquivo_ano(ano))
+        if assinatura is None:
+            return None
+        chave = (nome, ano)
+
+        entrada = self._ler_cache(chave, assinatura)
+        if entrada is not None:
+            return entrada.particao
+
+        with self._lock:
+            trava = self._carregando.setdefault(chave, threading.Lock())
+        with trava:
+            entrada = self._ler_cache(chave, assinatura)
+            if entrada is not None:
+                return entrada.particao
+            particao = self._carregar(fonte, ano)
+            self._guardar(chave, _Entrada(particao, assinatura, tamanho_particao(particao)))
+            return particao
+
+    def vista(self, nome: str, anos: Optional[Iterable[int]] = None) -> DatasetVersion:
+        """
+        DatasetVersion só com as partições dos anos pedidos (todos, se None).
+        As consultas do serviço rodam sobre ela sem saber de onde veio.
+        A vista segura as suas partições até o fim da requisição, mesmo que
+        o cache as descarte no meio do caminho.
+        """
+        fonte = self.fonte(nome)
+        dim_natureza, dim_ra = self.dimensoes(nome)
+        disponiveis = fonte.anos()
+        anos = disponiveis if anos is None else [ano for ano in anos if ano in disponiveis]
+        particoes = {}
+        for ano in anos:
+            particao = self.particao(nome, ano)
+            if particao is not None:
+                particoes[ano] = particao
+        return DatasetVersion(versao=0, particoes=particoes, naturezas=dim_natureza,
+                              dim_natureza=dim_natureza, dim_ra=dim_ra)
+
+    def limpar(self):
+        with self._lock:
+            self._particoes.clear()
+            self._dimensoes.clear()
+            self.bytes_em_uso = 0
+
+    # --- Cache ---
+
+    def _ler_cache(self, chave: Tuple[str, int], assinatura: Assinatura) -> Optional[_Entrada]:
+        with self._lock:
+            entrada = self._particoes.get(chave)
+            if entrada is None or entrada.assinatura != assinatura:
+                return None
+            self._particoes.move_to_end(chave)
+            self.acertos += 1
+            return entrada
+
+    def _guardar(self, chave: Tuple[str, int], entrada: _Entrada):
+        with self._lock:
+            self.faltas += 1
+            antiga = self._particoes.pop(chave, None)
+            if antiga is not None:
+                self.bytes_em_uso -= antiga.tamanho
+            self._particoes[chave] = entrada
+            self.bytes_em_uso += entrada.tamanho
+            # Descarta as menos usadas; a recém-carregada fica mesmo sozinha acima do limite
+            while self.bytes_em_uso > self.limite_bytes and len(self._particoes) > 1:
+                descartada, removida = self._particoes.popitem(last=False)
+                self.bytes_em_uso -= removida.tamanho
+                self.descartes += 1
+                logger.info(f"Catálogo: partição {descartada} descartada do cache ({removida.tamanho} bytes).")
+
+    def _carregar(self, fonte: FonteDataset, ano: int) -> Particao:
+        from src.models.model_loader import _montar_denormalizado
+
+        dim_natureza, dim_ra = self.dimensoes(fonte.nome)
+        # Sem as faixas de RA, natureza e ano do dataset principal: valem as dimensões do próprio dataset
+        fatos, relatorio = validar_fatos(fonte.backend(ano).ler_fatos(), dim_natureza, dim_ra,
+                                         faixas=FAIXAS_CATALOGO,
+                                         origem=f"{fonte.nome}_{ano}")
+        registrar_relatorio(relatorio)
+        if not fatos.empty:
+            # Um arquivo por ano: linhas de outros anos ficam de fora da partição
+            fatos = fatos[fatos['ano'] == ano].reset_index(drop=True)
+        denormalizado = _montar_denormalizado(fatos, dim_natureza, dim_ra)
+        logger.info(f"Catálogo: partição ({fonte.nome}, {ano}) carregada ({denormalizado.shape[0]} linhas).")
+        return montar_particao(ano, denormalizado)
+
+
+def criar_catalogo() -> CatalogoDatasets:
+    return CatalogoDatasets(DATA_DIR_DATASETS, settings.DATASETS_CACHE_MB * 1024 * 1024)
+
+
+# ----------------------------------------------
+# PARTICIONAMENTO (CLI)
+# ----------------------------------------------
+
+def particionar_dataset(fatos: Path, naturezas: Path, regioes: Path, destino: Path) -> List[int]:
+    """
+    Divide uma tabela de fatos no formato do consolidado em um arquivo por ano
+    e copia as dimensões para `destino`. Retorna os anos gravados.
+    """
+    destino = Path(destino)
+    destino.mkdir(parents=True, exist_ok=True)
+    df = pd.read_csv(fatos, sep=';', encoding='utf-8')
+    coluna_ano = next(coluna for coluna in df.columns if coluna.strip().lower() == 'ano')
+
+    anos = []
+    for ano, df_ano in df.groupby(coluna_ano, sort=True):
+        df_ano.to_csv(destino / ARQUIVO_ANO.format(ano=int(ano)), sep=';', encoding='utf-8', index=False)
+        anos.append(int(ano))
+    shutil.copy(naturezas, destino / settings.CSV_NAME_NATUREZA)
+    shutil.copy(regioes, destino / settings.CSV_NAME_RA)
+
+    logger.info(f"Dataset particionado em {destino}: anos {anos}.")
+    return anos
+
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description="Catálogo de datasets da API SSP/DF.")
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+    particionar = subparsers.add_parser("particionar", help="Cria um dataset com um arquivo de fatos por ano.")
+    particionar.add_argument("nome", help="Nome do dataset (subdiretório de DATASETS_DIR).")
+    particionar.add_argument("--fatos", type=Path, required=True, help="CSV de fatos no formato do consolidado.")
+    particionar.add_argument("--naturezas", type=Path, default=DATA_DIR_NATUREZA, help="Tabela de naturezas.")
+    particionar.add_argument("--regioes", type=Path, default=DATA_DIR_RA, help="Tabela de RAs.")
+    args = parser.parse_args(argv)
+    setup_logging()
+
+    if args.comando == "particionar":
+        anos = particionar_dataset(args.fatos, args.naturezas, args.regioes, DATA_DIR_DATASETS / args.nome)
+        print(f"Dataset '{args.nome}' criado com {len(anos)} anos: {anos}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+# Arquivo: src/models/cubo.py
+# Cubo denso (ano x mês x RA x natureza) para recortes 2-D sem varrer o DataFrame
+
+from dataclasses import dataclass, field, replace
+from typing import Dict, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.models.dataset import CHAVE_NATURAL
+
+# Ordem fixa dos eixos do cubo
+EIXOS = ('ano', 'mes', 'id_ra', 'cod_natureza')
+
+
+@dataclass(frozen=True)
+class CuboOcorrencias:
+    """
+    Quantidades em um array denso com um eixo por dimensão. Células sem
+    linha na tabela de fatos ficam NaN (os zeros vêm explícitos nos dados).
+    Com ~5 anos x 12 meses x 33 RAs x 32 naturezas, são poucas dezenas de
+    milhares de células: qualquer recorte é um fatiamento do array.
+    """
+    rotulos: Mapping[str, np.ndarray]   # eixo -> rótulos ordenados
+    valores: np.ndarray                 # shape = (anos, meses, RAs, naturezas)
+
+    def posicao(self, eixo: str, rotulo: int) -> int:
+        try:
+            return _posicao(self.rotulos[eixo], rotulo)
+        except KeyError:
+            raise KeyError(f"{eixo}={rotulo} não existe nos dados")
+
+    def recorte(self, linhas: str, colunas: str,
+                fixos: Mapping[str, int]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Matriz (linhas x colunas). Eixos em `fixos` são fatiados no rótulo
+        informado (se o eixo for o das linhas ou colunas, elas ficam só com
+        esse rótulo); os demais eixos são somados. Retorna (rótulos das
+        linhas, rótulos das colunas, matriz), com NaN onde nenhuma célula
+        somada existe.
+        """
+        if linhas == colunas or linhas not in EIXOS or colunas not in EIXOS:
+            raise ValueError(f"Escolha duas dimensões distintas entre {list(EIXOS)}")
+
+        seletor = []
+        rotulos = dict(self.rotulos)
+        for eixo in EIXOS:
+            if eixo not in fixos:
+                seletor.append(slice(None))
+                continue
+            posicao = self.posicao(eixo, fixos[eixo])
+            if eixo in (linhas, colunas):
+                # Mantém o eixo, com um único rótulo
+                seletor.append(slice(posicao, posicao + 1))
+                rotulos[eixo] = self.rotulos[eixo][posicao:posicao + 1]
+            else:
+                seletor.append(posicao)
+        seletor = tuple(seletor)
+        bloco = self.valores[seletor]
+        # Eixos que sobraram (na ordem de EIXOS), sem os fixados
+        restantes = [eixo for eixo, sel in zip(EIXOS, seletor) if isinstance(sel, slice)]
+
+        somar = tuple(i for i, eixo in enumerate(restantes) if eixo not in (linhas, colunas))
+        if somar:
+            presentes = (~np.isnan(bloco)).sum(axis=somar)
+            bloco = np.where(presentes > 0, np.nansum(bloco, axis=somar), np.nan)
+            restantes = [eixo for eixo in restantes if eixo in (linhas, colunas)]
+
+        matriz = bloco if restantes == [linhas, colunas] else bloco.T
+        return rotulos[linhas], rotulos[colunas], matriz
+
+    def com_novas_linhas(self, novas: pd.DataFrame) -> Optional['CuboOcorrencias']:
+        """
+        Cópia do cubo com as linhas aplicadas (última quantidade de cada chave).
+        Retorna None se alguma linha trouxer um rótulo novo (ano, RA ou
+        natureza): nesse caso o cubo é remontado do zero.
+        """
+        novas = novas.drop_duplicates(CHAVE_NATURAL, keep='last')
+        indices = []
+        for eixo in EIXOS:
+            rotulos = self.rotulos[eixo]
+            valores = novas[eixo].to_numpy()
+            posicoes = np.searchsorted(rotulos, valores)
+            if (posicoes >= len(rotulos)).any() or (rotulos[np.minimum(posicoes, len(rotulos) - 1)] != valores).any():
+                return None
+            indices.append(posicoes)
+
+        valores = self.valores.copy()
+        valores[tuple(indices)] = novas['quantidade'].to_numpy(dtype=float)
+        return replace(self, valores=valores)
+
+
+def montar_cubo(fatos: pd.DataFrame) -> Optional[CuboOcorrencias]:
+    """Monta o cubo a partir da tabela de fatos (a última linha de cada chave prevalece)."""
+    if fatos.empty:
+        return None
+    # Mesma regra da carga (validar_fatos), que já entrega uma linha por chave:
+    # aqui só protege fatos montados fora dela (ex.: testes, datasets do catálogo)
+    fatos = fatos.drop_duplicates(CHAVE_NATURAL, keep='last')
+
+    rotulos: Dict[str, np.ndarray] = {}
+    indices = []
+    for eixo in EIXOS:
+        rotulos_eixo, posicoes = np.unique(fatos[eixo].to_numpy(dtype=np.int64), return_inverse=True)
+        if eixo == 'mes':
+            # Sempre os 12 meses, para que o eixo tenha o mesmo tamanho em qualquer versão
+            rotulos_eixo = np.arange(1, 13)
+            posicoes = fatos['mes'].to_numpy(dtype=np.int64) - 1
+        rotulos[eixo] = rotulos_eixo
+        indices.append(posicoes.reshape(-1))
+
+    valores = np.full(tuple(len(rotulos[eixo]) for eixo in EIXOS), np.nan)
+    valores[tuple(indices)] = fatos['quantidade'].to_numpy(dtype=float)
+    return CuboOcorrencias(rotulos=rotulos, valores=valores)
+
+
+# ----------------------------------------------
+# CLASSE DistribuicaoHistorica --- Histórico ordenado de cada (mês, RA, natureza)
+# ----------------------------------------------
+
+@dataclass(frozen=True)
+class DistribuicaoHistorica:
+    """
+    Para cada (mês, RA, natureza), as quantidades de todos os anos já
+    ordenadas (NaN ao fim) e a contagem de anos com dado. Mediana, mínimo e
+    máximo são leituras diretas; o percentil do valor atual é uma busca binária.
+    """
+    rotulos: Mapping[str, np.ndarray]   # mesmos rótulos do cubo
+    ordenados: np.ndarray               # (meses, RAs, naturezas, anos)
+    contagem: np.ndarray                # (meses, RAs, naturezas)
+    media: np.ndarray                   # (meses, RAs, naturezas)
+    desvio: np.ndarray                  # (meses, RAs, naturezas), amostral (NaN se < 2 anos)
+
+    def historico(self, mes: int, id_ra: int, cod_natureza: int) -> Tuple[np.ndarray, float, float]:
+        """Valores ordenados (só os anos com dado), média e desvio-padrão da combinação."""
+        posicao = tuple(
+            _posicao(self.rotulos[eixo], rotulo)
+            for eixo, rotulo in (('mes', mes), ('id_ra', id_ra), ('cod_natureza', cod_natureza))
+        )
+        n = int(self.contagem[posicao])
+        return self.ordenados[posicao][:n], float(self.media[posicao]), float(self.desvio[posicao])
+
+
+def _posicao(rotulos: np.ndarray, rotulo: int) -> int:
+    indice = int(np.searchsorted(rotulos, rotulo))
+    if indice >= len(rotulos) or rotulos[indice] != rotulo:
+        raise KeyError(rotulo)
+    return indice
+
+
+def mediana(ordenados: np.ndarray) -> float:
+    """Mediana de um array já ordenado (leitura direta, sem ordenar de novo)."""
+    meio = len(ordenados) // 2
+    return float((ordenados[(len(ordenados) - 1) // 2] + ordenados[meio]) / 2)
+
+
+def percentil(ordenados: np.ndarray, valor: float) -> float:
+    """Percentil (0-100) de `valor` no histórico: abaixo + metade dos empates."""
+    if len(ordenados) == 0:
+        return float('nan')
+    abaixo = np.searchsorted(ordenados, valor, side='left')
+    ate = np.searchsorted(ordenados, valor, side='right')
+    return float((abaixo + (ate - abaixo) / 2) / len(ordenados) * 100)
+
+
+def montar_distribuicao(cubo: CuboOcorrencias) -> DistribuicaoHistorica:
+    """Ordena o eixo dos anos do cubo de uma vez para todas as combinações."""
+    historicos = np.moveaxis(cubo.valores, 0, -1)          # (meses, RAs, naturezas, anos)
+    contagem = (~np.isnan(historicos)).sum(axis=-1)
+    soma = np.nansum(historicos, axis=-1)
+    media = np.divide(soma, contagem, out=np.full(contagem.shape, np.nan), where=contagem > 0)
+    desvios = np.where(np.isnan(historicos), 0.0, historicos - media[..., None])
+    variancia = np.divide((desvios ** 2).sum(axis=-1), contagem - 1,
+                          out=np.full(contagem.shape, np.nan), where=contagem > 1)
+    return DistribuicaoHistorica(
+        rotulos=cubo.rotulos,
+        ordenados=np.sort(historicos, axis=-1),
+        contagem=contagem,
+        media=media,
+        desvio=np.sqrt(variancia),
+    )
+
+
+# ----------------------------------------------
+# CLASSE Comovimento --- Correlação/covariância entre séries mensais
+# ----------------------------------------------
+
+# Meses em comum exigidos para calcular um par (abaixo disso, o par fica NaN)
+MIN_MESES_COMOVIMENTO = 3
+# Séries comparáveis: naturezas de uma RA ou RAs de uma natureza
+EIXOS_COMOVIMENTO = ('cod_natureza', 'id_ra')
+
+
+@dataclass(frozen=True)
+class MatrizComovimento:
+    rotulos: np.ndarray     # rótulos das séries (naturezas ou RAs), em ordem
+    meses: int              # pontos (ano, mês) usados nas séries
+    valores: np.ndarray     # (séries, séries); NaN sem meses suficientes ou série constante
+
+
+@dataclass(frozen=True)
+class Comovimento:
+    """
+    Matrizes de correlação/covariância das séries mensais do cubo, calculadas
+    sob demanda e guardadas por (eixo, rótulo fixo, anos, método). Vive numa
+    única versão do dataset: uma escrita cria uma versão nova, com cache vazio.
+    """
+    cubo: CuboOcorrencias
+    _resultados: Dict[tuple, MatrizComovimento] = field(default_factory=dict, repr=False)
+
+    def matriz(self, eixo: str, fixo: int, ano_inicio: Optional[int] = None,
+               ano_fim: Optional[int] = None, metodo: str = 'correlacao') -> MatrizComovimento:
+        """
+        `eixo='cod_natureza'` compara as naturezas da RA `fixo`; `eixo='id_ra'`,
+        as RAs da natureza `fixo`. Levanta KeyError se o rótulo fixo ou o
+        intervalo de anos não existir nos dados.
+        """
+        if eixo not in EIXOS_COMOVIMENTO or metodo not in ('correlacao', 'covariancia'):
+            raise ValueError(f"Eixo deve ser um de {list(EIXOS_COMOVIMENTO)} e método 'correlacao' ou 'covariancia'")
+        chave = (eixo, fixo, ano_inicio, ano_fim, metodo)
+        resultado = self._resultados.get(chave)
+        if resultado is None:
+            resultado = self._calcular(eixo, fixo, ano_inicio, ano_fim, metodo)
+            # Duas threads podem calcular a mesma chave; o resultado é o mesmo
+            self._resultados[chave] = resultado
+        return resultado
+
+    def _calcular(self, eixo, fixo, ano_inicio, ano_fim, metodo) -> MatrizComovimento:
+        anos = self.cubo.rotulos['ano']
+        no_intervalo = (anos >= (anos[0] if ano_inicio is None else ano_inicio)) & \
+                       (anos <= (anos[-1] if ano_fim is None else ano_fim))
+        if not np.any(no_intervalo):
+            raise KeyError(f"ano={ano_inicio}..{ano_fim}")
+
+        if eixo == 'cod_natureza':
+            bloco = self.cubo.valores[no_intervalo, :, self.cubo.posicao('id_ra', fixo), :]
+        else:
+            bloco = self.cubo.valores[no_intervalo, :, :, self.cubo.posicao('cod_natureza', fixo)]
+
+        # Meses (ano, mês) nas linhas e uma série por coluna; saem os meses sem
+        # nenhum dado (ex.: o resto do ano corrente) e as séries vazias
+        series = bloco.reshape(-1, bloco.shape[-1])
+        com_dado = ~np.isnan(series)
+        meses, colunas = com_dado.any(axis=1), com_dado.any(axis=0)
+        series = pd.DataFrame(series[meses][:, colunas])
+
+        # Uma única operação para a matriz inteira (pares com meses em comum)
+        if metodo == 'correlacao':
+            valores = series.corr(min_periods=MIN_MESES_COMOVIMENTO).to_numpy()
+        else:
+            valores = series.cov(min_periods=MIN_MESES_COMOVIMENTO).to_numpy()
+        return MatrizComovimento(rotulos=self.cubo.rotulos[eixo][colunas], meses=int(meses.sum()), valores=valores)
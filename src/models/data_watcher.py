@@ -0,0 +1,74 @@
+# Arquivo: src/models/data_watcher.py
+# Monitor dos CSVs de origem: recarrega o dataset quando os arquivos mudam
+
+import threading
+from typing import Dict, Optional
+from pathlib import Path
+
+from src.config import logger
+from src.models.arquivos import Assinatura, assinatura_arquivos
+from src.models import model_loader
+
+
+class DataWatcher:
+    """
+    Verifica periodicamente (mtime/tamanho) os arquivos de dados.
+    Quando algum arquivo muda, uma nova versão do dataset é montada nesta
+    thread de fundo e publicada com troca atômica; as requisições em andamento
+    terminam com a versão anterior.
+    """
+
+    def __init__(self, intervalo: float = 5.0):
+        self.intervalo = intervalo
+        self._parar = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # Assinatura vista na última verificação e ainda não carregada.
+        # Só recarregamos quando ela se repete, evitando ler um arquivo no meio da cópia.
+        self._pendente: Optional[Dict[Path, Assinatura]] = None
+
+    def iniciar(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._parar.clear()
+        self._thread = threading.Thread(target=self._executar, name="data-watcher", daemon=True)
+        self._thread.start()
+        logger.info(f"Monitor de dados iniciado (intervalo de {self.intervalo}s).")
+
+    def parar(self):
+        self._parar.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.intervalo + 1)
+            self._thread = None
+
+    def _executar(self):
+        while not self._parar.wait(self.intervalo):
+            try:
+                self.verificar()
+            except Exception as e:
+                # O monitor nunca deve morrer por causa de uma recarga com problema
+                logger.error(f"ERRO no monitor de dados: {e}")
+
+    def verificar(self) -> bool:
+        """
+        Compara as assinaturas atuais com as da versão publicada.
+        Retorna True se uma nova versão foi publicada.
+        """
+        atual = model_loader.dataset_carregado()
+        if atual is None:
+            # Nada carregado ainda: a primeira requisição fará a carga completa
+            return False
+
+        assinaturas = assinatura_arquivos(model_loader.arquivos_dados())
+        if assinaturas == atual.assinaturas:
+            self._pendente = None
+            return False
+
+        if assinaturas != self._pendente:
+            # Mudança detectada; aguarda a próxima verificação para confirmar
+            self._pendente = assinaturas
+            return False
+
+        self._pendente = None
+        logger.info("Arquivos de dados alterados; recarregando dataset em segundo plano.")
+        novo = model_loader.recarregar_dataset()
+        return novo is not atual
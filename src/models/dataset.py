@@ -0,0 +1,254 @@
+# Arquivo: src/models/dataset.py
+# Versões imutáveis do dataset carregado em memória (dados + índices)
+
+from dataclasses import dataclass, field, replace
+from functools import cached_property
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.models.arquivos import Assinatura
+
+# Colunas da tabela de fatos (após padronização para snake_case)
+COLUNAS_FATOS = ['id_ra', 'ano', 'cod_natureza', 'mes', 'quantidade']
+# Chave natural de uma linha de fatos
+CHAVE_NATURAL = ['id_ra', 'ano', 'mes', 'cod_natureza']
+# cached_property da versão que sabem se atualizar com novas linhas (com_novas_linhas)
+DERIVADAS_INCREMENTAIS = ('modelo_sazonal', 'cubo')
+
+
+# ----------------------------------------------
+# CLASSE Particao --- Dados de um único ANO
+# ----------------------------------------------
+
+@dataclass(frozen=True)
+class Particao:
+    """
+    Linhas desnormalizadas de um ano e seus índices.
+    Uma escrita só recria a partição do ano afetado; as demais partições
+    são compartilhadas (por referência) entre a versão antiga e a nova.
+    """
+    ano: int
+    denormalizado: pd.DataFrame
+    # Índices (chave -> posições no DataFrame da partição)
+    indice_ra_mes: Dict[tuple, np.ndarray] = field(default_factory=dict, repr=False)
+    indice_ra_mes_natureza: Dict[tuple, np.ndarray] = field(default_factory=dict, repr=False)
+
+
+def montar_particao(ano: int, denormalizado: pd.DataFrame) -> Particao:
+    denormalizado = denormalizado.reset_index(drop=True)
+    return Particao(
+        ano=ano,
+        denormalizado=denormalizado,
+        indice_ra_mes=denormalizado.groupby(['id_ra', 'mes'], sort=False).indices,
+        indice_ra_mes_natureza=denormalizado.groupby(['id_ra', 'mes', 'cod_natureza'], sort=False).indices,
+    )
+
+
+def particionar(denormalizado: pd.DataFrame) -> Dict[int, Particao]:
+    """Divide o DataFrame desnormalizado em partições por ano."""
+    if denormalizado.empty:
+        return {}
+    return {
+        int(ano): montar_particao(int(ano), df_ano)
+        for ano, df_ano in denormalizado.groupby('ano', sort=True)
+    }
+
+
+# ----------------------------------------------
+# CLASSE DatasetVersion --- Uma versão completa e imutável dos dados
+# ----------------------------------------------
+
+@dataclass(frozen=True)
+class DatasetVersion:
+    """
+    Agrupa tudo o que as requisições de leitura precisam: partições por ano
+    (com índices), tabelas de dimensão e as assinaturas dos arquivos de origem.
+    Uma versão nunca é alterada depois de publicada; atualizações criam uma
+    nova versão, que substitui a anterior com uma única atribuição.
+    """
+    versao: int
+    particoes: Mapping[int, Particao]
+    naturezas: pd.DataFrame
+    # Dimensões usadas para desnormalizar novas linhas (JOIN por código)
+    dim_natureza: pd.DataFrame = field(default_factory=pd.DataFrame, repr=False)
+    dim_ra: pd.DataFrame = field(default_factory=pd.DataFrame, repr=False)
+    # Assinaturas dos arquivos de origem no momento da carga
+    assinaturas: Dict[Path, Assinatura] = field(default_factory=dict, repr=False)
+    # Fatos diários e agregado semanal (src.models.rollups.FatosDiarios); a tabela
+    # mensal acima é o agregado mensal deles
+    diarios: Optional[Any] = field(default=None, repr=False)
+    # Resultado da validação da carga (src.models.validacao.RelatorioValidacao)
+    validacao: Optional[Any] = field(default=None, repr=False)
+
+    def __post_init__(self):
+        # Garante que ninguém altere as partições de uma versão já publicada
+        object.__setattr__(self, 'particoes', MappingProxyType(dict(self.particoes)))
+
+    @property
+    def vazio(self) -> bool:
+        return len(self.particoes) == 0
+
+    @property
+    def anos(self) -> List[int]:
+        return sorted(self.particoes)
+
+    # Visões completas: montadas uma única vez por versão, sob demanda
+    @cached_property
+    def denormalizado(self) -> pd.DataFrame:
+        if self.vazio:
+            return pd.DataFrame()
+        df = pd.concat([self.particoes[ano].denormalizado for ano in self.anos], ignore_index=True)
+        # Cria ID sequencial para o Response
+        df['id'] = range(1, len(df) + 1)
+        return df
+
+    @cached_property
+    def consolidado(self) -> pd.DataFrame:
+        if self.vazio:
+            return pd.DataFrame()
+        return self.denormalizado[COLUNAS_FATOS]
+
+    @cached_property
+    def modelo_sazonal(self):
+        """Modelo de previsão de todas as séries (RA, natureza); None se não houver dados."""
+        from src.models.previsao import ajustar_modelo
+        return ajustar_modelo(self.consolidado)
+
+    @cached_property
+    def cubo(self):
+        """Quantidades em array denso (ano x mês x RA x natureza); None se não houver dados."""
+        from src.models.cubo import montar_cubo
+        return montar_cubo(self.consolidado)
+
+    @cached_property
+    def anual(self):
+        """
+        Agregado anual (ano x RA x natureza): soma dos meses do cubo, que já é
+        mantido de forma incremental. Retorna (rótulos, array) ou None.
+        """
+        import numpy as np
+        if self.cubo is None:
+            return None
+        valores = self.cubo.valores
+        presentes = (~np.isnan(valores)).any(axis=1)
+        return self.cubo.rotulos, np.where(presentes, np.nansum(valores, axis=1), np.nan)
+
+    @cached_property
+    def distribuicao(self):
+        """Histórico ordenado de cada (mês, RA, natureza), derivado do cubo; None se não houver dados."""
+        from src.models.cubo import montar_distribuicao
+        return None if self.cubo is None else montar_distribuicao(self.cubo)
+
+    @cached_property
+    def comovimento(self):
+        """Correlação/covariância das séries mensais, calculadas sob demanda nesta versão; None se não houver dados."""
+        from src.models.cubo import Comovimento
+        return None if self.cubo is None else Comovimento(self.cubo)
+
+    # --- Consultas por índice ---
+
+    def ocorrencias_ra_ano_mes(self, id_ra: int, ano: int, mes: int) -> pd.DataFrame:
+        particao = self.particoes.get(ano)
+        if particao is None:
+            return pd.DataFrame(columns=self._colunas())
+        posicoes = particao.indice_ra_mes.get((id_ra, mes), [])
+        return particao.denormalizado.iloc[posicoes]
+
+    def historico_ra_mes_natureza(self, id_ra: int, mes: int, cod_natureza: int) -> pd.DataFrame:
+        """Linhas da combinação (RA, Mês, Natureza) em todos os anos, em ordem de ano."""
+        partes = []
+        for ano in self.anos:
+            particao = self.particoes[ano]
+            posicoes = particao.indice_ra_mes_natureza.get((id_ra, mes, cod_natureza))
+            if posicoes is not None:
+                partes.append(particao.denormalizado.iloc[posicoes])
+        if not partes:
+            return pd.DataFrame(columns=self._colunas())
+        return pd.concat(partes, ignore_index=True)
+
+    def quantidades(self, chaves: pd.DataFrame) -> np.ndarray:
+        """
+        Quantidade mensal atual de cada chave natural em `chaves` (0 se não
+        existir; com linhas repetidas, vale a última). Lê só as partições dos anos pedidos.
+        """
+        resultado = np.zeros(len(chaves), dtype=np.int64)
+        for ano, linhas in chaves.groupby('ano', sort=False).indices.items():
+            particao = self.particoes.get(int(ano))
+            if particao is None:
+                continue
+            base = particao.denormalizado.drop_duplicates(CHAVE_NATURAL, keep='last')
+            posicoes = pd.MultiIndex.from_frame(base[CHAVE_NATURAL]).get_indexer(
+                pd.MultiIndex.from_frame(chaves.iloc[linhas][CHAVE_NATURAL]))
+            encontrados = posicoes >= 0
+            resultado[linhas[encontrados]] = base['quantidade'].to_numpy()[posicoes[encontrados]]
+        return resultado
+
+    def _colunas(self) -> List[str]:
+        if self.vazio:
+            return COLUNAS_FATOS
+        return list(next(iter(self.particoes.values())).denormalizado.columns)
+
+    # --- Escrita (copy-on-write) ---
+
+    def com_novas_linhas(self, novas: pd.DataFrame, versao: int,
+                         assinaturas: Dict[Path, Assinatura],
+                         substituir: bool = False, diarios: Optional[Any] = None) -> 'DatasetVersion':
+        """
+        Retorna uma NOVA versão com as linhas (já desnormalizadas) aplicadas.
+        Com substituir=False as linhas são acrescentadas (append); com True,
+        linhas com a mesma chave natural têm a quantidade atualizada (upsert).
+        Apenas as partições dos anos afetados são recriadas. `diarios`, se
+        informado, substitui os fatos diários da versão.
+        """
+        particoes = dict(self.particoes)
+        for ano, df_ano in novas.groupby('ano', sort=True):
+            ano = int(ano)
+            atual = particoes.get(ano)
+            if atual is not None:
+                base = atual.denormalizado
+                if substituir:
+                    base, df_ano = aplicar_upsert(base, df_ano)
+                df_ano = pd.concat([base, df_ano], ignore_index=True)
+            elif substituir:
+                df_ano = df_ano.drop_duplicates(CHAVE_NATURAL, keep='last')
+            particoes[ano] = montar_particao(ano, df_ano)
+        nova = replace(self, versao=versao, particoes=particoes, assinaturas=assinaturas,
+                       diarios=self.diarios if diarios is None else diarios)
+
+        # Estruturas derivadas já calculadas nesta versão (modelo de previsão,
+        # cubo) passam para a nova atualizadas só com as linhas novas, em vez
+        # de serem remontadas; as que não puderem ser atualizadas ficam sob demanda
+        for nome in DERIVADAS_INCREMENTAIS:
+            derivada = self.__dict__.get(nome)
+            if derivada is not None:
+                atualizada = derivada.com_novas_linhas(novas)
+                if atualizada is not None:
+                    nova.__dict__[nome] = atualizada
+        return nova
+
+
+# ----------------------------------------------
+# FUNÇÕES AUXILIARES
+# ----------------------------------------------
+
+def aplicar_upsert(base: pd.DataFrame, novas: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Atualiza, numa cópia de `base`, a quantidade das linhas cuja chave natural
+    aparece em `novas` (mantendo a posição original, como no banco).
+    Retorna (base atualizada, linhas de `novas` que ainda não existiam).
+    """
+    novas = novas.drop_duplicates(CHAVE_NATURAL, keep='last')
+    chaves_novas = pd.MultiIndex.from_frame(novas[CHAVE_NATURAL])
+    chaves_base = pd.MultiIndex.from_frame(base[CHAVE_NATURAL])
+
+    posicoes = chaves_novas.get_indexer(chaves_base)
+    atualizadas = posicoes >= 0
+    if atualizadas.any():
+        base = base.copy()
+        base.loc[atualizadas, 'quantidade'] = novas['quantidade'].to_numpy()[posicoes[atualizadas]]
+
+    return base, novas[~chaves_novas.isin(chaves_base)]
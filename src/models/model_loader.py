@@ -1,17 +1,24 @@
 # Arquivo: src/models/model_loader.py
 
-from functools import lru_cache
-from typing import List
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Callable, Iterable, List, Optional, Tuple
 from pathlib import Path
-import pandas as pd
-
-from src.config import (
-    DATA_DIR_CONSOLIDADO,
-    DATA_DIR_NATUREZA,
-    DATA_DIR_RA,
-    DATA_DIR_COMPLETO_NORMALIZADO, # Necessário para save_new_record
-    logger
-)
+
+from src.config import settings, logger
+from src.models.arquivos import assinatura_arquivos
+
+# pandas, o dataset e os backends são importados sob demanda: importar este módulo
+# (e portanto src.api.main) não carrega pandas/numpy, o que mantém rápido o início
+# de um worker. Eles só são carregados no primeiro acesso aos dados.
+if TYPE_CHECKING:
+    import pandas as pd
+    from src.models.dataset import DatasetVersion
+    from src.models.storage import StorageBackend
+    from src.models.catalogo import CatalogoDatasets
 # from src.schemas.schemas import OcorrenciasRequest, OcorrenciasResponse --> usados no Service
 
 '''
@@ -90,60 +97,79 @@ def filter_ocorrencias(request: OcorrenciasRequest) -> List[OcorrenciasResponse]
     return response_list
 '''
 
-# Função para inserir novos dados no CSV
+# Função para inserir novos dados no armazenamento (CSV ou SQLite)
 def save_new_record(new_df: pd.DataFrame):
     """
-    Insere o DataFrame no arquivo CSV, usando o modo 'append'.
+    Persiste o DataFrame no backend configurado (append no CSV, upsert no SQLite)
+    e publica uma nova versão do dataset.
     """
+    backend = obter_backend()
     try:
-        # Escreve o novo DataFrame no arquivo
-        new_df.to_csv(
-            DATA_DIR_COMPLETO_NORMALIZADO,
-            mode='a', # Abre o arquivo em modo 'append' (adicionar ao final)
-            sep=';',
-            encoding='utf-8',
-            header=False, # Não escreve o cabeçalho novamente
-            index=False   # Não escreve o índice do DataFrame
-        )
+        # Escritores são serializados entre si; leitores nunca esperam por esta
+        # trava e uma recarga só a segura enquanto lê o armazenamento
+        with _lock_escrita:
+            gravadas = backend.salvar_registros(new_df)
 
-        '''# Limpa o cache do leitor para que a próxima leitura recarregue o dado novo
-        load_data_ocorrencias.cache_clear()'''
-        # Linhas CORRIGIDAS (deve limpar as novas funções):
-        load_denormalized_data.cache_clear()
-        load_consolidated_data.cache_clear()
+            '''# Limpa o cache do leitor para que a próxima leitura recarregue o dado novo
+            load_data_ocorrencias.cache_clear()'''
+            # Publica uma nova versão do dataset (copy-on-write por ano).
+            # Quem já fixou a versão anterior continua lendo dela.
+            _publicar_insercao(gravadas)
 
-        logger.info(f"Novo registro salvo com sucesso no CSV: {new_df.shape[0]} linhas.")
+        logger.info(f"Novo registro salvo com sucesso ({backend.nome}): {new_df.shape[0]} linhas.")
 
     except Exception as e:
-        logger.error(f"ERRO ao salvar novo registro no CSV: {e}")
+        logger.error(f"ERRO ao salvar novo registro ({backend.nome}): {e}")
         # Lançar exceção ou tratar erro
         raise
 
-#Carregar a lista de Naturezas disponíveis
-@lru_cache(maxsize=1)
-def load_naturezas() -> pd.DataFrame:
-    logger.info(f"Tentando carregar dados de naturezas do caminho: {DATA_DIR_NATUREZA}")
-    try:
-        df = pd.read_csv(
-            DATA_DIR_NATUREZA,
-            sep=';',
-            encoding='latin1')
-
-        #Padronização: minúsculo e snake_case para acesso seguro
-        df.columns = df.columns.str.lower().str.replace(' ', '_')
+# Função para mesclar um lote de linhas pela chave natural (ingestão de arquivos)
+def mesclar_registros(novas: pd.DataFrame) -> pd.DataFrame:
+    """
+    Faz upsert das linhas no backend (a última quantidade de cada chave prevalece)
+    e publica uma nova versão do dataset. Retorna as linhas mescladas.
+    """
+    backend = obter_backend()
+    with _lock_escrita:
+        mescladas = backend.mesclar_registros(novas)
+        _publicar_insercao(mescladas)
 
-        #Converte COD_NATUREZA para int para evitar problemas de comparação
-        df['cod_natureza'] = df['cod_natureza'].astype(int)
+    logger.info(f"{mescladas.shape[0]} linhas mescladas no armazenamento ({backend.nome}).")
+    return mescladas
 
-        logger.info(f"Dados de naturezas carregados com sucesso: {df.shape[0]} linhas.")
-        return df
+# Função para inserir fatos diários e atualizar os agregados
+def save_daily_records(new_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Persiste linhas diárias e atualiza, na mesma publicação, o agregado semanal
+    (em memória) e o mensal: a diferença de cada dia é somada ao mês na tabela
+    de fatos, que continua servindo os endpoints mensais. Retorna as linhas
+    mensais atualizadas.
+    """
+    backend = obter_backend()
+    # A diferença de cada dia depende do valor anterior: o dataset precisa estar
+    # carregado. A carga é disparada ANTES da trava de escrita, que ela própria
+    # usa para ler o armazenamento.
+    _versao_publicada()
+    with _lock_escrita:
+        # Sem versão publicada (ex.: escrita anterior sobre um dataset vazio),
+        # monta uma só para calcular as diferenças
+        anterior = _dataset_atual if _dataset_atual is not None else construir_dataset(versao=1)
+
+        gravadas = backend.salvar_registros_diarios(new_df)
+        diarios, diferencas = anterior.diarios.com_novas_linhas(gravadas)
+
+        # Novo total do mês = total atual + diferença dos dias
+        totais = diferencas.assign(quantidade=anterior.quantidades(diferencas) + diferencas['quantidade'].to_numpy())
+        mensais = backend.mesclar_registros(totais)
+        _publicar_insercao(mensais, diarios=diarios)
+
+    logger.info(f"{gravadas.shape[0]} linhas diárias salvas ({backend.nome}); {mensais.shape[0]} meses atualizados.")
+    return mensais
 
-    except FileNotFoundError:
-        logger.error(f"ERRO: Arquivo CSV de naturezas não encontrado em {DATA_DIR_NATUREZA}. Verifique o caminho.")
-        return pd.DataFrame()
-    except Exception as e:
-        logger.error(f"ERRO inesperado ao carregar ou processar CSV de naturezas: {e}")
-        return pd.DataFrame()
+#Carregar a lista de Naturezas disponíveis
+def load_naturezas() -> pd.DataFrame:
+    """Retorna a tabela de naturezas da versão atual do dataset."""
+    return obter_dataset().naturezas
 
 
 # Função para carregar a lista de Naturezas disponíveis
@@ -175,99 +201,371 @@ def buscar_natureza(cod_natureza: str) -> str | None:
 ----------GET OCORRÊNCIAS RA----------
 # Neste arquivo model_loader.py está contida a lógica de acesso aos dados, ou seja, aqui ocorre o carregamento dos dados
 
-# Função "_load_csv" é uma função auxiliar, responsável por carregar em cache, limpar e padronizar. É uma função REUTILIZÁVEL.
+# A leitura dos arquivos (CSV ou SQLite) fica em src/models/storage.py; aqui ficam o JOIN e as versões em memória.
 
 # Função "load_consolidated_data" é responsável por carregar a tabela de ocorrencias normalizada (dados_consolidados_normalizado.csv),
 além de garantir a conversão dos tipos para "int" a fim de garantir o funcionamento do filtro.
 '''
-# ----------------------------------------------
-# FUNÇÃO _load_csv --- Função auxiliar
-# ----------------------------------------------
-
-def _load_csv(path: Path, sep: str = ';') -> pd.DataFrame:
-    """Função auxiliar para carregar, limpar e padronizar um CSV."""
-    try:
-        df = pd.read_csv(path, sep=sep, encoding='utf-8')
-        # Limpa e Padroniza Colunas (snake_case e minúsculo)
-        df.columns = df.columns.str.lower().str.replace(' ', '_').str.strip()
-        logger.info(f"Tabela carregada com sucesso: {path.name} ({df.shape[0]} linhas)")
-        return df
-    except FileNotFoundError:
-        logger.error(f"ERRO: Arquivo não encontrado em {path}")
-        return pd.DataFrame()
-    except Exception as e:
-        logger.error(f"ERRO inesperado ao carregar {path.name}: {e}")
-        return pd.DataFrame()
-
 # ----------------------------------------------
 # FUNÇÃO load_consolidated_data --- Função de carregamento do arquivo dados_consolidados_normalizado.csv
 # ----------------------------------------------
-@lru_cache(maxsize=1)
 def load_consolidated_data() -> pd.DataFrame:
-    """
-    Carrega apenas a tabela de fatos (dados_consolidados_normalizado.csv)
-    e garante a conversão de tipos para o filtro.
-    """
-    logger.info("Iniciando carregamento da tabela consolidada.")
-    df = _load_csv(DATA_DIR_COMPLETO_NORMALIZADO)
+    """Retorna a tabela de fatos da versão atual do dataset."""
+    return obter_dataset().consolidado
 
-    if df.empty:
-        return pd.DataFrame()
-
-    # Conversão de Tipos (essencial para o filtro e estável)
-    try:
-        # As colunas após _load_csv estarão em snake_case: id_ra, ano, cod_natureza, mes, quantidade
-        df['mes'] = df['mes'].astype(int)
-        df['ano'] = df['ano'].astype(int)
-        df['id_ra'] = df['id_ra'].astype(int)
-        df['cod_natureza'] = df['cod_natureza'].astype(int)
-    except KeyError as e:
-        logger.error(f"Colunas de filtro (mes/ano/id_ra/cod_natureza) não encontradas no consolidado: {e}")
-        return pd.DataFrame()
-
-    return df
 
 # ----------------------------------------------
 # FUNÇÃO load_denormalized_data --- carrega tabelas auxiliares e executa JOIN para produzir um dataframe completo de ocorrências denormalizada
 # ----------------------------------------------
 
-@lru_cache(maxsize=1)
 def load_denormalized_data() -> pd.DataFrame:
+    """Retorna o DataFrame desnormalizado da versão atual do dataset."""
+    return obter_dataset().denormalizado
+
+
+def _montar_denormalizado(df_fatos: pd.DataFrame, df_natureza: pd.DataFrame, df_ra: pd.DataFrame) -> pd.DataFrame:
     """
-    Carrega e realiza o JOIN de Fatos, Natureza e RA para criar um
+    Realiza o JOIN de Fatos, Natureza e RA para criar um
     DataFrame completo com nomes descritivos (desnormalização).
     """
-    logger.info("Iniciando carregamento e JOIN das tabelas para desnormalização.")
+    import pandas as pd
 
-    # 1. Carregar as tabelas individuais
-    df_fatos = _load_csv(DATA_DIR_COMPLETO_NORMALIZADO)
-    df_natureza = _load_csv(DATA_DIR_NATUREZA)
-    df_ra = _load_csv(DATA_DIR_RA)
+    logger.info("Iniciando JOIN das tabelas para desnormalização.")
 
-    if df_fatos.empty or df_natureza.empty or df_ra.empty:
-        logger.error("Falha ao carregar uma ou mais tabelas.")
+    # As dimensões chegam validadas (validar_dimensoes); fatos sem linhas = versão vazia
+    if df_fatos.empty:
+        logger.warning("Tabela de fatos sem linhas.")
         return pd.DataFrame()
 
-    # 2. Ajuste de nomes para JOIN e saída
+    df_completo = _desnormalizar(df_fatos, df_natureza, df_ra)
 
-    # Ajustar a coluna de RA para o formato padronizado (snake_case do Pandas)
-    # A coluna 'Região Administrativa (RA)' se torna 'regiao_administrativa_(ra)'
-    df_ra = df_ra.rename(columns={'região_administrativa_(ra)': 'regiao_administrativa'})
+    logger.info(f"DataFrame DENORMALIZADO (com nomes) pronto: {df_completo.shape[0]} linhas.")
+    return df_completo
 
-    # 3. Execução dos JOINs
 
+def _desnormalizar(df_fatos: pd.DataFrame, df_natureza: pd.DataFrame, df_ra: pd.DataFrame) -> pd.DataFrame:
+    """Executa os JOINs de Fatos + Natureza + RA."""
     # JOIN 1: Fatos + Natureza (Chave: cod_natureza)
     df_completo = df_fatos.merge(df_natureza, on='cod_natureza', how='left')
 
     # JOIN 2: Resultado + RA (Chave: id_ra)
     df_completo = df_completo.merge(df_ra, on='id_ra', how='left')
 
-    # Cria ID sequencial para o Response
-    df_completo['id'] = range(1, len(df_completo) + 1)
-
     # Converte tipos (se necessário)
     df_completo['mes'] = df_completo['mes'].astype(int)
     df_completo['ano'] = df_completo['ano'].astype(int)
-
-    logger.info(f"DataFrame DENORMALIZADO (com nomes) pronto: {df_completo.shape[0]} linhas.")
     return df_completo
+
+
+# ----------------------------------------------
+# VERSÃO ATUAL DO DATASET --- snapshots imutáveis
+# ----------------------------------------------
+# As requisições leem sempre a referência _dataset_atual. Uma recarga ou escrita
+# monta a nova versão por completo (dados + índices) e só então substitui a
+# referência, numa única atribuição: ninguém enxerga uma atualização pela metade.
+# Cada requisição fixa (pin) a versão que leu primeiro e a usa até o fim,
+# mesmo que outra versão seja publicada no meio do caminho.
+
+_dataset_atual: Optional[DatasetVersion] = None
+# Travas, sempre tomadas nesta ordem:
+# - carga: uma montagem completa (carga inicial ou recarga) por vez;
+# - escrita: serializa as escritas no armazenamento. A montagem só a segura
+#   enquanto lê as tabelas, então um POST nunca espera o JOIN/particionamento;
+#   reentrante porque save_daily_records pode montar uma versão dentro dela;
+# - publicação: trechos curtos que trocam _dataset_atual e registram as
+#   escritas feitas durante uma montagem.
+_lock_carga = threading.Lock()
+_lock_escrita = threading.RLock()
+_lock_publicacao = threading.Lock()
+# Número de escritas já gravadas no armazenamento (sob _lock_escrita)
+_seq_escrita = 0
+# Enquanto uma montagem roda, as escritas confirmadas ficam registradas aqui para
+# serem reaplicadas à versão montada, que pode ter lido o armazenamento antes delas
+_carga_em_andamento = False
+_escritas_pendentes: List[Tuple[int, pd.DataFrame, object, dict]] = []
+_backend: Optional[StorageBackend] = None
+_catalogo: Optional[CatalogoDatasets] = None
+# Chamados a cada versão publicada por escrita ou recarga: (nova versão, linhas
+# novas desnormalizadas, ou None numa recarga completa). Rodam na thread da
+# escrita ou da recarga, fora das travas de carga e de publicação (uma escrita
+# ainda segura a de escrita, para que as versões cheguem em ordem): devem só
+# repassar o trabalho adiante.
+_ouvintes_publicacao: List[Callable[[DatasetVersion, Optional[pd.DataFrame]], None]] = []
+
+
+def obter_backend() -> StorageBackend:
+    """Backend de armazenamento configurado em STORAGE_BACKEND."""
+    global _backend
+    if _backend is None:
+        from src.models.storage import criar_backend
+        _backend = criar_backend(settings.STORAGE_BACKEND)
+    return _backend
+
+
+class _PinoDataset:
+    """Guarda a versão fixada por uma requisição (preenchida no primeiro acesso)."""
+    __slots__ = ('dataset',)
+
+    def __init__(self):
+        self.dataset: Optional[DatasetVersion] = None
+
+
+_pino_requisicao: ContextVar[Optional[_PinoDataset]] = ContextVar('pino_dataset', default=None)
+
+
+def arquivos_dados() -> Tuple[Path, ...]:
+    """Arquivos de origem do dataset (monitorados para recarga automática)."""
+    return obter_backend().arquivos_monitorados()
+
+
+def construir_dataset(versao: int) -> DatasetVersion:
+    """
+    Lê o armazenamento, valida as tabelas e monta uma nova versão completa do
+    dataset. Linhas inválidas ficam em quarentena; dados ilegíveis ou inválidos
+    demais levantam ErroCargaDados.
+    """
+    return _montar_versao(versao)[0]
+
+
+def _montar_versao(versao: int) -> Tuple[DatasetVersion, int]:
+    """
+    Monta a versão e retorna também o número da última escrita que a leitura
+    do armazenamento já contém.
+    """
+    from src.models.dataset import DatasetVersion, particionar
+    from src.models.rollups import montar_diarios
+    from src.models.validacao import registrar_relatorio, validar_dimensoes, validar_fatos
+
+    backend = obter_backend()
+    # Só a leitura das tabelas segura a trava de escrita: assim ela corresponde
+    # exatamente às escritas até _seq_escrita; validação e JOIN rodam sem ela
+    with _lock_escrita:
+        # A assinatura é lida ANTES dos arquivos: se eles mudarem durante a leitura,
+        # a próxima verificação do monitor detecta a diferença e recarrega de novo.
+        assinaturas = assinatura_arquivos(arquivos_dados())
+        lido = _seq_escrita
+        naturezas, regioes = backend.ler_naturezas(), backend.ler_regioes()
+        fatos, fatos_diarios = backend.ler_fatos(), backend.ler_fatos_diarios()
+
+    dim_natureza, dim_ra, descartadas = validar_dimensoes(naturezas, regioes)
+    # Chave natural repetida (ex.: correção acrescentada ao CSV): vale a última linha
+    consolidado, relatorio = validar_fatos(
+        fatos, dim_natureza, dim_ra,
+        origem=settings.DATASET_PADRAO,
+        dimensoes_descartadas=descartadas,
+    )
+    registrar_relatorio(relatorio)
+    denormalizado = _montar_denormalizado(consolidado, dim_natureza, dim_ra)
+    diarios = montar_diarios(fatos_diarios)
+
+    dataset = DatasetVersion(
+        versao=versao,
+        particoes=particionar(denormalizado),
+        naturezas=dim_natureza,
+        dim_natureza=dim_natureza,
+        dim_ra=dim_ra,
+        assinaturas=assinaturas,
+        diarios=diarios,
+        validacao=relatorio,
+    )
+    return dataset, lido
+
+
+def _montar_e_publicar(aceitar: Callable[[DatasetVersion], bool]) -> Optional[DatasetVersion]:
+    """
+    Monta uma versão completa (chamada com _lock_carga) e, se `aceitar` a
+    aprovar, publica-a com as escritas confirmadas durante a montagem aplicadas
+    por cima. Retorna a versão publicada ou None se a atual foi mantida.
+    """
+    global _carga_em_andamento
+    with _lock_publicacao:
+        _carga_em_andamento = True
+        _escritas_pendentes.clear()
+
+    novo, lido = None, 0
+    try:
+        novo, lido = _montar_versao(versao=0)
+        if not aceitar(novo):
+            novo = None
+    finally:
+        # Mesmo com erro na montagem, as escritas deixam de ser registradas
+        publicado = _encerrar_montagem(novo, lido)
+    return publicado
+
+
+def _encerrar_montagem(novo: Optional[DatasetVersion], lido: int) -> Optional[DatasetVersion]:
+    """Publica a versão montada (None = manter a atual) com as escritas posteriores à leitura."""
+    global _dataset_atual, _carga_em_andamento
+    from dataclasses import replace
+
+    with _lock_publicacao:
+        pendentes = [escrita for escrita in _escritas_pendentes if escrita[0] > lido]
+        _escritas_pendentes.clear()
+        _carga_em_andamento = False
+        if novo is None:
+            return None
+
+        # O número da versão é decidido na publicação: escritas podem ter
+        # publicado outras versões enquanto esta era montada
+        versao = _dataset_atual.versao + 1 if _dataset_atual is not None else 1
+        novo = replace(novo, versao=versao)
+        if pendentes and novo.vazio:
+            # Sem base para aplicá-las: a assinatura lida antes delas faz o
+            # monitor recarregar de novo, já com as linhas no armazenamento
+            logger.warning(f"{len(pendentes)} escritas feitas durante a carga de um dataset vazio; nova recarga pendente.")
+        elif pendentes:
+            for _, gravadas, diarios, assinaturas in pendentes:
+                novas = _desnormalizar(gravadas, novo.dim_natureza, novo.dim_ra)
+                novo = novo.com_novas_linhas(novas, versao=versao, assinaturas=assinaturas,
+                                             substituir=True, diarios=diarios)
+            logger.info(f"{len(pendentes)} escritas feitas durante a carga aplicadas à versão {versao}.")
+        _dataset_atual = novo
+        return novo
+
+
+def _versao_publicada() -> DatasetVersion:
+    """Versão publicada mais recente, carregando-a na primeira chamada."""
+    dataset = _dataset_atual
+    if dataset is not None:
+        return dataset
+
+    # Apenas uma thread faz a carga inicial; as demais aguardam o resultado
+    with _lock_carga:
+        if _dataset_atual is None:
+            _montar_e_publicar(lambda novo: True)
+        return _dataset_atual
+
+
+def obter_dataset() -> DatasetVersion:
+    """
+    Retorna a versão do dataset desta requisição.
+    Dentro de fixar_dataset(), todas as chamadas retornam a mesma versão;
+    fora dele, retorna a versão publicada mais recente.
+    """
+    pino = _pino_requisicao.get()
+    if pino is None:
+        return _versao_publicada()
+    if pino.dataset is None:
+        pino.dataset = _versao_publicada()
+    return pino.dataset
+
+
+@contextmanager
+def fixar_dataset():
+    """
+    Fixa uma única versão do dataset para tudo o que rodar dentro do bloco
+    (inclusive no threadpool, que herda o contexto). A versão só é escolhida
+    no primeiro acesso, então rotas que não leem dados não disparam a carga.
+    """
+    token = _pino_requisicao.set(_PinoDataset())
+    try:
+        yield
+    finally:
+        _pino_requisicao.reset(token)
+
+
+def registrar_ouvinte(ouvinte: Callable[[DatasetVersion, Optional[pd.DataFrame]], None]):
+    """Registra uma função chamada a cada nova versão publicada."""
+    if ouvinte not in _ouvintes_publicacao:
+        _ouvintes_publicacao.append(ouvinte)
+
+
+def _notificar_publicacao(dataset: DatasetVersion, novas: Optional[pd.DataFrame]):
+    for ouvinte in list(_ouvintes_publicacao):
+        try:
+            ouvinte(dataset, novas)
+        except Exception as e:
+            # Um ouvinte com problema nunca desfaz nem atrasa a escrita
+            logger.error(f"ERRO ao notificar nova versão do dataset: {e}")
+
+
+def obter_catalogo() -> CatalogoDatasets:
+    """Catálogo dos datasets adicionais (partições sob demanda)."""
+    global _catalogo
+    if _catalogo is None:
+        from src.models.catalogo import criar_catalogo
+        _catalogo = criar_catalogo()
+    return _catalogo
+
+
+def obter_dataset_nomeado(nome: Optional[str], anos: Optional[Iterable[int]] = None) -> DatasetVersion:
+    """
+    Roteia a consulta para o dataset pedido. Sem nome (ou com DATASET_PADRAO),
+    é a versão fixada do dataset principal; os demais vêm do catálogo, só com
+    as partições de `anos` (todas, se None). KeyError se o dataset não existir.
+    """
+    if nome is None or nome == settings.DATASET_PADRAO:
+        return obter_dataset()
+    return obter_catalogo().vista(nome, anos)
+
+
+def dataset_carregado() -> Optional[DatasetVersion]:
+    """Retorna a versão publicada sem disparar a carga (None se ainda não carregou)."""
+    return _dataset_atual
+
+
+def recarregar_dataset() -> DatasetVersion:
+    """
+    Monta uma nova versão a partir dos arquivos e a publica.
+    Se a nova leitura falhar ou vier vazia (arquivo corrompido ou em cópia),
+    a versão atual é mantida para não derrubar as consultas. Escritas feitas
+    durante a montagem não esperam por ela e entram na versão publicada.
+    """
+    from src.models.validacao import ErroCargaDados
+
+    def aceitar(novo: DatasetVersion) -> bool:
+        anterior = _dataset_atual
+        if novo.vazio and anterior is not None and not anterior.vazio:
+            logger.error("Recarga do dataset resultou vazia; mantendo a versão %s.", anterior.versao)
+            return False
+        return True
+
+    with _lock_carga:
+        try:
+            novo = _montar_e_publicar(aceitar)
+        except ErroCargaDados as e:
+            if _dataset_atual is None:
+                raise
+            logger.error(f"Recarga do dataset falhou ({e}); mantendo a versão {_dataset_atual.versao}.")
+            return _dataset_atual
+        if novo is None:
+            return _dataset_atual
+
+    # Os ouvintes são avisados depois de liberada a trava de carga
+    _notificar_publicacao(novo, None)
+    logger.info(f"Dataset versão {novo.versao} publicado ({novo.consolidado.shape[0]} linhas).")
+    return novo
+
+
+def _publicar_insercao(gravadas: pd.DataFrame, diarios=None):
+    """
+    Publica uma versão com as linhas recém-gravadas (chamada com _lock_escrita).
+    Só as partições dos anos afetados são copiadas; o resto é compartilhado.
+    Uma linha com chave natural já existente substitui a anterior (vale a
+    última, como na carga). Se uma montagem estiver em andamento, a escrita também é registrada para
+    ser reaplicada à versão que ela vai publicar.
+    """
+    global _dataset_atual, _seq_escrita
+    _seq_escrita += 1
+    assinaturas = assinatura_arquivos(arquivos_dados())
+
+    with _lock_publicacao:
+        if _carga_em_andamento:
+            _escritas_pendentes.append((_seq_escrita, gravadas, diarios, assinaturas))
+
+        anterior = _dataset_atual
+        if anterior is None or anterior.vazio:
+            # Nada em memória: a próxima leitura carrega o arquivo já atualizado
+            _dataset_atual = None
+            return
+
+        novas = _desnormalizar(gravadas, anterior.dim_natureza, anterior.dim_ra)
+        _dataset_atual = publicado = anterior.com_novas_linhas(
+            novas,
+            versao=anterior.versao + 1,
+            assinaturas=assinaturas,
+            substituir=True,
+            diarios=diarios,
+        )
+
+    _notificar_publicacao(publicado, novas)
@@ -0,0 +1,185 @@
+# Arquivo: src/models/previsao.py
+# Modelo sazonal com tendência, ajustado de uma vez para todas as séries (RA, natureza)
+
+from dataclasses import dataclass, field, replace
+from functools import cached_property
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from src.models.dataset import CHAVE_NATURAL
+
+# Colunas do desenho: intercepto, tendência (meses) e 11 indicadoras de mês (fev..dez)
+N_COEFICIENTES = 13
+# Meses previstos à frente (o trimestre é a soma deles)
+HORIZONTE = 3
+
+
+def _mes_absoluto(ano: np.ndarray, mes: np.ndarray) -> np.ndarray:
+    return ano.astype(np.int64) * 12 + (mes.astype(np.int64) - 1)
+
+
+def _desenho(t: np.ndarray, mes: np.ndarray) -> np.ndarray:
+    """Linhas da matriz de desenho para os instantes `t` (meses desde a origem)."""
+    x = np.zeros((len(t), N_COEFICIENTES))
+    x[:, 0] = 1.0
+    x[:, 1] = t
+    com_indicadora = mes > 1
+    # Mês m (2..12) ocupa a coluna m
+    x[np.flatnonzero(com_indicadora), mes[com_indicadora]] = 1.0
+    return x
+
+
+def _resolver(xtx: np.ndarray, xty: np.ndarray) -> np.ndarray:
+    """
+    Mínimos quadrados em lote: (S, p, p) x (S, p) -> (S, p).
+    A pseudo-inversa dá a solução de norma mínima para séries curtas
+    (menos observações do que coeficientes) sem tratamento especial.
+    """
+    if len(xtx) == 0:
+        return np.zeros((0, N_COEFICIENTES))
+    return np.einsum('spq,sq->sp', np.linalg.pinv(xtx), xty)
+
+
+# ----------------------------------------------
+# CLASSE ModeloSazonal --- Coeficientes de todas as séries
+# ----------------------------------------------
+
+@dataclass(frozen=True)
+class ModeloSazonal:
+    """
+    y(t) = a + b*t + s(mês), por mínimos quadrados, com uma linha por série.
+    Guarda as estatísticas suficientes (X'X e X'y de cada série) em vez de
+    refazer o ajuste: um mês novo só soma sua contribuição nas séries tocadas.
+    Meses sem linha na tabela de fatos são tratados como não observados
+    (os zeros vêm explícitos nos dados).
+    """
+    origem: int                 # mês absoluto (ano*12 + mes-1) do primeiro dado
+    fim: int                    # mês absoluto do último dado de qualquer série
+    chaves: np.ndarray          # (S, 2): id_ra, cod_natureza
+    observado: np.ndarray = field(repr=False)   # (S, T) quantidades, NaN se ausente
+    xtx: np.ndarray = field(repr=False)         # (S, p, p)
+    xty: np.ndarray = field(repr=False)         # (S, p)
+    coeficientes: np.ndarray = field(repr=False)  # (S, p)
+
+    @property
+    def n_series(self) -> int:
+        return len(self.chaves)
+
+    # --- Previsões (calculadas uma vez por modelo) ---
+
+    @cached_property
+    def previsoes(self) -> pd.DataFrame:
+        """
+        Próximo mês e próximo trimestre após `fim` para todas as séries,
+        com a tendência mensal e a média histórica do mês previsto.
+        """
+        futuros = np.arange(self.fim + 1, self.fim + 1 + HORIZONTE)
+        meses = futuros % 12 + 1
+        x_futuro = _desenho(futuros - self.origem, meses)            # (H, p)
+        previstos = np.clip(self.coeficientes @ x_futuro.T, 0, None)  # (S, H)
+
+        # Média ingênua do mesmo mês nos anos anteriores (a base do /ocorrencias_media)
+        colunas_mes = np.flatnonzero((np.arange(self.origem, self.fim + 1) % 12 + 1) == meses[0])
+        recorte = self.observado[:, colunas_mes]
+        contagem = (~np.isnan(recorte)).sum(axis=1)
+        soma = np.nansum(recorte, axis=1)
+        media_mes = np.divide(soma, contagem, out=np.full(len(soma), np.nan), where=contagem > 0)
+
+        return pd.DataFrame({
+            'id_ra': self.chaves[:, 0],
+            'cod_natureza': self.chaves[:, 1],
+            'ano': int(futuros[0] // 12),
+            'mes': int(meses[0]),
+            'previsao_mes': previstos[:, 0],
+            'previsao_trimestre': previstos.sum(axis=1),
+            'tendencia_mensal': self.coeficientes[:, 1],
+            'media_historica_mes': media_mes,
+        })
+
+    # --- Atualização incremental ---
+
+    def com_novas_linhas(self, novas: pd.DataFrame) -> Optional['ModeloSazonal']:
+        """
+        Retorna um NOVO modelo com as linhas aplicadas (a última quantidade de
+        cada chave prevalece, como no ajuste completo). Só os coeficientes das
+        séries tocadas são recalculados. Retorna None se alguma linha for
+        anterior à origem; nesse caso o chamador refaz o ajuste completo.
+        """
+        if novas.empty:
+            return self
+        novas = novas.drop_duplicates(CHAVE_NATURAL, keep='last')
+        absolutos = _mes_absoluto(novas['ano'].to_numpy(), novas['mes'].to_numpy())
+        if absolutos.min() < self.origem:
+            return None
+
+        # Séries novas entram no fim das matrizes
+        pares = novas[['id_ra', 'cod_natureza']].to_numpy(dtype=np.int64)
+        procuradas = pd.MultiIndex.from_arrays([pares[:, 0], pares[:, 1]])
+        posicoes = pd.MultiIndex.from_arrays([self.chaves[:, 0], self.chaves[:, 1]]).get_indexer(procuradas)
+        ineditas = np.unique(pares[posicoes < 0], axis=0)
+        chaves = self.chaves
+        if len(ineditas):
+            chaves = np.vstack([self.chaves, ineditas])
+            posicoes = pd.MultiIndex.from_arrays([chaves[:, 0], chaves[:, 1]]).get_indexer(procuradas)
+
+        # Cópias (a versão anterior do modelo continua válida para quem a fixou)
+        fim = max(self.fim, int(absolutos.max()))
+        n_novas_series = len(ineditas)
+        observado = np.pad(self.observado, ((0, n_novas_series), (0, fim - self.fim)), constant_values=np.nan)
+        xtx = np.pad(self.xtx, ((0, n_novas_series), (0, 0), (0, 0)))
+        xty = np.pad(self.xty, ((0, n_novas_series), (0, 0)))
+        coeficientes = np.pad(self.coeficientes, ((0, n_novas_series), (0, 0)))
+
+        t = absolutos - self.origem
+        y = novas['quantidade'].to_numpy(dtype=float)
+        anterior = observado[posicoes, t]
+        ja_observado = ~np.isnan(anterior)
+        x = _desenho(t, novas['mes'].to_numpy())
+
+        # Observação nova entra em X'X; X'y recebe só a diferença de quantidade
+        np.add.at(xtx, posicoes[~ja_observado], np.einsum('np,nq->npq', x[~ja_observado], x[~ja_observado]))
+        np.add.at(xty, posicoes, x * (y - np.where(ja_observado, anterior, 0.0))[:, None])
+        observado[posicoes, t] = y
+
+        tocadas = np.unique(posicoes)
+        coeficientes[tocadas] = _resolver(xtx[tocadas], xty[tocadas])
+
+        return replace(self, fim=fim, chaves=chaves, observado=observado, xtx=xtx, xty=xty,
+                       coeficientes=coeficientes)
+
+
+def ajustar_modelo(fatos: pd.DataFrame) -> Optional[ModeloSazonal]:
+    """
+    Ajuste completo, vetorizado: monta a matriz (séries x meses) e resolve
+    todas as regressões com operações em lote (sem laço por série).
+    """
+    if fatos.empty:
+        return None
+    fatos = fatos.drop_duplicates(CHAVE_NATURAL, keep='last')
+    absolutos = _mes_absoluto(fatos['ano'].to_numpy(), fatos['mes'].to_numpy())
+    origem, fim = int(absolutos.min()), int(absolutos.max())
+
+    pares = fatos[['id_ra', 'cod_natureza']].to_numpy(dtype=np.int64)
+    chaves, linha = np.unique(pares, axis=0, return_inverse=True)
+    linha = linha.reshape(-1)
+
+    observado = np.full((len(chaves), fim - origem + 1), np.nan)
+    observado[linha, absolutos - origem] = fatos['quantidade'].to_numpy(dtype=float)
+
+    t = np.arange(fim - origem + 1)
+    x = _desenho(t, (t + origem) % 12 + 1)          # (T, p), o mesmo para todas as séries
+    mascara = (~np.isnan(observado)).astype(float)  # (S, T)
+    xtx = np.einsum('st,tp,tq->spq', mascara, x, x, optimize=True)
+    xty = np.nan_to_num(observado) @ x
+
+    return ModeloSazonal(
+        origem=origem,
+        fim=fim,
+        chaves=chaves,
+        observado=observado,
+        xtx=xtx,
+        xty=xty,
+        coeficientes=_resolver(xtx, xty),
+    )
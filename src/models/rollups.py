@@ -0,0 +1,128 @@
+# Arquivo: src/models/rollups.py
+# Fatos diários e seus agregados (semana ISO e mês), mantidos de forma incremental
+
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Dict, Mapping, Tuple
+
+import pandas as pd
+
+from src.models.dataset import CHAVE_NATURAL, COLUNAS_FATOS
+
+# Colunas da tabela de fatos diários (após padronização para snake_case)
+COLUNAS_DIARIAS = ['id_ra', 'data', 'cod_natureza', 'quantidade']
+# Chave natural de uma linha diária
+CHAVE_DIARIA = ['id_ra', 'data', 'cod_natureza']
+# Chave do agregado semanal (ano e semana ISO: a semana 1 pode começar em dezembro)
+CHAVE_SEMANAL = ['id_ra', 'ano_iso', 'semana', 'cod_natureza']
+
+
+def padronizar_diarios(df: pd.DataFrame) -> pd.DataFrame:
+    """Tipos da tabela diária; a última linha de cada chave prevalece."""
+    if df.empty:
+        return pd.DataFrame({
+            'id_ra': pd.Series(dtype='int64'),
+            'data': pd.Series(dtype='datetime64[ns]'),
+            'cod_natureza': pd.Series(dtype='int64'),
+            'quantidade': pd.Series(dtype='int64'),
+        })
+    df = df[COLUNAS_DIARIAS].astype({'id_ra': int, 'cod_natureza': int, 'quantidade': int})
+    df['data'] = pd.to_datetime(df['data']).dt.normalize()
+    return df.drop_duplicates(CHAVE_DIARIA, keep='last').reset_index(drop=True)
+
+
+def _chaves_semanais(df: pd.DataFrame) -> pd.DataFrame:
+    iso = df['data'].dt.isocalendar()
+    return pd.DataFrame({
+        'id_ra': df['id_ra'].to_numpy(),
+        'ano_iso': iso['year'].to_numpy(dtype='int64'),
+        'semana': iso['week'].to_numpy(dtype='int64'),
+        'cod_natureza': df['cod_natureza'].to_numpy(),
+    })
+
+
+def _somar(chaves: pd.DataFrame, quantidades, nomes) -> pd.Series:
+    agrupado = chaves.assign(quantidade=quantidades).groupby(nomes, sort=True)['quantidade'].sum()
+    return agrupado.astype('int64')
+
+
+# ----------------------------------------------
+# CLASSE FatosDiarios --- Linhas diárias e agregado semanal
+# ----------------------------------------------
+
+@dataclass(frozen=True)
+class FatosDiarios:
+    """
+    Quantidades diárias por ano (Series indexadas pela chave diária) e o
+    agregado semanal. O agregado mensal é a própria tabela de fatos mensal:
+    cada inserção diária soma sua diferença no mês correspondente.
+    Como no DatasetVersion, uma inserção só copia o ano afetado.
+    """
+    por_ano: Mapping[int, pd.Series] = field(default_factory=dict, repr=False)
+    semanal: pd.Series = field(default_factory=lambda: pd.Series(dtype='int64'), repr=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, 'por_ano', MappingProxyType(dict(self.por_ano)))
+
+    @property
+    def vazio(self) -> bool:
+        return len(self.por_ano) == 0
+
+    @property
+    def linhas(self) -> int:
+        return sum(len(serie) for serie in self.por_ano.values())
+
+    def com_novas_linhas(self, novas: pd.DataFrame) -> Tuple['FatosDiarios', pd.DataFrame]:
+        """
+        Aplica linhas diárias (a última quantidade de cada chave prevalece) e
+        retorna (novos fatos diários, diferença por mês no formato da tabela de
+        fatos mensal). A diferença desconta o valor anterior do mesmo dia, então
+        reenviar um dia corrigido não soma em dobro.
+        """
+        novas = padronizar_diarios(novas)
+        if novas.empty:
+            return self, pd.DataFrame(columns=COLUNAS_FATOS)
+
+        por_ano: Dict[int, pd.Series] = dict(self.por_ano)
+        anteriores = pd.Series(0, index=novas.index, dtype='int64')
+        for ano, df_ano in novas.groupby(novas['data'].dt.year, sort=True):
+            ano = int(ano)
+            indice = pd.MultiIndex.from_frame(df_ano[CHAVE_DIARIA])
+            serie_nova = pd.Series(df_ano['quantidade'].to_numpy(), index=indice)
+            atual = por_ano.get(ano)
+            if atual is None:
+                por_ano[ano] = serie_nova.sort_index()
+                continue
+            anteriores.loc[df_ano.index] = atual.reindex(indice, fill_value=0).to_numpy()
+            por_ano[ano] = serie_nova.combine_first(atual).astype('int64')
+
+        diferencas = novas['quantidade'].to_numpy() - anteriores.to_numpy()
+
+        chaves_semana = _chaves_semanais(novas)
+        semanal = _somar(chaves_semana, diferencas, CHAVE_SEMANAL)
+        if not self.semanal.empty:
+            semanal = self.semanal.add(semanal, fill_value=0).astype('int64')
+
+        chaves_mes = pd.DataFrame({
+            'id_ra': novas['id_ra'].to_numpy(),
+            'ano': novas['data'].dt.year.to_numpy(dtype='int64'),
+            'mes': novas['data'].dt.month.to_numpy(dtype='int64'),
+            'cod_natureza': novas['cod_natureza'].to_numpy(),
+        })
+        mensal = _somar(chaves_mes, diferencas, CHAVE_NATURAL).reset_index()
+
+        return FatosDiarios(por_ano=por_ano, semanal=semanal), mensal[COLUNAS_FATOS]
+
+
+def montar_diarios(df: pd.DataFrame) -> FatosDiarios:
+    """Monta os fatos diários e o agregado semanal a partir da tabela completa."""
+    df = padronizar_diarios(df)
+    if df.empty:
+        return FatosDiarios()
+    por_ano = {
+        int(ano): pd.Series(df_ano['quantidade'].to_numpy(),
+                            index=pd.MultiIndex.from_frame(df_ano[CHAVE_DIARIA])).sort_index()
+        for ano, df_ano in df.groupby(df['data'].dt.year, sort=True)
+    }
+    semanal = _somar(_chaves_semanais(df), df['quantidade'].to_numpy(), CHAVE_SEMANAL)
+    return FatosDiarios(por_ano=por_ano, semanal=semanal)
@@ -0,0 +1,477 @@
+# Arquivo: src/models/storage.py
+# Backends de armazenamento da tabela de fatos e das dimensões (CSV e SQLite)
+
+import argparse
+import os
+import sqlite3
+from abc import ABC, abstractmethod
+from contextlib import closing
+from pathlib import Path
+from typing import Iterable, Optional, Tuple
+
+import pandas as pd
+
+from src.config import (
+    settings,
+    DATA_DIR_CONSOLIDADO,
+    DATA_DIR_NATUREZA,
+    DATA_DIR_RA,
+    DATA_DIR_COMPLETO_NORMALIZADO,
+    DATA_DIR_SQLITE,
+    DATA_DIR_DIARIO,
+    logger,
+    setup_logging
+)
+from src.models.dataset import CHAVE_NATURAL, COLUNAS_FATOS
+from src.models.rollups import COLUNAS_DIARIAS, padronizar_diarios
+from src.models.validacao import ErroCargaDados
+
+
+# ----------------------------------------------
+# FUNÇÕES AUXILIARES DE PADRONIZAÇÃO
+# ----------------------------------------------
+
+def padronizar_colunas(df: pd.DataFrame) -> pd.DataFrame:
+    """Limpa e Padroniza Colunas (snake_case e minúsculo)."""
+    df = df.copy()
+    df.columns = df.columns.str.lower().str.replace(' ', '_').str.strip()
+    return df
+
+
+def converter_tipos_fatos(df: pd.DataFrame) -> pd.DataFrame:
+    """Conversão de Tipos das colunas-chave (essencial para o filtro e estável)."""
+    return df.astype({'mes': int, 'ano': int, 'id_ra': int, 'cod_natureza': int})
+
+
+# ----------------------------------------------
+# FUNÇÃO _load_csv --- Função auxiliar
+# ----------------------------------------------
+# Responsável por carregar, limpar e padronizar. É uma função REUTILIZÁVEL.
+
+def _load_csv(path: Path, sep: str = ';') -> pd.DataFrame:
+    """
+    Função auxiliar para carregar, limpar e padronizar um CSV.
+    Um arquivo ausente ou ilegível é um ErroCargaDados: devolver uma tabela
+    vazia faria a API responder 404 para tudo em vez de acusar o problema.
+    """
+    try:
+        df = pd.read_csv(path, sep=sep, encoding='utf-8')
+    except FileNotFoundError as e:
+        logger.error(f"ERRO: Arquivo não encontrado em {path}")
+        raise ErroCargaDados(f"Arquivo não encontrado: {path}") from e
+    except Exception as e:
+        logger.error(f"ERRO inesperado ao carregar {path.name}: {e}")
+        raise ErroCargaDados(f"Falha ao ler {path.name}: {e}") from e
+    df = padronizar_colunas(df)
+    logger.info(f"Tabela carregada com sucesso: {path.name} ({df.shape[0]} linhas)")
+    return df
+
+
+# ----------------------------------------------
+# CLASSE StorageBackend --- Interface comum
+# ----------------------------------------------
+
+class StorageBackend(ABC):
+    """
+    Interface de persistência usada pelo model_loader.
+    Todos os métodos de leitura devolvem DataFrames com colunas em snake_case
+    (id_ra, ano, cod_natureza, mes, quantidade / cod_natureza, natureza /
+    id_ra, regiao_administrativa).
+    """
+    nome: str = "base"
+    # True quando salvar_registros substitui linhas com a mesma chave natural (upsert);
+    # False quando apenas acrescenta (append). Na leitura vale sempre a última
+    # linha de cada chave (validar_fatos), então o dataset é o mesmo nos dois modos.
+    substitui_duplicados: bool = False
+
+    @abstractmethod
+    def ler_fatos(self, anos: Optional[Iterable[int]] = None) -> pd.DataFrame:
+        """Tabela de fatos completa, ou apenas dos anos informados."""
+
+    @abstractmethod
+    def ler_naturezas(self) -> pd.DataFrame:
+        """Tabela de dimensão de naturezas (cod_natureza, natureza)."""
+
+    @abstractmethod
+    def ler_regioes(self) -> pd.DataFrame:
+        """Tabela de dimensão de RAs (id_ra, regiao_administrativa)."""
+
+    @abstractmethod
+    def salvar_registros(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Persiste novas linhas de fatos e as devolve padronizadas."""
+
+    @abstractmethod
+    def mesclar_registros(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Mescla linhas de fatos pela chave natural (upsert), independentemente do
+        modo de salvar_registros. Devolve as linhas padronizadas e sem repetição.
+        """
+
+    @abstractmethod
+    def ler_fatos_diarios(self) -> pd.DataFrame:
+        """Tabela de fatos diários (id_ra, data, cod_natureza, quantidade), sem chaves repetidas."""
+
+    @abstractmethod
+    def salvar_registros_diarios(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Persiste linhas diárias (a última quantidade de cada chave prevalece
+        na leitura) e as devolve padronizadas.
+        """
+
+    def consultar_fatos(self, id_ra: Optional[int] = None, ano: Optional[int] = None,
+                        mes: Optional[int] = None, cod_natureza: Optional[int] = None) -> pd.DataFrame:
+        """Linhas de fatos que atendem aos filtros informados (a última de cada chave natural)."""
+        df = self.ler_fatos(anos=[ano] if ano is not None else None)
+        if df.empty:
+            return df
+        df = df.drop_duplicates(CHAVE_NATURAL, keep='last')
+        filtros = {'id_ra': id_ra, 'mes': mes, 'cod_natureza': cod_natureza}
+        for coluna, valor in filtros.items():
+            if valor is not None:
+                df = df[df[coluna] == valor]
+        return df
+
+    def arquivos_monitorados(self) -> Tuple[Path, ...]:
+        """Arquivos cuja alteração externa deve disparar a recarga do dataset."""
+        return ()
+
+
+# ----------------------------------------------
+# CLASSE CsvBackend --- Arquivos CSV lidos com pandas
+# ----------------------------------------------
+
+class CsvBackend(StorageBackend):
+    nome = "csv"
+    substitui_duplicados = False
+
+    def __init__(self, fatos: Path, naturezas: Path, regioes: Path,
+                 monitorados_extras: Iterable[Path] = (), diarios: Optional[Path] = None):
+        self.fatos = Path(fatos)
+        self.naturezas = Path(naturezas)
+        self.regioes = Path(regioes)
+        # Sem caminho explícito, a tabela diária fica ao lado da tabela de fatos
+        self.diarios = Path(diarios) if diarios is not None else self.fatos.with_name(settings.CSV_NAME_DIARIO)
+        self._monitorados_extras = tuple(Path(p) for p in monitorados_extras)
+
+    def ler_fatos(self, anos: Optional[Iterable[int]] = None) -> pd.DataFrame:
+        """
+        Carrega a tabela de fatos (dados_consolidados_normalizado.csv)
+        e garante a conversão de tipos para o filtro.
+        """
+        logger.info("Iniciando carregamento da tabela consolidada.")
+        df = _load_csv(self.fatos)
+
+        if df.empty:
+            return df
+
+        try:
+            # As colunas após _load_csv estarão em snake_case: id_ra, ano, cod_natureza, mes, quantidade
+            df = converter_tipos_fatos(df)
+        except KeyError as e:
+            logger.error(f"Colunas de filtro (mes/ano/id_ra/cod_natureza) não encontradas no consolidado: {e}")
+            raise ErroCargaDados(f"Colunas ausentes no consolidado: {e}") from e
+        except (ValueError, TypeError):
+            # Valores vazios ou não numéricos: as linhas seguem como lidas e a
+            # validação da carga (src.models.validacao) as põe em quarentena
+            logger.warning("Consolidado com valores não numéricos nas colunas-chave.")
+
+        if anos is not None:
+            df = df[df['ano'].isin(list(anos))].reset_index(drop=True)
+        return df
+
+    def ler_naturezas(self) -> pd.DataFrame:
+        logger.info(f"Tentando carregar dados de naturezas do caminho: {self.naturezas}")
+        df = _load_csv(self.naturezas)
+        if df.empty:
+            return df
+        try:
+            #Converte COD_NATUREZA para int para evitar problemas de comparação
+            df['cod_natureza'] = df['cod_natureza'].astype(int)
+        except KeyError as e:
+            logger.error(f"ERRO inesperado ao processar CSV de naturezas: {e}")
+            raise ErroCargaDados(f"Coluna ausente na tabela de naturezas: {e}") from e
+        except ValueError:
+            # Códigos inválidos são descartados por validar_dimensoes na carga
+            logger.warning("Tabela de naturezas com códigos não numéricos.")
+        return df
+
+    def ler_regioes(self) -> pd.DataFrame:
+        df = _load_csv(self.regioes)
+        # Ajustar a coluna de RA para o formato padronizado (snake_case do Pandas)
+        # A coluna 'Região Administrativa (RA)' se torna 'regiao_administrativa_(ra)'
+        return df.rename(columns={'região_administrativa_(ra)': 'regiao_administrativa'})
+
+    def salvar_registros(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Insere o DataFrame no arquivo CSV, usando o modo 'append'."""
+        # Sem cabeçalho, a ordem das colunas precisa ser a mesma do arquivo
+        cabecalho = padronizar_colunas(pd.read_csv(self.fatos, sep=';', nrows=0)).columns
+        padronizado = converter_tipos_fatos(padronizar_colunas(df))
+
+        padronizado[list(cabecalho)].to_csv(
+            self.fatos,
+            mode='a', # Abre o arquivo em modo 'append' (adicionar ao final)
+            sep=';',
+            encoding='utf-8',
+            header=False, # Não escreve o cabeçalho novamente
+            index=False   # Não escreve o índice do DataFrame
+        )
+        return padronizado[COLUNAS_FATOS]
+
+    def mesclar_registros(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Acrescenta as linhas ao final do arquivo (append), sem reescrever as
+        demais: na carga, a última linha de cada chave natural vale
+        (validar_fatos), então a linha nova substitui a anterior. O custo é o
+        do lote, não o da tabela.
+        """
+        novas = converter_tipos_fatos(padronizar_colunas(df))[COLUNAS_FATOS]
+        novas = novas.drop_duplicates(CHAVE_NATURAL, keep='last')
+        return self.salvar_registros(novas)
+
+    def ler_fatos_diarios(self) -> pd.DataFrame:
+        if not self.diarios.exists():
+            # Ainda não chegou nenhum dado diário
+            return padronizar_diarios(pd.DataFrame())
+        df = _load_csv(self.diarios)
+        try:
+            return padronizar_diarios(df)
+        except (KeyError, ValueError) as e:
+            logger.error(f"ERRO inesperado ao processar CSV de fatos diários: {e}")
+            raise ErroCargaDados(f"Tabela de fatos diários inválida: {e}") from e
+
+    def salvar_registros_diarios(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Acrescenta as linhas ao CSV diário (append); na leitura, a última linha de cada chave vale."""
+        padronizado = padronizar_diarios(padronizar_colunas(df))
+        saida = padronizado.assign(data=padronizado['data'].dt.strftime('%Y-%m-%d'))
+        saida.columns = [coluna.upper() for coluna in COLUNAS_DIARIAS]
+        saida.to_csv(
+            self.diarios,
+            mode='a',
+            sep=';',
+            encoding='utf-8',
+            header=not self.diarios.exists(),  # cabeçalho só na criação do arquivo
+            index=False,
+        )
+        return padronizado
+
+    def arquivos_monitorados(self) -> Tuple[Path, ...]:
+        return tuple(dict.fromkeys([*self._monitorados_extras, self.fatos, self.naturezas, self.regioes, self.diarios]))
+
+
+# ----------------------------------------------
+# CLASSE SqliteBackend --- Banco embutido com índice composto
+# ----------------------------------------------
+
+ESQUEMA_SQLITE = """
+CREATE TABLE IF NOT EXISTS fatos (
+    id_ra INTEGER NOT NULL,
+    ano INTEGER NOT NULL,
+    cod_natureza INTEGER NOT NULL,
+    mes INTEGER NOT NULL,
+    quantidade INTEGER NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_fatos_chave ON fatos (id_ra, ano, mes, cod_natureza);
+CREATE INDEX IF NOT EXISTS idx_fatos_ano ON fatos (ano);
+CREATE TABLE IF NOT EXISTS fatos_diarios (
+    id_ra INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    cod_natureza INTEGER NOT NULL,
+    quantidade INTEGER NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_fatos_diarios_chave ON fatos_diarios (id_ra, data, cod_natureza);
+CREATE TABLE IF NOT EXISTS naturezas (
+    cod_natureza INTEGER PRIMARY KEY,
+    natureza TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS regioes (
+    id_ra INTEGER PRIMARY KEY,
+    regiao_administrativa TEXT NOT NULL
+);
+"""
+
+SQL_UPSERT_FATO = """
+INSERT INTO fatos (id_ra, ano, cod_natureza, mes, quantidade)
+VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (id_ra, ano, mes, cod_natureza) DO UPDATE SET quantidade = excluded.quantidade
+"""
+
+SQL_UPSERT_FATO_DIARIO = """
+INSERT INTO fatos_diarios (id_ra, data, cod_natureza, quantidade)
+VALUES (?, ?, ?, ?)
+ON CONFLICT (id_ra, data, cod_natureza) DO UPDATE SET quantidade = excluded.quantidade
+"""
+
+
+class SqliteBackend(StorageBackend):
+    """
+    Tabela de fatos em SQLite com índice único (id_ra, ano, mes, cod_natureza).
+    Consultas por chave e upserts usam o índice, sem varrer a tabela em memória.
+    """
+    nome = "sqlite"
+    substitui_duplicados = True
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._esquema_pronto = False
+        if self.path.exists():
+            with closing(self._conectar()):
+                pass
+
+    def _conectar(self) -> sqlite3.Connection:
+        # Uma conexão por operação: conexões sqlite3 não são compartilhadas entre threads
+        con = sqlite3.connect(self.path)
+        if not self._esquema_pronto:
+            # Uma vez por backend (na criação, ou na primeira escrita se o banco ainda não existia)
+            con.executescript(ESQUEMA_SQLITE)
+            # Sem estatísticas, o planejador prefere idx_fatos_ano ao índice da chave
+            if con.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'").fetchone() is None:
+                con.execute("ANALYZE")
+                con.commit()
+            self._esquema_pronto = True
+        return con
+
+    def _ler_sql(self, sql: str, parametros: tuple = ()) -> pd.DataFrame:
+        if not self.path.exists():
+            logger.error(f"ERRO: Banco SQLite não encontrado em {self.path}")
+            raise ErroCargaDados(f"Banco SQLite não encontrado: {self.path}")
+        with closing(self._conectar()) as con:
+            return pd.read_sql_query(sql, con, params=parametros)
+
+    def ler_fatos(self, anos: Optional[Iterable[int]] = None) -> pd.DataFrame:
+        sql = "SELECT id_ra, ano, cod_natureza, mes, quantidade FROM fatos"
+        parametros: tuple = ()
+        if anos is not None:
+            anos = [int(ano) for ano in anos]
+            sql += f" WHERE ano IN ({', '.join('?' * len(anos))})"
+            parametros = tuple(anos)
+        df = self._ler_sql(sql + " ORDER BY rowid", parametros)
+        logger.info(f"Tabela de fatos carregada do SQLite: {df.shape[0]} linhas.")
+        return df
+
+    @staticmethod
+    def montar_consulta(base: str, prefixo: str = "", **filtros: Optional[int]) -> Tuple[str, tuple]:
+        """SQL filtrado por igualdade nas colunas da chave (as informadas), na ordem de inserção."""
+        informados = {coluna: valor for coluna, valor in filtros.items() if valor is not None}
+        sql = base.strip()
+        if informados:
+            sql += " WHERE " + " AND ".join(f"{prefixo}{coluna} = ?" for coluna in informados)
+        return sql + f" ORDER BY {prefixo}rowid", tuple(int(valor) for valor in informados.values())
+
+    def consultar_fatos(self, id_ra: Optional[int] = None, ano: Optional[int] = None,
+                        mes: Optional[int] = None, cod_natureza: Optional[int] = None) -> pd.DataFrame:
+        sql, parametros = self.montar_consulta(
+            "SELECT id_ra, ano, cod_natureza, mes, quantidade FROM fatos",
+            id_ra=id_ra, ano=ano, mes=mes, cod_natureza=cod_natureza)
+        return self._ler_sql(sql, parametros)
+
+    def ler_naturezas(self) -> pd.DataFrame:
+        return self._ler_sql("SELECT natureza, cod_natureza FROM naturezas ORDER BY cod_natureza")
+
+    def ler_regioes(self) -> pd.DataFrame:
+        return self._ler_sql("SELECT id_ra, regiao_administrativa FROM regioes ORDER BY id_ra")
+
+    def salvar_registros(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Upsert pela chave natural: a última quantidade informada prevalece."""
+        padronizado = converter_tipos_fatos(padronizar_colunas(df))[COLUNAS_FATOS]
+        linhas = [tuple(int(v) for v in linha) for linha in padronizado.itertuples(index=False, name=None)]
+        with closing(self._conectar()) as con, con:
+            con.executemany(SQL_UPSERT_FATO, linhas)
+        return padronizado
+
+    def mesclar_registros(self, df: pd.DataFrame) -> pd.DataFrame:
+        # No SQLite salvar já é um upsert pela chave natural
+        gravadas = self.salvar_registros(df)
+        return gravadas.drop_duplicates(CHAVE_NATURAL, keep='last')
+
+    def ler_fatos_diarios(self) -> pd.DataFrame:
+        df = self._ler_sql("SELECT id_ra, data, cod_natureza, quantidade FROM fatos_diarios ORDER BY rowid")
+        return padronizar_diarios(df)
+
+    def salvar_registros_diarios(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Upsert pela chave diária (id_ra, data, cod_natureza)."""
+        padronizado = padronizar_diarios(padronizar_colunas(df))
+        linhas = [
+            (int(id_ra), data.strftime('%Y-%m-%d'), int(cod_natureza), int(quantidade))
+            for id_ra, data, cod_natureza, quantidade in padronizado.itertuples(index=False, name=None)
+        ]
+        with closing(self._conectar()) as con, con:
+            con.executemany(SQL_UPSERT_FATO_DIARIO, linhas)
+        return padronizado
+
+    def arquivos_monitorados(self) -> Tuple[Path, ...]:
+        return (self.path,)
+
+
+# ----------------------------------------------
+# CRIAÇÃO DO BACKEND E MIGRAÇÃO
+# ----------------------------------------------
+
+def criar_backend(nome: str) -> StorageBackend:
+    """Cria o backend configurado em STORAGE_BACKEND ('csv' ou 'sqlite')."""
+    nome = nome.lower().strip()
+    if nome == "csv":
+        return CsvBackend(
+            fatos=DATA_DIR_COMPLETO_NORMALIZADO,
+            naturezas=DATA_DIR_NATUREZA,
+            regioes=DATA_DIR_RA,
+            monitorados_extras=[DATA_DIR_CONSOLIDADO],
+            diarios=DATA_DIR_DIARIO,
+        )
+    if nome == "sqlite":
+        return SqliteBackend(DATA_DIR_SQLITE)
+    raise ValueError(f"Backend de armazenamento desconhecido: {nome!r} (use 'csv' ou 'sqlite').")
+
+
+def migrar_para_sqlite(origem: StorageBackend, destino: Path) -> int:
+    """
+    Copia fatos e dimensões de um backend (normalmente o CSV) para um banco SQLite novo.
+    Linhas repetidas na chave natural são reduzidas à última ocorrência, que é a
+    mesma regra do upsert. O banco é montado num arquivo temporário e só então
+    substitui o destino. Retorna o número de linhas de fatos migradas.
+    """
+    destino = Path(destino)
+    fatos = origem.ler_fatos()
+    naturezas = origem.ler_naturezas()
+    regioes = origem.ler_regioes()
+    if fatos.empty or naturezas.empty or regioes.empty:
+        raise ValueError("Migração abortada: uma ou mais tabelas de origem estão vazias.")
+
+    duplicadas = int(fatos.duplicated(CHAVE_NATURAL, keep='last').sum())
+    if duplicadas:
+        logger.warning(f"Migração: {duplicadas} linhas repetidas na chave natural; mantida a última.")
+    fatos = fatos.drop_duplicates(CHAVE_NATURAL, keep='last')
+
+    temporario = destino.with_name(destino.name + ".tmp")
+    temporario.unlink(missing_ok=True)
+    with closing(sqlite3.connect(temporario)) as con, con:
+        con.executescript(ESQUEMA_SQLITE)
+        fatos[COLUNAS_FATOS].to_sql('fatos', con, if_exists='append', index=False)
+        naturezas[['cod_natureza', 'natureza']].to_sql('naturezas', con, if_exists='append', index=False)
+        regioes[['id_ra', 'regiao_administrativa']].to_sql('regioes', con, if_exists='append', index=False)
+        diarios = origem.ler_fatos_diarios()
+        if not diarios.empty:
+            diarios.assign(data=diarios['data'].dt.strftime('%Y-%m-%d'))[COLUNAS_DIARIAS].to_sql(
+                'fatos_diarios', con, if_exists='append', index=False)
+        # Estatísticas dos índices para o planejador (consultas por chave usam idx_fatos_chave)
+        con.execute("ANALYZE")
+    os.replace(temporario, destino)
+
+    logger.info(f"Migração concluída: {fatos.shape[0]} linhas de fatos em {destino}.")
+    return int(fatos.shape[0])
+
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description="Ferramentas de armazenamento da API SSP/DF.")
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+    migrar = subparsers.add_parser("migrar", help="Migra os CSVs atuais para um banco SQLite.")
+    migrar.add_argument("--destino", type=Path, default=DATA_DIR_SQLITE, help="Arquivo SQLite de destino.")
+    args = parser.parse_args(argv)
+    setup_logging()
+
+    if args.comando == "migrar":
+        linhas = migrar_para_sqlite(criar_backend("csv"), args.destino)
+        print(f"{linhas} linhas migradas para {args.destino}")
+
+
+if __name__ == "__main__":
+    main()
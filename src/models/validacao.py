@@ -0,0 +1,196 @@
+# Arquivo: src/models/validacao.py
+# Validação vetorizada dos dados na carga: tipos, faixas, integridade referencial
+# com as dimensões e chaves repetidas. Linhas inválidas vão para a quarentena
+# (com o motivo) em vez de chegarem às consultas.
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.config import settings, logger
+from src.models.dataset import CHAVE_NATURAL, COLUNAS_FATOS
+from src.schemas.schemas import OcorrenciasRequest
+
+Faixa = Tuple[Optional[int], Optional[int]]
+
+
+class ErroCargaDados(RuntimeError):
+    """Dados de origem ilegíveis, ou inválidos demais para publicar uma versão."""
+
+
+def faixas_do_schema(modelo=OcorrenciasRequest) -> Dict[str, Faixa]:
+    """(mínimo, máximo) de cada campo, lidos das restrições ge/le do schema de entrada."""
+    faixas = {}
+    for nome, campo in modelo.model_fields.items():
+        minimo = next((r.ge for r in campo.metadata if hasattr(r, 'ge')), None)
+        maximo = next((r.le for r in campo.metadata if hasattr(r, 'le')), None)
+        faixas[nome] = (minimo, maximo)
+    return faixas
+
+
+# Mesmas faixas aceitas no POST /ocorrencias
+FAIXAS_FATOS = faixas_do_schema()
+# Datasets do catálogo têm anos históricos e códigos de outras jurisdições:
+# RA e natureza são conferidas só contra as dimensões do próprio dataset
+FAIXAS_CATALOGO = {coluna: FAIXAS_FATOS[coluna] for coluna in ('mes', 'quantidade')}
+
+# Motivos de quarentena, na ordem de precedência (vale o primeiro que se aplica)
+MOTIVOS = ('tipo_invalido', 'fora_da_faixa', 'natureza_desconhecida', 'ra_desconhecida', 'chave_duplicada')
+
+
+# ----------------------------------------------
+# CLASSE RelatorioValidacao --- Resultado da validação de uma carga
+# ----------------------------------------------
+
+@dataclass(frozen=True)
+class RelatorioValidacao:
+    """
+    Linhas rejeitadas (valores originais + coluna 'motivo') e contagens.
+    Linhas com motivo 'chave_duplicada' foram substituídas por uma linha
+    posterior com a mesma chave natural (no CSV em modo append, é assim que
+    uma correção é gravada): ficam no relatório, mas não são erro.
+    """
+    origem: str
+    total: int
+    quarentena: pd.DataFrame = field(repr=False)
+    dimensoes_descartadas: int = 0
+
+    @property
+    def rejeitadas(self) -> int:
+        return len(self.quarentena)
+
+    @property
+    def substituidas(self) -> int:
+        return self.por_motivo.get('chave_duplicada', 0)
+
+    @property
+    def por_motivo(self) -> Dict[str, int]:
+        if self.quarentena.empty:
+            return {}
+        return {str(motivo): int(n) for motivo, n in self.quarentena['motivo'].value_counts().items()}
+
+    def resumo(self) -> dict:
+        return {
+            "origem": self.origem,
+            "total": self.total,
+            "rejeitadas": self.rejeitadas,
+            "por_motivo": self.por_motivo,
+            "linhas_dimensao_descartadas": self.dimensoes_descartadas,
+        }
+
+
+# ----------------------------------------------
+# VALIDAÇÃO
+# ----------------------------------------------
+
+def validar_dimensao(df: pd.DataFrame, chave: str, nome: str, tabela: str) -> Tuple[pd.DataFrame, int]:
+    """
+    Dimensão com chave inteira e única e nome preenchido. Linhas sem chave
+    ou nome, e códigos repetidos (o primeiro vale), são descartados: uma
+    chave repetida multiplicaria as linhas de fatos no JOIN.
+    """
+    if df.empty or chave not in df.columns or nome not in df.columns:
+        raise ErroCargaDados(f"Tabela de {tabela} vazia ou sem as colunas '{chave}' e '{nome}'.")
+    codigos = pd.to_numeric(df[chave], errors='coerce')
+    invalidas = (codigos.isna() | df[nome].isna() | codigos.duplicated(keep='first')).to_numpy()
+    if invalidas.all():
+        raise ErroCargaDados(f"Tabela de {tabela} sem nenhuma linha válida.")
+
+    validas = df.loc[~invalidas]
+    validas = validas.assign(**{chave: codigos[~invalidas].astype('int64'), nome: validas[nome].astype(str)})
+    return validas.reset_index(drop=True), int(invalidas.sum())
+
+
+def validar_dimensoes(dim_natureza: pd.DataFrame, dim_ra: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame, int]:
+    """(naturezas, regiões, linhas descartadas) prontas para o JOIN."""
+    dim_natureza, descartadas_natureza = validar_dimensao(dim_natureza, 'cod_natureza', 'natureza', 'naturezas')
+    dim_ra, descartadas_ra = validar_dimensao(dim_ra, 'id_ra', 'regiao_administrativa', 'RAs')
+    return dim_natureza, dim_ra, descartadas_natureza + descartadas_ra
+
+
+def validar_fatos(fatos: pd.DataFrame, dim_natureza: pd.DataFrame, dim_ra: pd.DataFrame,
+                  faixas: Dict[str, Faixa] = FAIXAS_FATOS,
+                  origem: str = "fatos", dimensoes_descartadas: int = 0) -> Tuple[pd.DataFrame, RelatorioValidacao]:
+    """
+    Valida a tabela de fatos inteira com operações de coluna (sem laço por
+    linha) e devolve (linhas válidas com colunas inteiras, relatório). De cada
+    chave natural repetida só a última linha fica (mesma regra do upsert), em
+    qualquer backend. Se a fração rejeitada por erro (sem contar as linhas
+    substituídas) passar de QUARANTINE_MAX_FRACTION, a carga falha com ErroCargaDados.
+    """
+    if fatos.empty:
+        return fatos, RelatorioValidacao(origem=origem, total=0, quarentena=fatos.assign(motivo=[]),
+                                         dimensoes_descartadas=dimensoes_descartadas)
+    ausentes = [coluna for coluna in COLUNAS_FATOS if coluna not in fatos.columns]
+    if ausentes:
+        raise ErroCargaDados(f"{origem}: colunas ausentes na tabela de fatos: {ausentes}.")
+
+    # Valores como float: texto e vazios viram NaN; inteiro é o que não tem parte fracionária
+    valores = {coluna: pd.to_numeric(fatos[coluna], errors='coerce').to_numpy(dtype=float) for coluna in COLUNAS_FATOS}
+    tipo_invalido = np.zeros(len(fatos), dtype=bool)
+    for coluna in COLUNAS_FATOS:
+        tipo_invalido |= ~np.isfinite(valores[coluna]) | (valores[coluna] != np.floor(valores[coluna]))
+
+    fora_da_faixa = np.zeros(len(fatos), dtype=bool)
+    for coluna, (minimo, maximo) in faixas.items():
+        if coluna not in valores:
+            continue
+        if minimo is not None:
+            fora_da_faixa |= valores[coluna] < minimo
+        if maximo is not None:
+            fora_da_faixa |= valores[coluna] > maximo
+
+    natureza_desconhecida = ~np.isin(valores['cod_natureza'], dim_natureza['cod_natureza'].to_numpy(dtype=float))
+    ra_desconhecida = ~np.isin(valores['id_ra'], dim_ra['id_ra'].to_numpy(dtype=float))
+
+    motivo = np.select([tipo_invalido, fora_da_faixa, natureza_desconhecida, ra_desconhecida], MOTIVOS[:4], default='')
+
+    # Chaves repetidas entre as linhas que passaram nas demais verificações
+    validas = motivo == ''
+    chaves = pd.DataFrame({coluna: valores[coluna][validas] for coluna in CHAVE_NATURAL})
+    repetidas = chaves.duplicated(keep='last').to_numpy()
+    motivo[np.flatnonzero(validas)[repetidas]] = 'chave_duplicada'
+    validas = motivo == ''
+
+    limpas = fatos.loc[validas].assign(**{coluna: valores[coluna][validas].astype('int64') for coluna in COLUNAS_FATOS})
+    relatorio = RelatorioValidacao(
+        origem=origem,
+        total=len(fatos),
+        quarentena=fatos.loc[~validas].assign(motivo=motivo[~validas]),
+        dimensoes_descartadas=dimensoes_descartadas,
+    )
+    if relatorio.rejeitadas - relatorio.substituidas > settings.QUARANTINE_MAX_FRACTION * relatorio.total:
+        raise ErroCargaDados(f"{origem}: {relatorio.rejeitadas} de {relatorio.total} linhas inválidas "
+                             f"{relatorio.por_motivo}; carga abortada.")
+    return limpas.reset_index(drop=True), relatorio
+
+
+# ----------------------------------------------
+# RELATÓRIO DE QUARENTENA
+# ----------------------------------------------
+
+def registrar_relatorio(relatorio: RelatorioValidacao, diretorio: Optional[Path] = None) -> Optional[Path]:
+    """
+    Registra o resultado no log e, havendo linhas rejeitadas, grava
+    <origem>.csv (as linhas e o motivo) e <origem>.json (o resumo) em
+    QUARANTINE_DIR, substituindo o relatório da carga anterior.
+    """
+    if relatorio.substituidas:
+        logger.warning(f"{relatorio.origem}: {relatorio.substituidas} linhas com chave natural repetida (vale a última).")
+    if relatorio.dimensoes_descartadas:
+        logger.warning(f"{relatorio.origem}: {relatorio.dimensoes_descartadas} linhas de dimensão descartadas.")
+    if not relatorio.rejeitadas:
+        return None
+
+    diretorio = Path(settings.QUARANTINE_DIR if diretorio is None else diretorio)
+    diretorio.mkdir(parents=True, exist_ok=True)
+    relatorio.quarentena.to_csv(diretorio / f"{relatorio.origem}.csv", sep=';', encoding='utf-8', index=False)
+    caminho = diretorio / f"{relatorio.origem}.json"
+    caminho.write_text(json.dumps(relatorio.resumo(), ensure_ascii=False, indent=2), encoding='utf-8')
+    logger.warning(f"{relatorio.origem}: {relatorio.rejeitadas} de {relatorio.total} linhas em quarentena "
+                   f"{relatorio.por_motivo} (relatório em {caminho}).")
+    return caminho
@@ -3,9 +3,10 @@
 # Autor: Casimiro
 # Data: 2024-06-15
 
-from pydantic import BaseModel, Field, ConfigDict
+from datetime import date
+from pydantic import BaseModel, Field, ConfigDict, field_validator
 from typing import Optional
-from typing import List
+from typing import List, Dict
 from enum import Enum
 
 # ---------------------------
@@ -26,6 +27,23 @@ class OcorrenciasRequest(BaseModel):
     ano: int = Field(..., ge=2000, le=2100, description="Ano da ocorrência (2000-2100)")
     class Config:json_schema_extra  = {"example": {"id_ra": 1, "cod_natureza": 1, "quantidade": 10, "mes": 6, "ano": 2024}}
 
+# Esquema de INPUT diário (feeds com granularidade de dia)
+class OcorrenciaDiariaRequest(BaseModel):
+    id_ra: int = Field(..., ge=1, le=33, description="Identificador único da Região Administrativa (RA)")
+    cod_natureza: int = Field(..., ge=1, le=32, description="Código da Natureza da ocorrência")
+    quantidade: int = Field(..., ge=0, description="Quantidade de ocorrências no dia")
+    data: date = Field(..., description="Data da ocorrência (AAAA-MM-DD)")
+
+    @field_validator('data')
+    @classmethod
+    def validar_ano(cls, valor: date) -> date:
+        # Mesmo intervalo de anos aceito no cadastro mensal
+        if not 2000 <= valor.year <= 2100:
+            raise ValueError("o ano da data deve estar entre 2000 e 2100")
+        return valor
+
+    class Config:json_schema_extra  = {"example": {"id_ra": 1, "cod_natureza": 1, "quantidade": 2, "data": "2025-01-15"}}
+
 # ----------------------------------------
 # --- CLASSE ENUMERADA (Valores Fixos) ---
 # ----------------------------------------
@@ -147,3 +165,183 @@ class OcorrenciasMediaResponse(BaseModel):
             }
         }
     )
+
+# ---------------------------------------------------------------------------------
+# --- CLASSES DE RESPOSTA DO CATÁLOGO (OUTPUT: GET /datasets/{nome}/...) ---
+# ---------------------------------------------------------------------------------
+# Os datasets do catálogo incluem arquivos históricos: o ano segue o limite de
+# entrada dessas rotas (1900), e não o do dataset principal (2000).
+
+class DatasetOcorrenciasNomesResponse(Ocorrencias_Nomes_Response):
+    ANO: int = Field(..., ge=1900, le=2100, description="Ano da ocorrência")
+
+
+class DatasetOcorrenciasMediaResponse(OcorrenciasMediaResponse):
+    ANO: int = Field(..., ge=1900, le=2100, description="Ano da ocorrência analisada")
+
+# ------------------------------------------------------------------------------
+# --- CLASSE OCORRÊNCIAS PREVISÃO RESPONSE (OUTPUT: GET /ocorrencias_previsao) ---
+# ------------------------------------------------------------------------------
+
+class OcorrenciasPrevisaoResponse(BaseModel):
+    ID_RA: int = Field(..., description="ID da Região Administrativa (RA)")
+    COD_NATUREZA: int = Field(..., description="Código da Natureza da ocorrência")
+    Natureza: str = Field(..., description="Nome descritivo da Natureza da ocorrência")
+    RegiaoAdministrativa: str = Field(..., description="Nome da Região Administrativa (RA)")
+    MES: int = Field(..., ge=1, le=12, description="Próximo mês após o último dado disponível")
+    ANO: int = Field(..., ge=2000, le=2100, description="Ano do próximo mês")
+    Previsao_Proximo_Mes: float = Field(..., description="Quantidade esperada no próximo mês (sazonalidade + tendência).")
+    Previsao_Proximo_Trimestre: float = Field(..., description="Quantidade esperada somando os três próximos meses.")
+    Tendencia_Mensal: float = Field(..., description="Variação média da quantidade por mês (tendência linear).")
+    Media_Historica_Mes: Optional[float] = Field(None, description="Média simples do mesmo mês nos anos anteriores.")
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "ID_RA": 14,
+                "COD_NATUREZA": 7,
+                "Natureza": "HOMICÍDIO",
+                "RegiaoAdministrativa": "PLANO PILOTO",
+                "MES": 1,
+                "ANO": 2025,
+                "Previsao_Proximo_Mes": 12.4,
+                "Previsao_Proximo_Trimestre": 36.9,
+                "Tendencia_Mensal": -0.05,
+                "Media_Historica_Mes": 13.2
+            }
+        }
+    )
+
+# ----------------------------------------------------------------------------
+# --- CLASSE OCORRÊNCIAS MATRIZ RESPONSE (OUTPUT: GET /ocorrencias_matriz) ---
+# ----------------------------------------------------------------------------
+
+class OcorrenciasMatrizResponse(BaseModel):
+    Linhas: str = Field(..., description="Dimensão das linhas (ano, mes, id_ra ou cod_natureza)")
+    Colunas: str = Field(..., description="Dimensão das colunas (ano, mes, id_ra ou cod_natureza)")
+    Filtros: Dict[str, int] = Field(..., description="Dimensões fixadas (nas linhas/colunas, restringem a um rótulo); as não fixadas fora de linhas/colunas são somadas")
+    Rotulos_Linhas: List[int] = Field(..., description="Códigos das linhas, em ordem")
+    Rotulos_Colunas: List[int] = Field(..., description="Códigos das colunas, em ordem")
+    Nomes_Linhas: Optional[List[str]] = Field(None, description="Nomes das linhas (RA ou Natureza)")
+    Nomes_Colunas: Optional[List[str]] = Field(None, description="Nomes das colunas (RA ou Natureza)")
+    Valores: List[Optional[int]] = Field(..., description="Quantidades linha a linha (len = linhas x colunas); null se não houver dado")
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "Linhas": "id_ra",
+                "Colunas": "cod_natureza",
+                "Filtros": {"ano": 2024, "mes": 6},
+                "Rotulos_Linhas": [1, 2],
+                "Rotulos_Colunas": [1, 2, 3],
+                "Nomes_Linhas": ["ARNIQUEIRA", "ÁGUAS CLARAS"],
+                "Nomes_Colunas": ["ESTUPRO", "FURTO A TRANSEUNTE", "ROUBO A TRANSEUNTE"],
+                "Valores": [1, 4, 2, 0, None, 7]
+            }
+        }
+    )
+
+# ----------------------------------------------------------------------------------------
+# --- CLASSE OCORRÊNCIAS COMOVIMENTO RESPONSE (OUTPUT: GET /ocorrencias_comovimento) ---
+# ----------------------------------------------------------------------------------------
+
+class OcorrenciasComovimentoResponse(BaseModel):
+    Metodo: str = Field(..., description="correlacao (Pearson) ou covariancia (amostral)")
+    Series: str = Field(..., description="Dimensão comparada: cod_natureza (naturezas de uma RA) ou id_ra (RAs de uma natureza)")
+    Filtro: Dict[str, int] = Field(..., description="Dimensão fixada (id_ra ou cod_natureza)")
+    Ano_Inicio: int = Field(..., description="Primeiro ano considerado")
+    Ano_Fim: int = Field(..., description="Último ano considerado")
+    Meses: int = Field(..., description="Quantidade de meses (ano, mês) com dado nas séries")
+    Rotulos: List[int] = Field(..., description="Códigos das séries, em ordem (linhas e colunas da matriz)")
+    Nomes: Optional[List[str]] = Field(None, description="Nomes das séries (RA ou Natureza)")
+    Valores: List[Optional[float]] = Field(..., description="Matriz linha a linha (len = séries x séries); null sem meses em comum suficientes ou série constante")
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "Metodo": "correlacao",
+                "Series": "cod_natureza",
+                "Filtro": {"id_ra": 14},
+                "Ano_Inicio": 2020,
+                "Ano_Fim": 2024,
+                "Meses": 60,
+                "Rotulos": [8, 29],
+                "Nomes": ["ROUBO DE VEÍCULO", "LOCALIZAÇÃO DE VEICULO FURTADO OU ROUBADO"],
+                "Valores": [1.0, 0.62, 0.62, 1.0]
+            }
+        }
+    )
+
+# ----------------------------------------------------------------------------------------
+# --- CLASSE OCORRÊNCIAS DISTRIBUIÇÃO RESPONSE (OUTPUT: GET /ocorrencias_distribuicao) ---
+# ----------------------------------------------------------------------------------------
+
+class OcorrenciasDistribuicaoResponse(BaseModel):
+    MES: int = Field(..., ge=1, le=12, description="Mês da ocorrência analisada")
+    ANO: int = Field(..., ge=2000, le=2100, description="Ano da ocorrência analisada")
+    Natureza: str = Field(..., description="Nome descritivo da Natureza da ocorrência")
+    RegiaoAdministrativa: str = Field(..., description="Nome da Região Administrativa (RA)")
+    Quantidade_Atual: int = Field(..., description="Quantidade de ocorrências no mês/ano/local específico.")
+    Anos_Historico: int = Field(..., description="Quantidade de anos com dado para o Mês/RA/Natureza.")
+    Media_Historica_Mes: float = Field(..., description="Média da Quantidade no Mês, considerando todos os Anos.")
+    Mediana_Historica_Mes: float = Field(..., description="Mediana da Quantidade no Mês, considerando todos os Anos.")
+    Minimo_Historico_Mes: int = Field(..., description="Menor Quantidade registrada no Mês.")
+    Maximo_Historico_Mes: int = Field(..., description="Maior Quantidade registrada no Mês.")
+    Desvio_Padrao_Mes: Optional[float] = Field(None, description="Desvio-padrão amostral (null com menos de 2 anos).")
+    Percentil_Atual: float = Field(..., ge=0, le=100, description="Posição (0-100) da Quantidade Atual no histórico do Mês.")
+    ID_RA: int = Field(..., description="ID da Região Administrativa (RA)")
+    COD_NATUREZA: int = Field(..., description="Código da Natureza da ocorrência")
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "MES": 6,
+                "ANO": 2024,
+                "Natureza": "HOMICÍDIO",
+                "RegiaoAdministrativa": "PLANO PILOTO",
+                "Quantidade_Atual": 15,
+                "Anos_Historico": 5,
+                "Media_Historica_Mes": 12.4,
+                "Mediana_Historica_Mes": 12.0,
+                "Minimo_Historico_Mes": 9,
+                "Maximo_Historico_Mes": 15,
+                "Desvio_Padrao_Mes": 2.3,
+                "Percentil_Atual": 90.0,
+                "ID_RA": 14,
+                "COD_NATUREZA": 7
+            }
+        }
+    )
+
+# --------------------------------------------------------------------------
+# --- CLASSE OCORRÊNCIAS ROLLUP RESPONSE (OUTPUT: GET /ocorrencias_rollup) ---
+# --------------------------------------------------------------------------
+
+class OcorrenciasRollupResponse(BaseModel):
+    ID_RA: int = Field(..., description="ID da Região Administrativa (RA)")
+    COD_NATUREZA: int = Field(..., description="Código da Natureza da ocorrência")
+    ANO: int = Field(..., description="Ano (na granularidade semanal, o ano ISO da semana)")
+    PERIODO: Optional[int] = Field(None, description="Semana ISO (1-53) ou mês (1-12); null no agregado anual")
+    QUANTIDADE: int = Field(..., description="Quantidade de ocorrências no período")
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {"ID_RA": 14, "COD_NATUREZA": 7, "ANO": 2025, "PERIODO": 3, "QUANTIDADE": 4}
+        }
+    )
+
+# ----------------------------------------------------
+# --- CLASSE DATASET INFO RESPONSE (OUTPUT: GET /datasets) ---
+# ----------------------------------------------------
+
+class DatasetInfoResponse(BaseModel):
+    Nome: str = Field(..., description="Nome do dataset (usado em /datasets/{nome}/...)")
+    Padrao: bool = Field(..., description="True para o dataset principal (sempre em memória)")
+    Anos: List[int] = Field(..., description="Anos disponíveis")
+    Anos_Em_Memoria: List[int] = Field(..., description="Anos com partição carregada no momento")
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {"Nome": "df_1990", "Padrao": False, "Anos": [1990, 1991, 1992], "Anos_Em_Memoria": [1991]}
+        }
+    )
@@ -0,0 +1,161 @@
+# Arquivo: src/services/exportacao_service.py
+# Exportação em lote do dataset (CSV, Parquet, Arrow IPC) em fluxo contínuo
+
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Sequence
+
+from src.config import settings, logger
+
+# Colunas exportáveis, na ordem padrão do arquivo
+COLUNAS_EXPORTACAO = ['id_ra', 'regiao_administrativa', 'ano', 'mes', 'cod_natureza', 'natureza', 'quantidade']
+
+FORMATOS = {
+    # formato: (media type, extensão)
+    'csv': ('text/csv; charset=utf-8', 'csv'),
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+    'arrow': ('application/vnd.apache.arrow.stream', 'arrows'),
+}
+
+
+@dataclass(frozen=True)
+class FiltrosExportacao:
+    ano: Optional[int] = None
+    mes: Optional[int] = None
+    id_ra: Optional[int] = None
+    cod_natureza: Optional[int] = None
+
+
+def validar_colunas(colunas: Optional[str]) -> List[str]:
+    """Converte 'a,b,c' na lista de colunas; ValueError se alguma não existir."""
+    if not colunas:
+        return list(COLUNAS_EXPORTACAO)
+    selecionadas = [c.strip().lower() for c in colunas.split(',') if c.strip()]
+    invalidas = [c for c in selecionadas if c not in COLUNAS_EXPORTACAO]
+    if invalidas or not selecionadas:
+        raise ValueError(f"Colunas inválidas: {invalidas}. Disponíveis: {COLUNAS_EXPORTACAO}")
+    return selecionadas
+
+
+def _arrow():
+    """pyarrow é opcional: só os formatos parquet e arrow precisam dele."""
+    try:
+        import pyarrow as pa
+        return pa
+    except ImportError:
+        raise RuntimeError("Formato indisponível: instale o pacote opcional 'pyarrow'.")
+
+
+# ----------------------------------------------
+# FATIAS --- pedaços do dataset lidos direto das partições
+# ----------------------------------------------
+
+def fatias(dataset, filtros: FiltrosExportacao, colunas: Sequence[str], tamanho: int) -> Iterator:
+    """
+    Percorre as partições (um ano por vez) e devolve DataFrames de até
+    `tamanho` linhas só com as colunas pedidas. Nada é montado para o dataset
+    inteiro: a memória extra é a de uma fatia.
+    """
+    anos = dataset.anos if filtros.ano is None else [a for a in dataset.anos if a == filtros.ano]
+    for ano in anos:
+        df = dataset.particoes[ano].denormalizado
+        mascara = None
+        for coluna in ('mes', 'id_ra', 'cod_natureza'):
+            valor = getattr(filtros, coluna)
+            if valor is not None:
+                condicao = df[coluna].to_numpy() == valor
+                mascara = condicao if mascara is None else mascara & condicao
+        if mascara is not None:
+            posicoes = mascara.nonzero()[0]
+            for inicio in range(0, len(posicoes), tamanho):
+                yield df.iloc[posicoes[inicio:inicio + tamanho]][colunas]
+        else:
+            for inicio in range(0, len(df), tamanho):
+                yield df.iloc[inicio:inicio + tamanho][colunas]
+
+
+# ----------------------------------------------
+# CODIFICADORES --- cada um devolve um gerador de bytes
+# ----------------------------------------------
+
+class _Coletor:
+    """Arquivo em memória que entrega e descarta o que já foi escrito (para streaming)."""
+
+    def __init__(self):
+        self._partes: List[bytes] = []
+        self._posicao = 0
+        self.closed = False
+
+    def write(self, dados) -> int:
+        dados = bytes(dados)
+        self._partes.append(dados)
+        self._posicao += len(dados)
+        return len(dados)
+
+    def tell(self) -> int:
+        return self._posicao
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drenar(self) -> bytes:
+        dados = b''.join(self._partes)
+        self._partes.clear()
+        return dados
+
+
+def _gerar_csv(pedacos: Iterator, colunas: Sequence[str]) -> Iterator[bytes]:
+    yield (';'.join(colunas) + '\n').encode('utf-8')
+    for df in pedacos:
+        yield df.to_csv(sep=';', header=False, index=False).encode('utf-8')
+
+
+def _esquema(pa, colunas: Sequence[str]):
+    tipos = {'regiao_administrativa': pa.string(), 'natureza': pa.string()}
+    return pa.schema([(c, tipos.get(c, pa.int64())) for c in colunas])
+
+
+def _gerar_arrow(pedacos: Iterator, colunas: Sequence[str]) -> Iterator[bytes]:
+    pa = _arrow()
+    esquema = _esquema(pa, colunas)
+    coletor = _Coletor()
+    with pa.ipc.new_stream(coletor, esquema) as escritor:
+        for df in pedacos:
+            escritor.write_batch(pa.RecordBatch.from_pandas(df, schema=esquema, preserve_index=False))
+            yield coletor.drenar()
+    yield coletor.drenar()
+
+
+def _gerar_parquet(pedacos: Iterator, colunas: Sequence[str]) -> Iterator[bytes]:
+    pa = _arrow()
+    import pyarrow.parquet as pq
+    esquema = _esquema(pa, colunas)
+    coletor = _Coletor()
+    # Cada fatia vira um row group; o rodapé (metadados) sai no fechamento
+    with pq.ParquetWriter(coletor, esquema, compression='snappy') as escritor:
+        for df in pedacos:
+            escritor.write_table(pa.Table.from_pandas(df, schema=esquema, preserve_index=False))
+            yield coletor.drenar()
+    yield coletor.drenar()
+
+
+CODIFICADORES = {'csv': _gerar_csv, 'parquet': _gerar_parquet, 'arrow': _gerar_arrow}
+
+
+def exportar(dataset, formato: str, filtros: FiltrosExportacao, colunas: Sequence[str],
+             tamanho: Optional[int] = None) -> Iterator[bytes]:
+    """
+    Gerador de bytes do arquivo exportado. Recebe a versão do dataset já
+    fixada: o download inteiro sai da mesma versão, mesmo que outra seja
+    publicada no meio da transferência.
+    """
+    if formato not in CODIFICADORES:
+        raise ValueError(f"Formato inválido: {formato}. Disponíveis: {list(CODIFICADORES)}")
+    if formato != 'csv':
+        _arrow()  # falha antes de começar a resposta, não no meio dela
+
+    tamanho = tamanho or settings.EXPORT_CHUNK_ROWS
+    logger.info(f"Exportação {formato} iniciada: filtros={filtros}, colunas={list(colunas)}")
+    return CODIFICADORES[formato](fatias(dataset, filtros, colunas, tamanho), colunas)
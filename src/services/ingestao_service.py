@@ -0,0 +1,276 @@
+# Arquivo: src/services/ingestao_service.py
+# Pipeline de ingestão dos arquivos brutos da SSP (nomes -> códigos) para a tabela de fatos
+
+import argparse
+import hashlib
+import json
+import os
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from src.config import DATA_DIR_MANIFESTO_INGESTAO, logger, setup_logging
+from src.models import model_loader
+from src.models.dataset import CHAVE_NATURAL, COLUNAS_FATOS
+from src.models.storage import padronizar_colunas
+from src.models.validacao import ErroCargaDados, validar_dimensoes, validar_fatos
+
+# Nomes usados nos arquivos brutos que diferem da tabela de naturezas
+# (chaves e valores já normalizados: sem acento, maiúsculos, espaços simples)
+ALIASES_NATUREZA = {
+    "ROUBO EM TRANSPORTE COLETIVO": "ROUBO EM COLETIVO",
+    "LESAO CORPORAL SEGUIDA DE MORTE": "LESAO CORPORAL SEG. DE MORTE",
+    "POSSE/PORTE DE ARMA DE FOGO": "POSSE/PORTE DE ARMA",
+}
+
+# Colunas aceitas para identificar a RA no arquivo bruto
+COLUNAS_RA_NOME = ['ra', 'regiao_administrativa', 'região_administrativa', 'região_administrativa_(ra)']
+
+
+# ----------------------------------------------
+# RESULTADOS
+# ----------------------------------------------
+
+@dataclass
+class ResultadoArquivo:
+    arquivo: str
+    hash: str
+    linhas_lidas: int = 0
+    linhas_validas: int = 0
+    nao_mapeados: Dict[str, int] = field(default_factory=dict)
+    # Linhas recusadas pela mesma validação da carga, por motivo (ex.: fora_da_faixa)
+    rejeitadas: Dict[str, int] = field(default_factory=dict)
+    erro: Optional[str] = None
+
+
+@dataclass
+class RelatorioIngestao:
+    processados: List[ResultadoArquivo] = field(default_factory=list)
+    ignorados: List[str] = field(default_factory=list)   # sem mudança desde a última ingestão
+    linhas_mescladas: int = 0
+
+
+# ----------------------------------------------
+# FUNÇÕES AUXILIARES
+# ----------------------------------------------
+
+def normalizar_nome(nome: str) -> str:
+    """Remove acentos, espaços extras e padroniza em maiúsculo (para casar nomes com as tabelas)."""
+    sem_acento = unicodedata.normalize('NFKD', str(nome)).encode('ascii', 'ignore').decode('ascii')
+    return " ".join(sem_acento.upper().split())
+
+
+def hash_arquivo(path: Path) -> str:
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for bloco in iter(lambda: f.read(1 << 20), b''):
+            sha.update(bloco)
+    return sha.hexdigest()
+
+
+def montar_mapas(naturezas: pd.DataFrame, regioes: pd.DataFrame) -> Tuple[Dict[str, int], Dict[str, int]]:
+    """Dicionários nome normalizado -> código, a partir das tabelas de dimensão."""
+    mapa_naturezas: Dict[str, int] = {}
+    for nome, codigo in zip(naturezas['natureza'], naturezas['cod_natureza']):
+        # Nomes repetidos na tabela (ex.: ROUBO EM COMÉRCIO) ficam com o primeiro código
+        mapa_naturezas.setdefault(normalizar_nome(nome), int(codigo))
+    for alias, nome in ALIASES_NATUREZA.items():
+        if nome in mapa_naturezas:
+            mapa_naturezas.setdefault(alias, mapa_naturezas[nome])
+
+    mapa_ras: Dict[str, int] = {}
+    for nome, codigo in zip(regioes['regiao_administrativa'], regioes['id_ra']):
+        mapa_ras.setdefault(normalizar_nome(nome), int(codigo))
+    return mapa_naturezas, mapa_ras
+
+
+def ler_manifesto(path: Path) -> Dict[str, dict]:
+    try:
+        return json.loads(Path(path).read_text(encoding='utf-8'))
+    except FileNotFoundError:
+        return {}
+
+
+def gravar_manifesto(path: Path, manifesto: Dict[str, dict]):
+    path = Path(path)
+    temporario = path.with_name(path.name + ".tmp")
+    temporario.write_text(json.dumps(manifesto, indent=2, ensure_ascii=False), encoding='utf-8')
+    os.replace(temporario, path)
+
+
+# ----------------------------------------------
+# PROCESSAMENTO DE UM ARQUIVO (roda em processo separado)
+# ----------------------------------------------
+
+def _mapear_coluna(serie: pd.Series, mapa: Dict[str, int]) -> Tuple[pd.Series, Dict[str, int]]:
+    """Converte nomes em códigos; devolve também a contagem de nomes sem correspondência."""
+    normalizados = serie.astype(str).map(normalizar_nome)
+    codigos = normalizados.map(mapa)
+    nao_mapeados = normalizados[codigos.isna()].value_counts().to_dict()
+    return codigos, nao_mapeados
+
+
+def processar_arquivo(path: str, digest: str, mapa_naturezas: Dict[str, int], mapa_ras: Dict[str, int],
+                      id_ra_padrao: Optional[int] = None, sep: str = ';') -> Tuple[pd.DataFrame, ResultadoArquivo]:
+    """
+    Lê um arquivo bruto e devolve as linhas no formato da tabela de fatos
+    (id_ra, ano, cod_natureza, mes, quantidade), ainda sem validar os valores
+    (validar_arquivo). Linhas com nomes sem correspondência nas dimensões são
+    descartadas e contadas no resultado.
+    """
+    resultado = ResultadoArquivo(arquivo=path, hash=digest)
+    vazio = pd.DataFrame(columns=COLUNAS_FATOS)
+    try:
+        df = padronizar_colunas(pd.read_csv(path, sep=sep, encoding='utf-8'))
+        resultado.linhas_lidas = int(df.shape[0])
+
+        # Natureza: código direto ou nome
+        if 'cod_natureza' not in df.columns:
+            df['cod_natureza'], nao_mapeados = _mapear_coluna(df['natureza'], mapa_naturezas)
+            resultado.nao_mapeados.update({f"natureza: {k}": v for k, v in nao_mapeados.items()})
+
+        # RA: código direto, nome ou valor padrão informado na linha de comando
+        if 'id_ra' not in df.columns:
+            coluna_ra = next((c for c in COLUNAS_RA_NOME if c in df.columns), None)
+            if coluna_ra is not None:
+                df['id_ra'], nao_mapeados = _mapear_coluna(df[coluna_ra], mapa_ras)
+                resultado.nao_mapeados.update({f"ra: {k}": v for k, v in nao_mapeados.items()})
+            elif id_ra_padrao is not None:
+                df['id_ra'] = id_ra_padrao
+            else:
+                raise ValueError("arquivo sem coluna de RA; informe --id-ra")
+
+        df = df.dropna(subset=['id_ra', 'cod_natureza'])[COLUNAS_FATOS].reset_index(drop=True)
+        return df, resultado
+
+    except Exception as e:
+        resultado.erro = str(e)
+        return vazio, resultado
+
+
+def validar_arquivo(df: pd.DataFrame, resultado: ResultadoArquivo,
+                    dim_natureza: pd.DataFrame, dim_ra: pd.DataFrame) -> pd.DataFrame:
+    """
+    Aplica às linhas do arquivo a mesma validação da carga (validar_fatos):
+    tipos, faixas do POST e códigos existentes nas dimensões (inclusive o de
+    --id-ra). Dentro do arquivo, a última linha de cada chave prevalece. Se a
+    fração recusada passar de QUARANTINE_MAX_FRACTION, o arquivo todo falha.
+    """
+    try:
+        validas, relatorio = validar_fatos(df, dim_natureza, dim_ra, origem=f"ingestao {resultado.arquivo}")
+    except ErroCargaDados as e:
+        resultado.erro = str(e)
+        return df.iloc[0:0]
+    resultado.rejeitadas = {motivo: n for motivo, n in relatorio.por_motivo.items() if motivo != 'chave_duplicada'}
+    resultado.linhas_validas = int(validas.shape[0])
+    return validas
+
+
+# ----------------------------------------------
+# PIPELINE
+# ----------------------------------------------
+
+def ingerir_arquivos(arquivos: Sequence[Path], id_ra_padrao: Optional[int] = None,
+                     workers: Optional[int] = None, manifesto: Path = DATA_DIR_MANIFESTO_INGESTAO,
+                     forcar: bool = False, sep: str = ';') -> RelatorioIngestao:
+    """
+    Processa em paralelo (um processo por arquivo) apenas os arquivos novos ou
+    alterados desde a última ingestão (comparando o SHA-256 do conteúdo), e
+    mescla o resultado na tabela de fatos pela chave natural.
+    """
+    relatorio = RelatorioIngestao()
+    registro = ler_manifesto(manifesto)
+
+    pendentes: List[Tuple[str, str]] = []
+    for arquivo in arquivos:
+        caminho = str(Path(arquivo).resolve())
+        digest = hash_arquivo(Path(caminho))
+        if not forcar and registro.get(caminho, {}).get('hash') == digest:
+            relatorio.ignorados.append(caminho)
+            continue
+        pendentes.append((caminho, digest))
+
+    if not pendentes:
+        logger.info("Ingestão: nenhum arquivo novo ou alterado.")
+        return relatorio
+
+    backend = model_loader.obter_backend()
+    dim_natureza, dim_ra, _ = validar_dimensoes(backend.ler_naturezas(), backend.ler_regioes())
+    mapa_naturezas, mapa_ras = montar_mapas(dim_natureza, dim_ra)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futuros = [
+            executor.submit(processar_arquivo, caminho, digest, mapa_naturezas, mapa_ras, id_ra_padrao, sep)
+            for caminho, digest in pendentes
+        ]
+        # A ordem dos arquivos na linha de comando define qual linha prevalece
+        resultados = [futuro.result() for futuro in futuros]
+
+    lotes = []
+    for df, resultado in resultados:
+        relatorio.processados.append(resultado)
+        if resultado.erro is None:
+            df = validar_arquivo(df, resultado, dim_natureza, dim_ra)
+        if resultado.erro:
+            logger.error(f"Ingestão: falha em {resultado.arquivo}: {resultado.erro}")
+            continue
+        if resultado.nao_mapeados:
+            logger.warning(f"Ingestão: {resultado.arquivo} tem nomes sem correspondência: {resultado.nao_mapeados}")
+        if resultado.rejeitadas:
+            logger.warning(f"Ingestão: {resultado.arquivo} tem linhas inválidas (descartadas): {resultado.rejeitadas}")
+        lotes.append(df)
+
+    if lotes:
+        novas = pd.concat(lotes, ignore_index=True).drop_duplicates(CHAVE_NATURAL, keep='last')
+        if not novas.empty:
+            relatorio.linhas_mescladas = int(model_loader.mesclar_registros(novas).shape[0])
+
+    # Só arquivos processados sem erro entram no manifesto
+    agora = datetime.now().isoformat(timespec='seconds')
+    for resultado in relatorio.processados:
+        if resultado.erro is None:
+            registro[resultado.arquivo] = {
+                'hash': resultado.hash,
+                'linhas_validas': resultado.linhas_validas,
+                'ingerido_em': agora,
+            }
+    gravar_manifesto(manifesto, registro)
+
+    logger.info(
+        f"Ingestão concluída: {len(relatorio.processados)} arquivo(s) processado(s), "
+        f"{len(relatorio.ignorados)} sem mudança, {relatorio.linhas_mescladas} linhas mescladas."
+    )
+    return relatorio
+
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description="Ingestão de arquivos brutos da SSP/DF na tabela de fatos.")
+    parser.add_argument("arquivos", nargs="+", type=Path, help="Arquivos CSV brutos (anuais ou mensais).")
+    parser.add_argument("--id-ra", type=int, default=None, help="RA usada quando o arquivo não tem coluna de RA.")
+    parser.add_argument("--workers", type=int, default=None, help="Número de processos (padrão: núcleos da máquina).")
+    parser.add_argument("--sep", default=";", help="Separador dos arquivos brutos.")
+    parser.add_argument("--manifesto", type=Path, default=DATA_DIR_MANIFESTO_INGESTAO,
+                        help="Arquivo com os hashes dos arquivos já ingeridos.")
+    parser.add_argument("--forcar", action="store_true", help="Reprocessa mesmo arquivos sem mudança.")
+    args = parser.parse_args(argv)
+    setup_logging()
+
+    relatorio = ingerir_arquivos(
+        args.arquivos,
+        id_ra_padrao=args.id_ra,
+        workers=args.workers,
+        manifesto=args.manifesto,
+        forcar=args.forcar,
+        sep=args.sep,
+    )
+    print(json.dumps(asdict(relatorio), indent=2, ensure_ascii=False))
+    return 1 if any(r.erro for r in relatorio.processados) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,220 @@
+# Arquivo: src/services/materializacao_service.py
+# Respostas de /ocorrencias_nomes e /natureza/{codigo} pré-renderizadas (bytes) por versão do dataset
+
+import argparse
+import gzip
+import json
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from src.config import settings, logger, setup_logging
+
+# Campos de Ocorrencias_Nomes_Response, na ordem do schema (a mesma do JSON do endpoint)
+CAMPOS_NOMES = ('MES', 'ANO', 'QUANTIDADE', 'Natureza', 'RegiaoAdministrativa', 'ID_RA', 'COD_NATUREZA')
+_COLUNAS_NOMES = ('mes', 'ano', 'quantidade', 'natureza', 'regiao_administrativa', 'id_ra', 'cod_natureza')
+
+# Corpo pronto: (JSON, JSON em gzip ou None)
+Corpo = Tuple[bytes, Optional[bytes]]
+
+
+def codificar(conteudo: Any, comprimir: bool) -> Corpo:
+    """Mesmos bytes que o JSONResponse do FastAPI produziria para `conteudo`."""
+    dados = json.dumps(conteudo, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+    # mtime=0: o mesmo conteúdo gera sempre o mesmo arquivo (bom para caches estáticos)
+    return dados, gzip.compress(dados, compresslevel=6, mtime=0) if comprimir else None
+
+
+def _renderizar_particao(particao, comprimir: bool) -> Dict[Tuple[int, int, int], Corpo]:
+    """Todas as respostas (id_ra, ano, mes) de um ano, a partir do índice (id_ra, mes) da partição."""
+    df = particao.denormalizado
+    colunas = [df[coluna].tolist() for coluna in _COLUNAS_NOMES]
+    # Os nomes passam por str() como no schema (Natureza e RegiaoAdministrativa são str)
+    colunas[3] = [str(valor) for valor in colunas[3]]
+    colunas[4] = [str(valor) for valor in colunas[4]]
+    linhas = list(zip(*colunas))
+    return {
+        (int(id_ra), particao.ano, int(mes)): codificar([dict(zip(CAMPOS_NOMES, linhas[p])) for p in posicoes], comprimir)
+        for (id_ra, mes), posicoes in particao.indice_ra_mes.items()
+    }
+
+
+def _renderizar_naturezas(naturezas, comprimir: bool) -> Dict[int, Corpo]:
+    # Com códigos repetidos, o endpoint usa a primeira linha
+    unicas = naturezas.drop_duplicates('cod_natureza', keep='first')
+    return {
+        int(codigo): codificar({"cod_natureza": int(codigo), "natureza": str(nome)}, comprimir)
+        for codigo, nome in zip(unicas['cod_natureza'].tolist(), unicas['natureza'].tolist())
+    }
+
+
+# ----------------------------------------------
+# CLASSE Materializacao --- Respostas de uma versão do dataset
+# ----------------------------------------------
+
+@dataclass(frozen=True)
+class Materializacao:
+    """
+    Cobre todo o espaço de chaves dos dois endpoints: uma chave ausente é
+    uma resposta 404. Vale só para a versão do dataset em que foi montada
+    (comparada por identidade, não pelo número da versão).
+    """
+    dataset: Any = field(repr=False)
+    nomes: Mapping[Tuple[int, int, int], Corpo] = field(repr=False)
+    naturezas: Mapping[int, Corpo] = field(repr=False)
+    comprimido: bool = False
+    # Respostas por ano, guardadas com a partição de origem: na próxima versão,
+    # anos cuja partição não mudou (mesmo objeto) são reaproveitados
+    por_ano: Mapping[int, Tuple[Any, Dict]] = field(default_factory=dict, repr=False)
+
+    @property
+    def versao(self) -> int:
+        return self.dataset.versao
+
+    @property
+    def total(self) -> int:
+        return len(self.nomes) + len(self.naturezas)
+
+
+def materializar(dataset, anterior: Optional[Materializacao] = None,
+                 comprimir: Optional[bool] = None) -> Materializacao:
+    """Renderiza todas as respostas da versão; só os anos alterados desde `anterior` são refeitos."""
+    comprimir = settings.MATERIALIZE_GZIP if comprimir is None else comprimir
+    if anterior is not None and anterior.comprimido != comprimir:
+        anterior = None
+
+    por_ano: Dict[int, Tuple[Any, Dict]] = {}
+    nomes: Dict[Tuple[int, int, int], Corpo] = {}
+    refeitos = 0
+    for ano, particao in dataset.particoes.items():
+        reaproveitado = anterior.por_ano.get(ano) if anterior is not None else None
+        if reaproveitado is not None and reaproveitado[0] is particao:
+            respostas = reaproveitado[1]
+        else:
+            respostas = _renderizar_particao(particao, comprimir)
+            refeitos += 1
+        por_ano[ano] = (particao, respostas)
+        nomes.update(respostas)
+
+    if anterior is not None and anterior.dataset.naturezas is dataset.naturezas:
+        naturezas = anterior.naturezas
+    else:
+        naturezas = _renderizar_naturezas(dataset.naturezas, comprimir) if not dataset.naturezas.empty else {}
+
+    materializacao = Materializacao(dataset=dataset, nomes=nomes, naturezas=naturezas,
+                                    comprimido=comprimir, por_ano=por_ano)
+    logger.info(f"Materialização da versão {dataset.versao}: {materializacao.total} respostas "
+                f"({refeitos} de {len(por_ano)} anos renderizados).")
+    return materializacao
+
+
+# ----------------------------------------------
+# MATERIALIZAÇÃO ATUAL --- refeita em segundo plano a cada nova versão
+# ----------------------------------------------
+
+_atual: Optional[Materializacao] = None
+_agendada: Any = None
+_lock = threading.Lock()
+# Uma única thread: versões publicadas em sequência rápida viram uma só montagem
+_construtor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="materializacao")
+
+
+def obter_materializacao(dataset) -> Optional[Materializacao]:
+    """Materialização da versão `dataset`, ou None se ela ainda não foi montada."""
+    atual = _atual
+    if atual is not None and atual.dataset is dataset:
+        return atual
+    return None
+
+
+def agendar(dataset, novas=None):
+    """
+    Ouvinte do model_loader (e chamado na primeira consulta de uma versão
+    ainda não materializada): agenda a montagem sem bloquear quem chamou.
+    """
+    global _agendada
+    if not settings.MATERIALIZE_ENABLED:
+        return
+    with _lock:
+        if _agendada is dataset or (_atual is not None and _atual.dataset is dataset):
+            return
+        _agendada = dataset
+    _construtor.submit(_construir, dataset)
+
+
+def _construir(dataset):
+    global _atual, _agendada
+    from src.models.model_loader import dataset_carregado
+
+    try:
+        # Já existe versão mais nova publicada: ela terá a sua própria montagem
+        if dataset_carregado() is not dataset:
+            return
+        nova = materializar(dataset, anterior=_atual)
+        _atual = nova
+        if settings.MATERIALIZE_DIR:
+            gravar(nova, Path(settings.MATERIALIZE_DIR))
+    except Exception as e:
+        logger.error(f"ERRO ao materializar a versão {dataset.versao}: {e}")
+    finally:
+        with _lock:
+            if _agendada is dataset:
+                _agendada = None
+
+
+# ----------------------------------------------
+# ARQUIVOS (camada de cache estático) E CLI
+# ----------------------------------------------
+
+def gravar(materializacao: Materializacao, destino: Path) -> int:
+    """
+    Grava as respostas com caminhos que espelham as URLs:
+    ocorrencias_nomes/<id_ra>/<ano>/<mes>.json e natureza/<codigo>.json
+    (mais .json.gz se comprimido) e um manifesto.json com a versão.
+    Monta tudo num diretório temporário e só então substitui o destino.
+    """
+    destino = Path(destino)
+    temporario = destino.with_name(destino.name + ".tmp")
+    shutil.rmtree(temporario, ignore_errors=True)
+
+    arquivos: List[Tuple[Path, Corpo]] = [
+        (temporario / "ocorrencias_nomes" / str(id_ra) / str(ano) / f"{mes}.json", corpo)
+        for (id_ra, ano, mes), corpo in materializacao.nomes.items()
+    ] + [
+        (temporario / "natureza" / f"{codigo}.json", corpo)
+        for codigo, corpo in materializacao.naturezas.items()
+    ]
+    for caminho, (dados, comprimido) in arquivos:
+        caminho.parent.mkdir(parents=True, exist_ok=True)
+        caminho.write_bytes(dados)
+        if comprimido is not None:
+            caminho.with_name(caminho.name + ".gz").write_bytes(comprimido)
+
+    manifesto = {"versao": materializacao.versao, "respostas": materializacao.total, "gzip": materializacao.comprimido}
+    (temporario / "manifesto.json").write_text(json.dumps(manifesto), encoding="utf-8")
+
+    shutil.rmtree(destino, ignore_errors=True)
+    os.replace(temporario, destino)
+    logger.info(f"Materialização da versão {materializacao.versao} gravada em {destino}.")
+    return len(arquivos)
+
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description="Pré-renderiza as respostas de /ocorrencias_nomes e /natureza.")
+    parser.add_argument("destino", type=Path, help="Diretório de saída (substituído por completo).")
+    parser.add_argument("--gzip", action="store_true", help="Grava também as versões .json.gz.")
+    args = parser.parse_args(argv)
+    setup_logging()
+
+    from src.models.model_loader import obter_dataset
+    materializacao = materializar(obter_dataset(), comprimir=args.gzip)
+    arquivos = gravar(materializacao, args.destino)
+    print(f"{arquivos} respostas da versão {materializacao.versao} gravadas em {args.destino}")
+
+
+if __name__ == "__main__":
+    main()
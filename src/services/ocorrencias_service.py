@@ -1,11 +1,11 @@
 
 # Arquivo: src/services/ocorrencias_service.py
 
-from typing import List, Dict, Any
-import pandas as pd
-from src.models.model_loader import save_new_record, load_denormalized_data 
-from src.schemas.schemas import OcorrenciasRequest, Ocorrencias_Nomes_Response, OcorrenciasMediaResponse
-from src.config import logger
+import math
+from typing import List, Dict, Any, Optional
+from src.models.model_loader import save_new_record, save_daily_records, obter_dataset, obter_dataset_nomeado, obter_catalogo
+from src.schemas.schemas import OcorrenciasRequest, OcorrenciaDiariaRequest, OcorrenciasRollupResponse, DatasetInfoResponse, Ocorrencias_Nomes_Response, OcorrenciasMediaResponse, OcorrenciasPrevisaoResponse, OcorrenciasMatrizResponse, OcorrenciasDistribuicaoResponse, OcorrenciasComovimentoResponse, DatasetOcorrenciasNomesResponse, DatasetOcorrenciasMediaResponse
+from src.config import settings, logger
 
 # ------------------------------------------
 # --- FUNÇÃO DE INSERÇÃO DE DADOS NO CSV ---
@@ -26,6 +26,8 @@ def cadatrar_ocorrencias(request: OcorrenciasRequest):
     new_data_dict['QUANTIDADE'] = new_data_dict.pop('quantidade')
 
     # 3. Cria um DataFrame de um registro para a função de salvamento
+    # (pandas é importado aqui para não pesar no início da API)
+    import pandas as pd
     new_record_df = pd.DataFrame([new_data_dict])
 
     # 4. Chama a camada de acesso a dados (o seu model_loader)
@@ -33,29 +35,47 @@ def cadatrar_ocorrencias(request: OcorrenciasRequest):
 
     return {"message": "Registro inserido com sucesso."}
 
+# ------------------------------------------------
+# --- FUNÇÃO DE INSERÇÃO DE DADOS DIÁRIOS ---
+# ------------------------------------------------
+
+def cadastrar_ocorrencias_diarias(requests: List[OcorrenciaDiariaRequest]) -> int:
+    """
+    Registra um lote de linhas diárias. Os agregados semanal e mensal são
+    atualizados na mesma operação. Retorna o número de meses atualizados.
+    """
+    import pandas as pd
+    novas = pd.DataFrame([request.model_dump() for request in requests])
+    return int(save_daily_records(novas).shape[0])
+
+
+def _ocorrencias_ra_ano_mes(id_ra: int, ano: int, mes: int, nome_dataset: Optional[str]):
+    """Linhas de uma RA/ano/mês; None se o dataset em memória estiver vazio."""
+    # Versão fixada para esta requisição; num dataset do catálogo, só a partição do ano pedido
+    dataset = obter_dataset_nomeado(nome_dataset, anos=[ano])
+    if dataset.vazio:
+        return None
+    return dataset.ocorrencias_ra_ano_mes(id_ra=id_ra, ano=ano, mes=mes)
+
+
 # -------------------------------------------
 # --- FUNÇÃO DE CONSULTA OCORRÊNCIAS(GET) ---
 # -------------------------------------------
 
-def get_ocorrencias_nomes_filtradas(id_ra: int, ano: int, mes: int) -> List[Ocorrencias_Nomes_Response]:
+def get_ocorrencias_nomes_filtradas(id_ra: int, ano: int, mes: int,
+                                    nome_dataset: Optional[str] = None) -> List[Ocorrencias_Nomes_Response]:
     """
     Filtra os dados DENORMALIZADOS (com nomes) pelo ID_RA, ANO e MES.
     Retorna uma lista de Ocorrencias_Nomes_Response.
     """
-    # 1. Carrega os dados desnormalizados
-    df_completo = load_denormalized_data()
+    # 1. e 2. Filtro por chave na versão fixada para esta requisição
+    # (partição do ano + índice (id_ra, mes))
+    df_filtrado = _ocorrencias_ra_ano_mes(id_ra, ano, mes, nome_dataset)
 
-    if df_completo.empty:
+    if df_filtrado is None:
         logger.warning("Serviço de consulta Nomes falhou: DataFrame denormalizado está vazio.")
         return []
 
-    # 2. Aplicar Filtros (usando as colunas padronizadas para minúsculo)
-    df_filtrado = df_completo[
-        (df_completo['id_ra'] == id_ra) &
-        (df_completo['ano'] == ano) &
-        (df_completo['mes'] == mes)
-    ].copy()
-
     logger.info(f"Consulta Nomes finalizada. Registros encontrados: {len(df_filtrado)} para RA={id_ra}.")
 
     # 3. Formatação para Pydantic
@@ -78,60 +98,112 @@ def get_ocorrencias_nomes_filtradas(id_ra: int, ano: int, mes: int) -> List[Ocor
     ]
     dados_dict = df_formatado[cols_selecionadas].to_dict('records')
 
-    response_list = [Ocorrencias_Nomes_Response(**item) for item in dados_dict]
+    # Linhas já validadas na carga (src.models.validacao): sem revalidar cada uma.
+    # Datasets do catálogo têm o próprio limite de ano (arquivos históricos)
+    modelo = Ocorrencias_Nomes_Response if nome_dataset is None else DatasetOcorrenciasNomesResponse
+    response_list = [modelo.model_construct(**item) for item in dados_dict]
 
     return response_list
 
+# Campos de /ocorrencias_nomes: nome na resposta -> coluna do DataFrame desnormalizado
+CAMPOS_NOMES = {
+    'MES': 'mes',
+    'ANO': 'ano',
+    'QUANTIDADE': 'quantidade',
+    'Natureza': 'natureza',
+    'RegiaoAdministrativa': 'regiao_administrativa',
+    'ID_RA': 'id_ra',
+    'COD_NATUREZA': 'cod_natureza',
+}
+# Campos de texto repetidos em muitas linhas: no formato colunar vão num dicionário
+CAMPOS_DICIONARIO = ('Natureza', 'RegiaoAdministrativa')
+
+
+def validar_campos(campos: Optional[str]) -> List[str]:
+    """Converte 'A,B' na lista de campos (todos, se vazio); ValueError se algum não existir."""
+    if not campos:
+        return list(CAMPOS_NOMES)
+    selecionados = list(dict.fromkeys(c.strip() for c in campos.split(',') if c.strip()))
+    invalidos = [c for c in selecionados if c not in CAMPOS_NOMES]
+    if invalidos or not selecionados:
+        raise ValueError(f"Campos inválidos: {invalidos}. Disponíveis: {list(CAMPOS_NOMES)}")
+    return selecionados
+
+
+def get_ocorrencias_nomes_compactas(id_ra: int, ano: int, mes: int, campos: List[str], formato: str,
+                                    nome_dataset: Optional[str] = None):
+    """
+    Mesma consulta de get_ocorrencias_nomes_filtradas, serializada direto das
+    colunas (sem um objeto Pydantic por linha) e só com os `campos` pedidos.
+    formato='linhas': lista de objetos. formato='columnar': um array por campo;
+    Natureza e RegiaoAdministrativa viram índices em `dicionarios`, com cada
+    nome escrito uma vez por resposta. Retorna None se não houver linhas.
+    """
+    import pandas as pd
+
+    df_filtrado = _ocorrencias_ra_ano_mes(id_ra, ano, mes, nome_dataset)
+    if df_filtrado is None:
+        logger.warning("Serviço de consulta Nomes falhou: DataFrame denormalizado está vazio.")
+        return None
+    logger.info(f"Consulta Nomes ({formato}) finalizada. Registros encontrados: {len(df_filtrado)} para RA={id_ra}.")
+    if df_filtrado.empty:
+        return None
+
+    if formato == 'linhas':
+        return df_filtrado[[CAMPOS_NOMES[c] for c in campos]].set_axis(campos, axis=1).to_dict('records')
+
+    colunas: Dict[str, list] = {}
+    dicionarios: Dict[str, list] = {}
+    for campo in campos:
+        valores = df_filtrado[CAMPOS_NOMES[campo]]
+        if campo in CAMPOS_DICIONARIO:
+            codigos, nomes = pd.factorize(valores.astype(str))
+            colunas[campo] = codigos.tolist()
+            dicionarios[campo] = nomes.tolist()
+        else:
+            colunas[campo] = valores.to_numpy(dtype='int64').tolist()
+    return {"linhas": len(df_filtrado), "colunas": colunas, "dicionarios": dicionarios}
+
 # ------------------------------------
 # --- FUNÇÃO GET OCORRÊNCIAS MÉDIA ---
 # ------------------------------------
 
-def get_media_historica(id_ra: int, ano: int, mes: int, cod_natureza: int) -> OcorrenciasMediaResponse:
+def get_media_historica(id_ra: int, ano: int, mes: int, cod_natureza: int,
+                        nome_dataset: Optional[str] = None) -> OcorrenciasMediaResponse:
     """
     Calcula a quantidade atual de ocorrências e a média histórica
     para um Mês/Natureza/RA, considerando todos os anos disponíveis.
     """
-    # 1. Carrega os dados desnormalizados (cache garante rapidez)
-    df_completo = load_denormalized_data()
+    # 1. Carrega os dados desnormalizados (versão fixada para esta requisição;
+    # num dataset do catálogo, todas as partições, pois a média usa todos os anos)
+    dataset = obter_dataset_nomeado(nome_dataset)
 
-    if df_completo.empty:
+    if dataset.vazio:
         logger.warning("Serviço de Média Histórica falhou: DataFrame denormalizado está vazio.")
         raise ValueError("Dados não carregados.")
 
-    # 2. DEFINIR FILTROS CHAVE
-    # Filtro 1: Ocorrência Específica (Mês, Ano, RA, Natureza)
-    filtro_especifico = (
-        (df_completo['id_ra'] == id_ra) &
-        (df_completo['ano'] == ano) &
-        (df_completo['mes'] == mes) &
-        (df_completo['cod_natureza'] == cod_natureza)
-    )
+    # 2. EXTRATO DE DADOS
+    # Histórico (Mês, RA, Natureza, TODOS os Anos): vem direto dos índices das partições
+    df_historico = dataset.historico_ra_mes_natureza(id_ra=id_ra, mes=mes, cod_natureza=cod_natureza)
 
-    # Filtro 2: Média Histórica (Mês, RA, Natureza, TODOS os Anos)
-    filtro_historico = (
-        (df_completo['id_ra'] == id_ra) &
-        (df_completo['mes'] == mes) &
-        (df_completo['cod_natureza'] == cod_natureza)
-    )
-
-    # 3. EXTRATO DE DADOS
-    df_especifico = df_completo[filtro_especifico]
-    df_historico = df_completo[filtro_historico]
+    # Ocorrência Específica (Mês, Ano, RA, Natureza): recorte do histórico
+    df_especifico = df_historico[df_historico['ano'] == ano]
 
     if df_especifico.empty:
         logger.info("Nenhuma ocorrência encontrada para o filtro específico.")
         raise ValueError("Nenhuma ocorrência encontrada para o mês/ano/natureza/RA especificados.")
 
-    # 4. CÁLCULO DA MÉDIA
+    # 3. CÁLCULO DA MÉDIA
     # A média é calculada sobre a coluna 'quantidade' do DataFrame histórico
     media_historica = df_historico['quantidade'].mean()
 
-    # 5. EXTRAÇÃO DE DADOS (Apenas o primeiro registro específico)
+    # 4. EXTRAÇÃO DE DADOS (Apenas o primeiro registro específico)
     registro_atual = df_especifico.iloc[0]
 
-    # 6. FORMATAÇÃO DO RESPONSE
+    # 5. FORMATAÇÃO DO RESPONSE
     # Note que usamos o registro atual para obter os nomes descritivos
-    response_data = OcorrenciasMediaResponse(
+    modelo = OcorrenciasMediaResponse if nome_dataset is None else DatasetOcorrenciasMediaResponse
+    response_data = modelo(
         MES=int(registro_atual['mes']),
         ANO=int(registro_atual['ano']),
         Natureza=str(registro_atual['natureza']),
@@ -144,3 +216,271 @@ def get_media_historica(id_ra: int, ano: int, mes: int, cod_natureza: int) -> Oc
     )
 
     return response_data
+
+# ---------------------------------------------------
+# --- FUNÇÃO GET DISTRIBUIÇÃO HISTÓRICA (além da média) ---
+# ---------------------------------------------------
+
+def get_distribuicao_historica(id_ra: int, ano: int, mes: int, cod_natureza: int) -> OcorrenciasDistribuicaoResponse:
+    """
+    Mediana, mínimo/máximo, desvio-padrão e percentil do valor atual no histórico
+    de um Mês/Natureza/RA. O histórico de cada combinação já fica ordenado em
+    memória (por versão do dataset): o percentil é uma busca binária.
+    """
+    from src.models.cubo import mediana, percentil
+
+    dataset = obter_dataset()
+    if dataset.vazio:
+        logger.warning("Serviço de Distribuição falhou: DataFrame denormalizado está vazio.")
+        raise ValueError("Dados não carregados.")
+
+    try:
+        cubo = dataset.cubo
+        atual = cubo.valores[cubo.posicao('ano', ano), cubo.posicao('mes', mes),
+                             cubo.posicao('id_ra', id_ra), cubo.posicao('cod_natureza', cod_natureza)]
+        ordenados, media, desvio = dataset.distribuicao.historico(mes, id_ra, cod_natureza)
+    except KeyError:
+        atual = float('nan')
+
+    if math.isnan(atual):
+        logger.info("Nenhuma ocorrência encontrada para o filtro específico.")
+        raise ValueError("Nenhuma ocorrência encontrada para o mês/ano/natureza/RA especificados.")
+
+    nomes_natureza = _nomes(dataset, 'cod_natureza', [cod_natureza])
+    nomes_ra = _nomes(dataset, 'id_ra', [id_ra])
+
+    return OcorrenciasDistribuicaoResponse(
+        MES=mes,
+        ANO=ano,
+        Natureza=nomes_natureza[0],
+        RegiaoAdministrativa=nomes_ra[0],
+        Quantidade_Atual=int(atual),
+        Anos_Historico=len(ordenados),
+        Media_Historica_Mes=round(media, 2),
+        # Mediana, mínimo e máximo: leituras diretas do histórico ordenado
+        Mediana_Historica_Mes=round(mediana(ordenados), 2),
+        Minimo_Historico_Mes=int(ordenados[0]),
+        Maximo_Historico_Mes=int(ordenados[-1]),
+        Desvio_Padrao_Mes=None if math.isnan(desvio) else round(desvio, 2),
+        Percentil_Atual=round(percentil(ordenados, atual), 1),
+        ID_RA=id_ra,
+        COD_NATUREZA=cod_natureza,
+    )
+
+# ----------------------------------------
+# --- FUNÇÃO GET PREVISÃO DE OCORRÊNCIAS ---
+# ----------------------------------------
+
+def get_previsoes(id_ra: Optional[int] = None, cod_natureza: Optional[int] = None) -> List[OcorrenciasPrevisaoResponse]:
+    """
+    Previsão do próximo mês e do próximo trimestre para as séries (RA, Natureza)
+    que atendem aos filtros. O modelo de todas as séries é ajustado uma vez por
+    versão do dataset e atualizado incrementalmente a cada novo registro.
+    """
+    dataset = obter_dataset()
+    modelo = None if dataset.vazio else dataset.modelo_sazonal
+
+    if modelo is None:
+        logger.warning("Serviço de Previsão falhou: DataFrame denormalizado está vazio.")
+        raise ValueError("Dados não carregados.")
+
+    # 1. Filtra a tabela de previsões (uma linha por série)
+    previsoes = modelo.previsoes
+    if id_ra is not None:
+        previsoes = previsoes[previsoes['id_ra'] == id_ra]
+    if cod_natureza is not None:
+        previsoes = previsoes[previsoes['cod_natureza'] == cod_natureza]
+
+    if previsoes.empty:
+        raise ValueError("Nenhuma série encontrada para a RA/natureza especificadas.")
+
+    # 2. Nomes descritivos a partir das tabelas de dimensão
+    nomes_natureza = dict(zip(dataset.dim_natureza['cod_natureza'], dataset.dim_natureza['natureza']))
+    nomes_ra = dict(zip(dataset.dim_ra['id_ra'], dataset.dim_ra['regiao_administrativa']))
+
+    # 3. Formatação do Response
+    return [
+        OcorrenciasPrevisaoResponse(
+            ID_RA=int(linha.id_ra),
+            COD_NATUREZA=int(linha.cod_natureza),
+            Natureza=str(nomes_natureza.get(linha.cod_natureza, "")),
+            RegiaoAdministrativa=str(nomes_ra.get(linha.id_ra, "")),
+            MES=int(linha.mes),
+            ANO=int(linha.ano),
+            Previsao_Proximo_Mes=round(float(linha.previsao_mes), 1),
+            Previsao_Proximo_Trimestre=round(float(linha.previsao_trimestre), 1),
+            Tendencia_Mensal=round(float(linha.tendencia_mensal), 3),
+            # Sem histórico do mês (série curta): média indefinida
+            Media_Historica_Mes=None if math.isnan(linha.media_historica_mes)
+                                else round(float(linha.media_historica_mes), 1),
+        )
+        for linha in previsoes.itertuples(index=False)
+    ]
+
+# -------------------------------------------------
+# --- FUNÇÃO GET MATRIZ (recorte 2-D do cubo) ---
+# -------------------------------------------------
+
+def _nomes(dataset, dimensao: str, rotulos) -> Optional[List[str]]:
+    """Nomes descritivos dos rótulos quando a dimensão é RA ou Natureza."""
+    if dimensao == 'id_ra':
+        tabela = dict(zip(dataset.dim_ra['id_ra'], dataset.dim_ra['regiao_administrativa']))
+    elif dimensao == 'cod_natureza':
+        tabela = dict(zip(dataset.dim_natureza['cod_natureza'], dataset.dim_natureza['natureza']))
+    else:
+        return None
+    return [str(tabela.get(rotulo, "")) for rotulo in rotulos]
+
+
+def get_matriz(linhas: str, colunas: str, filtros: Dict[str, int]) -> OcorrenciasMatrizResponse:
+    """
+    Matriz linhas x colunas (ex.: RA x Natureza para um ano/mês) lida do cubo
+    pré-calculado da versão do dataset: um fatiamento de array, sem filtrar DataFrame.
+    """
+    dataset = obter_dataset()
+    cubo = None if dataset.vazio else dataset.cubo
+
+    if cubo is None:
+        logger.warning("Serviço de Matriz falhou: DataFrame denormalizado está vazio.")
+        raise ValueError("Dados não carregados.")
+
+    try:
+        rotulos_linhas, rotulos_colunas, matriz = cubo.recorte(linhas, colunas, filtros)
+    except KeyError as e:
+        raise ValueError(f"Nenhuma ocorrência encontrada: {e.args[0]}")
+
+    # Valores em ordem de linha; NaN (sem dado) vira null
+    import numpy as np
+    planos = matriz.ravel()
+    ausentes = np.isnan(planos)
+    valores = np.nan_to_num(planos).astype(np.int64).astype(object)
+    valores[ausentes] = None
+
+    return OcorrenciasMatrizResponse(
+        Linhas=linhas,
+        Colunas=colunas,
+        Filtros=dict(filtros),
+        Rotulos_Linhas=rotulos_linhas.tolist(),
+        Rotulos_Colunas=rotulos_colunas.tolist(),
+        Nomes_Linhas=_nomes(dataset, linhas, rotulos_linhas),
+        Nomes_Colunas=_nomes(dataset, colunas, rotulos_colunas),
+        Valores=valores.tolist(),
+    )
+
+# ------------------------------------------------------
+# --- FUNÇÃO GET COMOVIMENTO (correlação/covariância) ---
+# ------------------------------------------------------
+
+def get_comovimento(series: str, fixo: int, ano_inicio: Optional[int] = None, ano_fim: Optional[int] = None,
+                    metodo: str = 'correlacao') -> OcorrenciasComovimentoResponse:
+    """
+    Correlação ou covariância entre as séries mensais das naturezas de uma RA
+    (series='cod_natureza') ou das RAs de uma natureza (series='id_ra'). A
+    matriz sai de uma única operação sobre o cubo e fica guardada na versão do dataset.
+    """
+    import numpy as np
+
+    dataset = obter_dataset()
+    comovimento = None if dataset.vazio else dataset.comovimento
+
+    if comovimento is None:
+        logger.warning("Serviço de Comovimento falhou: DataFrame denormalizado está vazio.")
+        raise ValueError("Dados não carregados.")
+
+    try:
+        resultado = comovimento.matriz(series, fixo, ano_inicio, ano_fim, metodo)
+    except KeyError as e:
+        raise ValueError(f"Nenhuma ocorrência encontrada: {e.args[0]}")
+
+    anos = dataset.cubo.rotulos['ano']
+    planos = np.round(resultado.valores.ravel(), 6)
+    ausentes = np.isnan(planos)
+    valores = planos.astype(object)
+    valores[ausentes] = None
+
+    return OcorrenciasComovimentoResponse(
+        Metodo=metodo,
+        Series=series,
+        Filtro={'id_ra' if series == 'cod_natureza' else 'cod_natureza': fixo},
+        Ano_Inicio=int(anos[0]) if ano_inicio is None else ano_inicio,
+        Ano_Fim=int(anos[-1]) if ano_fim is None else ano_fim,
+        Meses=resultado.meses,
+        Rotulos=resultado.rotulos.tolist(),
+        Nomes=_nomes(dataset, series, resultado.rotulos),
+        Valores=valores.tolist(),
+    )
+
+# ------------------------------------------------------
+# --- FUNÇÃO GET AGREGADOS (semana, mês, ano) ---
+# ------------------------------------------------------
+
+def get_rollup(granularidade: str, id_ra: Optional[int] = None, cod_natureza: Optional[int] = None,
+               ano: Optional[int] = None) -> List[OcorrenciasRollupResponse]:
+    """
+    Quantidades agregadas por semana (dos fatos diários), mês (tabela de fatos
+    mensal, que é o agregado dos dias) ou ano (soma dos meses do cubo).
+    Todos os agregados já estão calculados na versão do dataset.
+    """
+    import numpy as np
+    import pandas as pd
+
+    dataset = obter_dataset()
+    if dataset.vazio:
+        logger.warning("Serviço de Agregados falhou: DataFrame denormalizado está vazio.")
+        raise ValueError("Dados não carregados.")
+
+    if granularidade == 'semana':
+        tabela = dataset.diarios.semanal.rename('quantidade').reset_index().rename(
+            columns={'ano_iso': 'ano', 'semana': 'periodo'})
+    elif granularidade == 'mes':
+        anos = dataset.anos if ano is None else [a for a in dataset.anos if a == ano]
+        partes = [dataset.particoes[a].denormalizado.drop_duplicates(['id_ra', 'ano', 'mes', 'cod_natureza'], keep='last')
+                  for a in anos]
+        tabela = pd.concat(partes, ignore_index=True).rename(columns={'mes': 'periodo'}) if partes else pd.DataFrame()
+    else:
+        rotulos, valores = dataset.anual
+        posicoes = np.nonzero(~np.isnan(valores))
+        tabela = pd.DataFrame({
+            'ano': rotulos['ano'][posicoes[0]],
+            'id_ra': rotulos['id_ra'][posicoes[1]],
+            'cod_natureza': rotulos['cod_natureza'][posicoes[2]],
+            'quantidade': valores[posicoes],
+            'periodo': None,
+        })
+
+    for coluna, valor in (('id_ra', id_ra), ('cod_natureza', cod_natureza), ('ano', ano)):
+        if valor is not None and not tabela.empty:
+            tabela = tabela[tabela[coluna] == valor]
+
+    if tabela.empty:
+        raise ValueError("Nenhuma ocorrência encontrada para os filtros fornecidos.")
+
+    tabela = tabela.sort_values(['ano', 'periodo', 'id_ra', 'cod_natureza'] if granularidade != 'ano'
+                                else ['ano', 'id_ra', 'cod_natureza'])
+    return [
+        OcorrenciasRollupResponse(
+            ID_RA=int(linha.id_ra),
+            COD_NATUREZA=int(linha.cod_natureza),
+            ANO=int(linha.ano),
+            PERIODO=None if granularidade == 'ano' else int(linha.periodo),
+            QUANTIDADE=int(linha.quantidade),
+        )
+        for linha in tabela[['id_ra', 'cod_natureza', 'ano', 'periodo', 'quantidade']].itertuples(index=False)
+    ]
+
+# ------------------------------------------------------
+# --- FUNÇÃO GET DATASETS DISPONÍVEIS ---
+# ------------------------------------------------------
+
+def listar_datasets() -> List[DatasetInfoResponse]:
+    """Dataset principal e datasets do catálogo, com os anos já em memória."""
+    principal = obter_dataset()
+    datasets = [DatasetInfoResponse(Nome=settings.DATASET_PADRAO, Padrao=True,
+                                    Anos=principal.anos, Anos_Em_Memoria=principal.anos)]
+    catalogo = obter_catalogo()
+    for nome in catalogo.nomes():
+        if nome == settings.DATASET_PADRAO:
+            continue
+        datasets.append(DatasetInfoResponse(Nome=nome, Padrao=False, Anos=catalogo.fonte(nome).anos(),
+                                            Anos_Em_Memoria=catalogo.carregadas(nome)))
+    return datasets